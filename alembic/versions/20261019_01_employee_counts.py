@@ -0,0 +1,93 @@
+"""employee_counts
+
+Revision ID: 20261019_01
+Revises: 20251122_01
+Create Date: 2026-10-19 09:12:41.508316
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_01"
+down_revision: str | Sequence[str] | None = "20251122_01"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+BUCKET_COLUMNS = "organization_id, status, department_id, location_id"
+
+
+def _increment(row: str) -> str:
+    return f"""
+    INSERT INTO employee_counts ({BUCKET_COLUMNS}, count)
+    VALUES (
+        {row}.organization_id, {row}.status,
+        COALESCE({row}.department_id, 0), COALESCE({row}.location_id, 0), 1
+    )
+    ON CONFLICT ({BUCKET_COLUMNS})
+    DO UPDATE SET count = count + 1;"""
+
+
+def _decrement(row: str) -> str:
+    bucket = f"""organization_id = {row}.organization_id AND status = {row}.status
+        AND department_id = COALESCE({row}.department_id, 0)
+        AND location_id = COALESCE({row}.location_id, 0)"""
+    return f"""
+    UPDATE employee_counts SET count = count - 1 WHERE {bucket};
+    DELETE FROM employee_counts WHERE {bucket} AND count <= 0;"""
+
+
+TRIGGERS = {
+    "employee_counts_insert": f"""AFTER INSERT ON employees
+    BEGIN {_increment("NEW")}
+    END""",
+    "employee_counts_delete": f"""AFTER DELETE ON employees
+    BEGIN {_decrement("OLD")}
+    END""",
+    "employee_counts_update": f"""
+    AFTER UPDATE OF organization_id, status, department_id, location_id ON employees
+    BEGIN {_decrement("OLD")} {_increment("NEW")}
+    END""",
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "employee_counts",
+        sa.Column("organization_id", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("department_id", sa.Integer(), nullable=False),
+        sa.Column("location_id", sa.Integer(), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["organization_id"],
+            ["organizations.id"],
+        ),
+        sa.PrimaryKeyConstraint("organization_id", "status", "department_id", "location_id"),
+    )
+
+    # Backfill, then keep up to date with triggers (writes in between would be missed,
+    # so upgrade while the application is stopped)
+    op.execute(
+        f"""
+        INSERT INTO employee_counts ({BUCKET_COLUMNS}, count)
+        SELECT organization_id, status, COALESCE(department_id, 0), COALESCE(location_id, 0),
+            count(*)
+        FROM employees
+        GROUP BY 1, 2, 3, 4
+        """
+    )
+    for name, body in TRIGGERS.items():
+        op.execute(f"CREATE TRIGGER {name} {body}")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {name}")
+    op.drop_table("employee_counts")
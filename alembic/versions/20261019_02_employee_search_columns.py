@@ -0,0 +1,86 @@
+"""employee_search_columns
+
+Revision ID: 20261019_02
+Revises: 20261019_01
+Create Date: 2026-10-19 14:37:05.126894
+
+"""
+
+import unicodedata
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_02"
+down_revision: str | Sequence[str] | None = "20261019_01"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+BACKFILL_BATCH_SIZE = 5000
+
+SEARCH_COLUMNS = [
+    ("first_name_search", 100),
+    ("last_name_search", 100),
+    ("email_search", 255),
+    ("phone_digits", 50),
+]
+
+
+def _normalize_search_text(value: str | None) -> str | None:
+    if value is None:
+        return None
+    decomposed = unicodedata.normalize("NFKD", value)
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+
+def _digits_only(value: str | None) -> str | None:
+    if value is None:
+        return None
+    return "".join(char for char in value if char.isdigit())
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, length in SEARCH_COLUMNS:
+        op.add_column("employees", sa.Column(name, sa.String(length=length), nullable=True))
+
+    # Backfill one id range per statement, each committed on its own, so writers only ever
+    # wait for one batch instead of the whole table
+    with op.get_context().autocommit_block():
+        connection = op.get_bind()
+        dbapi_connection = connection.connection.dbapi_connection
+        dbapi_connection.create_function(
+            "normalize_search_text", 1, _normalize_search_text, deterministic=True
+        )
+        dbapi_connection.create_function("digits_only", 1, _digits_only, deterministic=True)
+
+        max_id = connection.execute(sa.text("SELECT max(id) FROM employees")).scalar() or 0
+        for start in range(0, max_id, BACKFILL_BATCH_SIZE):
+            connection.execute(
+                sa.text(
+                    """
+                    UPDATE employees SET
+                        first_name_search = normalize_search_text(first_name),
+                        last_name_search = normalize_search_text(last_name),
+                        email_search = normalize_search_text(email),
+                        phone_digits = digits_only(phone)
+                    WHERE id > :start AND id <= :end
+                    """
+                ),
+                {"start": start, "end": start + BACKFILL_BATCH_SIZE},
+            )
+
+    for name, _ in SEARCH_COLUMNS:
+        op.create_index(
+            f"ix_employees_org_{name}", "employees", ["organization_id", name], unique=False
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, _ in reversed(SEARCH_COLUMNS):
+        op.drop_index(f"ix_employees_org_{name}", table_name="employees")
+        op.drop_column("employees", name)
@@ -0,0 +1,67 @@
+"""employee_change_log
+
+Revision ID: 20261019_03
+Revises: 20261019_02
+Create Date: 2026-10-19 17:05:28.734519
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_03"
+down_revision: str | Sequence[str] | None = "20261019_02"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+CHANGE_LOG_MAX_ROWS = 100_000
+
+
+def _log(row: str) -> str:
+    return f"""
+    INSERT INTO employee_changes (organization_id, employee_id)
+    VALUES ({row}.organization_id, {row}.id);"""
+
+
+PRUNE = f"""
+    DELETE FROM employee_changes WHERE seq <= last_insert_rowid() - {CHANGE_LOG_MAX_ROWS};"""
+
+TRIGGERS = {
+    "employee_changes_insert": f"""AFTER INSERT ON employees
+    BEGIN {_log("NEW")} {PRUNE}
+    END""",
+    "employee_changes_delete": f"""AFTER DELETE ON employees
+    BEGIN {_log("OLD")} {PRUNE}
+    END""",
+    "employee_changes_update": f"""AFTER UPDATE ON employees
+    BEGIN
+    INSERT INTO employee_changes (organization_id, employee_id)
+    SELECT OLD.organization_id, OLD.id WHERE OLD.organization_id IS NOT NEW.organization_id;
+    {_log("NEW")} {PRUNE}
+    END""",
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "employee_changes",
+        sa.Column("seq", sa.Integer(), nullable=False),
+        sa.Column("organization_id", sa.Integer(), nullable=False),
+        sa.Column("employee_id", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("seq"),
+        sqlite_autoincrement=True,
+    )
+    for name, body in TRIGGERS.items():
+        op.execute(f"CREATE TRIGGER {name} {body}")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {name}")
+    op.drop_table("employee_changes")
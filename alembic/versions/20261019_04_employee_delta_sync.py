@@ -0,0 +1,90 @@
+"""employee_delta_sync
+
+Revision ID: 20261019_04
+Revises: 20261019_03
+Create Date: 2026-10-19 19:21:44.613078
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_04"
+down_revision: str | Sequence[str] | None = "20261019_03"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+BACKFILL_BATCH_SIZE = 5000
+TOMBSTONE_RETENTION_DAYS = 30
+
+# Current time in the format SQLAlchemy stores datetimes in
+NOW = "strftime('%Y-%m-%d %H:%M:%f', 'now') || '000'"
+
+
+def _bury(row: str) -> str:
+    return f"""
+    INSERT OR IGNORE INTO employee_tombstones (organization_id, deleted_at, employee_id)
+    VALUES ({row}.organization_id, {NOW}, {row}.id);
+    DELETE FROM employee_tombstones
+    WHERE organization_id = {row}.organization_id
+        AND deleted_at < strftime('%Y-%m-%d %H:%M:%f', 'now', '-{TOMBSTONE_RETENTION_DAYS} days');"""
+
+
+TRIGGERS = {
+    "employee_tombstones_delete": f"""AFTER DELETE ON employees
+    BEGIN {_bury("OLD")}
+    END""",
+    "employee_tombstones_move": f"""AFTER UPDATE OF organization_id ON employees
+    WHEN OLD.organization_id IS NOT NEW.organization_id
+    BEGIN {_bury("OLD")}
+    END""",
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "employee_tombstones",
+        sa.Column("organization_id", sa.Integer(), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("employee_id", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("organization_id", "deleted_at", "employee_id"),
+    )
+    for name, body in TRIGGERS.items():
+        op.execute(f"CREATE TRIGGER {name} {body}")
+
+    # Employees never updated have no updated_at, use their creation time in the format of
+    # the values written by the application (with microseconds) so that they sort together
+    with op.get_context().autocommit_block():
+        connection = op.get_bind()
+        max_id = connection.execute(sa.text("SELECT max(id) FROM employees")).scalar() or 0
+        for start in range(0, max_id, BACKFILL_BATCH_SIZE):
+            connection.execute(
+                sa.text(
+                    """
+                    UPDATE employees
+                    SET updated_at = strftime('%Y-%m-%d %H:%M:%f', created_at) || '000'
+                    WHERE id > :start AND id <= :end AND updated_at IS NULL
+                    """
+                ),
+                {"start": start, "end": start + BACKFILL_BATCH_SIZE},
+            )
+
+    op.create_index(
+        "ix_employees_org_updated_at_id",
+        "employees",
+        ["organization_id", "updated_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_employees_org_updated_at_id", table_name="employees")
+    for name in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {name}")
+    op.drop_table("employee_tombstones")
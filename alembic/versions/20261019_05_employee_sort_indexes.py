@@ -0,0 +1,39 @@
+"""employee_sort_indexes
+
+Revision ID: 20261019_05
+Revises: 20261019_04
+Create Date: 2026-10-19 20:42:18.305127
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_05"
+down_revision: str | Sequence[str] | None = "20261019_04"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_employees_org_status_id",
+        "employees",
+        ["organization_id", "status", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_employees_org_department_id_id",
+        "employees",
+        ["organization_id", "department_id", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_employees_org_department_id_id", table_name="employees")
+    op.drop_index("ix_employees_org_status_id", table_name="employees")
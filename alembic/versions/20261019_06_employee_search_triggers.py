@@ -0,0 +1,131 @@
+"""employee_search_triggers
+
+Revision ID: 20261019_06
+Revises: 20261019_05
+Create Date: 2026-10-19 22:08:51.470318
+
+"""
+
+import unicodedata
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_06"
+down_revision: str | Sequence[str] | None = "20261019_05"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+BACKFILL_BATCH_SIZE = 5000
+
+SYNC_SEARCH_COLUMNS = """
+    UPDATE employees SET
+        first_name_search = normalize_search_text(NEW.first_name),
+        last_name_search = normalize_search_text(NEW.last_name),
+        email_search = normalize_search_text(NEW.email),
+        phone_digits = digits_only(NEW.phone)
+    WHERE id = NEW.id;"""
+
+
+def _stale(column: str, search_column: str) -> str:
+    return f"(NEW.{column} IS NOT OLD.{column} AND NEW.{search_column} IS OLD.{search_column})"
+
+
+TRIGGERS = {
+    "employee_search_insert": f"""AFTER INSERT ON employees
+    WHEN NEW.first_name_search IS NULL OR NEW.last_name_search IS NULL
+        OR NEW.email_search IS NULL OR (NEW.phone_digits IS NULL AND NEW.phone IS NOT NULL)
+    BEGIN {SYNC_SEARCH_COLUMNS}
+    END""",
+    "employee_search_update": f"""AFTER UPDATE OF first_name, last_name, email, phone ON employees
+    WHEN {_stale("first_name", "first_name_search")} OR {_stale("last_name", "last_name_search")}
+        OR {_stale("email", "email_search")} OR {_stale("phone", "phone_digits")}
+    BEGIN {SYNC_SEARCH_COLUMNS}
+    END""",
+}
+
+
+CHANGE_LOG_MAX_ROWS = 100_000
+
+CHANGE_LOG_UPDATE = f"""
+    BEGIN
+    INSERT INTO employee_changes (organization_id, employee_id)
+    SELECT OLD.organization_id, OLD.id WHERE OLD.organization_id IS NOT NEW.organization_id;
+    INSERT INTO employee_changes (organization_id, employee_id)
+    VALUES (NEW.organization_id, NEW.id);
+    DELETE FROM employee_changes WHERE seq <= last_insert_rowid() - {CHANGE_LOG_MAX_ROWS};
+    END"""
+
+# Updates of the search columns alone, e.g. by the triggers above, are not logged
+LOGGED_COLUMNS = (
+    "id, organization_id, first_name, last_name, email, phone, avatar, location_id, "
+    "company_id, department_id, position_id, status, created_at, updated_at"
+)
+
+
+def _normalize_search_text(value: str | None) -> str | None:
+    if value is None:
+        return None
+    decomposed = unicodedata.normalize("NFKD", value)
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+
+def _digits_only(value: str | None) -> str | None:
+    if value is None:
+        return None
+    return "".join(char for char in value if char.isdigit())
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, body in TRIGGERS.items():
+        op.execute(f"CREATE TRIGGER {name} {body}")
+    op.execute("DROP TRIGGER employee_changes_update")
+    op.execute(
+        "CREATE TRIGGER employee_changes_update "
+        f"AFTER UPDATE OF {LOGGED_COLUMNS} ON employees {CHANGE_LOG_UPDATE}"
+    )
+
+    # Fix the search columns that writes outside the ORM left unset or stale, one id range
+    # per statement, each committed on its own
+    with op.get_context().autocommit_block():
+        connection = op.get_bind()
+        dbapi_connection = connection.connection.dbapi_connection
+        dbapi_connection.create_function(
+            "normalize_search_text", 1, _normalize_search_text, deterministic=True
+        )
+        dbapi_connection.create_function("digits_only", 1, _digits_only, deterministic=True)
+
+        max_id = connection.execute(sa.text("SELECT max(id) FROM employees")).scalar() or 0
+        for start in range(0, max_id, BACKFILL_BATCH_SIZE):
+            connection.execute(
+                sa.text(
+                    """
+                    UPDATE employees SET
+                        first_name_search = normalize_search_text(first_name),
+                        last_name_search = normalize_search_text(last_name),
+                        email_search = normalize_search_text(email),
+                        phone_digits = digits_only(phone)
+                    WHERE id > :start AND id <= :end AND (
+                        first_name_search IS NOT normalize_search_text(first_name)
+                        OR last_name_search IS NOT normalize_search_text(last_name)
+                        OR email_search IS NOT normalize_search_text(email)
+                        OR phone_digits IS NOT digits_only(phone)
+                    )
+                    """
+                ),
+                {"start": start, "end": start + BACKFILL_BATCH_SIZE},
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER employee_changes_update")
+    op.execute(
+        f"CREATE TRIGGER employee_changes_update AFTER UPDATE ON employees {CHANGE_LOG_UPDATE}"
+    )
+    for name in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {name}")
@@ -0,0 +1,140 @@
+"""employee_search_triggers_sql
+
+Revision ID: 20261019_07
+Revises: 20261019_06
+Create Date: 2026-10-19 23:16:02.884051
+
+"""
+
+import unicodedata
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_07"
+down_revision: str | Sequence[str] | None = "20261019_06"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# The triggers of 20261019_06 called functions that only the application's connections
+# have, so other connections could no longer write employees. These derive the search
+# columns in plain SQL: lower(), then replace() for the letters of the blocks below.
+FOLDED_BLOCKS = ((0x00C0, 0x0250), (0x0300, 0x0370), (0x0370, 0x0530))
+REPLACEMENTS_PER_STATEMENT = 20
+SEARCHED_COLUMNS = (
+    ("first_name", "first_name_search"),
+    ("last_name", "last_name_search"),
+    ("email", "email_search"),
+)
+PHONE_SEPARATORS = [(char, "") for char in map(chr, range(0x20, 0x7F)) if not char.isdigit()]
+
+
+def _normalize_search_text(value: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", value)
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+
+FOLDINGS = [
+    (char, normalized)
+    for start, end in FOLDED_BLOCKS
+    for char in map(chr, range(start, end))
+    if (normalized := _normalize_search_text(char)) != char
+]
+
+
+def _replace_all(expression: str, replacements: list[tuple[str, str]]) -> str:
+    for old, new in replacements:
+        old, new = old.replace("'", "''"), new.replace("'", "''")
+        expression = f"replace({expression}, '{old}', '{new}')"
+    return expression
+
+
+def _sync_search_columns() -> str:
+    assignments = [f"{search} = lower(NEW.{column})" for column, search in SEARCHED_COLUMNS]
+    assignments.append("phone_digits = NEW.phone")
+    statements = [assignments]
+    replacements = {search: FOLDINGS for _, search in SEARCHED_COLUMNS}
+    replacements["phone_digits"] = PHONE_SEPARATORS
+    longest = max(map(len, replacements.values()))
+    for start in range(0, longest, REPLACEMENTS_PER_STATEMENT):
+        end = start + REPLACEMENTS_PER_STATEMENT
+        statements.append(
+            [
+                f"{column} = {_replace_all(column, pairs[start:end])}"
+                for column, pairs in replacements.items()
+                if pairs[start:end]
+            ]
+        )
+    return "".join(
+        f"""
+    UPDATE employees SET {", ".join(assignments)} WHERE id = NEW.id;"""
+        for assignments in statements
+    )
+
+
+def _stale(column: str, search_column: str) -> str:
+    return (
+        f"(lower(NEW.{column}) IS NOT lower(OLD.{column}) "
+        f"AND NEW.{search_column} IS OLD.{search_column})"
+    )
+
+
+INSERT_WHEN = """NEW.first_name_search IS NULL OR NEW.last_name_search IS NULL
+        OR NEW.email_search IS NULL OR (NEW.phone_digits IS NULL AND NEW.phone IS NOT NULL)"""
+
+TRIGGERS = {
+    "employee_search_insert": f"""AFTER INSERT ON employees
+    WHEN {INSERT_WHEN}
+    BEGIN {_sync_search_columns()}
+    END""",
+    "employee_search_update": f"""AFTER UPDATE OF first_name, last_name, email, phone ON employees
+    WHEN {_stale("first_name", "first_name_search")} OR {_stale("last_name", "last_name_search")}
+        OR {_stale("email", "email_search")}
+        OR (NEW.phone IS NOT OLD.phone AND NEW.phone_digits IS OLD.phone_digits)
+    BEGIN {_sync_search_columns()}
+    END""",
+}
+
+# Triggers of 20261019_06
+PREVIOUS_SYNC_SEARCH_COLUMNS = """
+    UPDATE employees SET
+        first_name_search = normalize_search_text(NEW.first_name),
+        last_name_search = normalize_search_text(NEW.last_name),
+        email_search = normalize_search_text(NEW.email),
+        phone_digits = digits_only(NEW.phone)
+    WHERE id = NEW.id;"""
+
+
+def _previous_stale(column: str, search_column: str) -> str:
+    return f"(NEW.{column} IS NOT OLD.{column} AND NEW.{search_column} IS OLD.{search_column})"
+
+
+PREVIOUS_TRIGGERS = {
+    "employee_search_insert": f"""AFTER INSERT ON employees
+    WHEN {INSERT_WHEN}
+    BEGIN {PREVIOUS_SYNC_SEARCH_COLUMNS}
+    END""",
+    "employee_search_update": f"""AFTER UPDATE OF first_name, last_name, email, phone ON employees
+    WHEN {_previous_stale("first_name", "first_name_search")}
+        OR {_previous_stale("last_name", "last_name_search")}
+        OR {_previous_stale("email", "email_search")} OR {_previous_stale("phone", "phone_digits")}
+    BEGIN {PREVIOUS_SYNC_SEARCH_COLUMNS}
+    END""",
+}
+
+
+def _replace_triggers(triggers: dict[str, str]) -> None:
+    for name, body in triggers.items():
+        op.execute(f"DROP TRIGGER IF EXISTS {name}")
+        op.execute(f"CREATE TRIGGER {name} {body}")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _replace_triggers(TRIGGERS)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _replace_triggers(PREVIOUS_TRIGGERS)
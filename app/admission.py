@@ -0,0 +1,40 @@
+from collections.abc import AsyncIterator, Callable
+from time import perf_counter
+
+from fastapi import HTTPException, Request, status
+
+from app.utils.admission import AdmissionLimiter, Overloaded
+
+
+def admission_control(limiter: AdmissionLimiter) -> Callable[[], AsyncIterator[None]]:
+    """
+    Dependency admitting requests through `limiter` before any other dependency runs, so
+    that shed requests never touch the database (not even to authenticate).
+
+    Example:
+        @router.get("", dependencies=[Depends(admission_control(db_reads))])
+        async def my_endpoint(current_user: User = Depends(get_current_user)):
+            ...
+
+    Raises:
+        HTTPException: 503 Service Unavailable with `Retry-After` if the request is shed
+    """
+
+    async def admit(request: Request) -> AsyncIterator[None]:
+        # Latencies are compared per route, e.g. suggestions are always faster than lists
+        route = getattr(request.scope.get("route"), "path", request.url.path)
+        try:
+            await limiter.acquire()
+        except Overloaded as err:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server overloaded, retry later",
+                headers={"Retry-After": str(err.retry_after)},
+            ) from err
+        started = perf_counter()
+        try:
+            yield
+        finally:
+            limiter.release(perf_counter() - started, route)
+
+    return admit
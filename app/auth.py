@@ -7,9 +7,10 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_read_db, release_connection
 from app.models.user import User
 from app.repositories.user_repository import UserRepository
+from app.utils.server_timing import timed_phase
 
 security = HTTPBearer()
 
@@ -34,7 +35,7 @@ def decode_token(token: str) -> dict:
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> User:
     """
     Get the current authenticated user from the token.
@@ -61,7 +62,10 @@ async def get_current_user(
         )
 
     user_repo = UserRepository(db)
-    user = await user_repo.get_user_by_id(user_id)
+    with timed_phase("auth"):
+        user = await user_repo.get_user_by_id(user_id)
+    # Don't hold a connection while the endpoint rate limits or waits
+    await release_connection(db)
 
     if not user:
         raise HTTPException(
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -5,6 +7,50 @@ class Settings(BaseSettings):
     database_url: str
     environment: str
 
+    # Database
+    db_pool_size: int = 5  # Read-only connections kept open
+    db_max_overflow: int = 10  # Extra read-only connections opened under load
+    db_writer_pool_size: int = 1  # SQLite has a single writer, more connections only wait
+    db_deadline_seconds: float = 10.0  # Statements of a request are interrupted past it, 0 = off
+    db_cancel_on_disconnect: bool = True  # Interrupt statements of requests whose client left
+    admission_max_in_flight: int = 15  # Concurrent DB-bound requests (adaptive limit), 0 = off
+    admission_queue_size: int = 32  # Requests waiting past the limit, more are shed with 503
+    admission_max_wait_seconds: float = 0.5  # Queued requests are shed with 503 past this wait
+    admission_latency_tolerance: float = 2.0  # Lower the limit past this x a route's usual latency
+    concurrent_count_query: bool = False  # Run list count and page queries concurrently
+    list_count_cap: int = 10_000  # Scanning list counts stop past this many matches, 0 = exact
+    list_count_estimate: bool = False  # Estimate capped totals from a sample instead of the cap
+
+    # SQLite engine profile, applied to every new connection
+    sqlite_journal_mode: str = "WAL"  # Readers don't block the writer (DELETE is the default)
+    sqlite_synchronous: str = "NORMAL"  # Safe with WAL, no fsync per commit (FULL is the default)
+    sqlite_mmap_size: int = 268_435_456  # Bytes of the database file memory-mapped, 0 to disable
+    sqlite_cache_size: int = -65_536  # Page cache per connection, negative values are KiB
+    sqlite_temp_store: str = "MEMORY"  # Temporary tables and sort spills kept in memory
+
+    # Employee list
+    list_single_flight: bool = True  # Coalesce identical concurrent list requests
+    in_list_padding: bool = True  # Pad filter lists to powers of two for statement reuse
+    count_from_summary: bool = True  # Answer unsearched counts from the employee_counts table
+    facet_cache_size: int = 1024  # Cached facet count results, 0 to disable
+    search_refinement_cache_size: int = 256  # Cached search matches per org and filters, 0 = off
+    search_refinement_max_ids: int = 2000  # Searches matching more employees are not cached
+    result_set_cache_bytes: int = 67_108_864  # Memory for cached id lists of heavy queries, 0 = off
+    employee_read_engine: Literal["sql", "columnar"] = "sql"  # columnar requires numpy
+    columnar_max_organizations: int = 16  # Organizations kept in memory by the columnar engine
+    bitmap_index_max_organizations: int = 100  # Organizations with filter bitmaps, 0 = off
+    suggest_index_max_organizations: int = 100  # Organizations with an in-memory typeahead index
+    changes_settle_seconds: float = 5.0  # Delta sync holds back changes younger than this
+    change_log_poll_interval_seconds: float = 1.0  # Poll other processes' changes, 0 = off
+    stream_queue_size: int = 100  # Events queued per change stream before it must reload
+    stream_heartbeat_seconds: float = 15.0  # Comment sent on idle change streams
+
+    # Observability
+    server_timing_enabled: bool = False  # Emit Server-Timing header and phase timing logs
+    slow_query_threshold_ms: float = 500  # Log slower statements, 0 to disable
+    slow_query_explain: bool = True  # Include EXPLAIN QUERY PLAN in slow query logs
+    enforce_query_budget: bool = False  # Fail requests exceeding their query budget (tests)
+
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
 
@@ -1,23 +1,141 @@
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import declarative_base
 
 from app.config import settings
+from app.utils.db_deadline import instrument_deadlines
+from app.utils.metrics import registry
+from app.utils.query_stats import instrument_engine
 
 database_url = settings.database_url
 
-engine = create_async_engine(
-    database_url,
-    connect_args={"check_same_thread": False} if "sqlite" in database_url else {},
+
+def _set_sqlite_pragmas(dbapi_connection, pragmas: list[str]) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in pragmas:
+            cursor.execute(f"PRAGMA {pragma}")
+    finally:
+        cursor.close()
+
+
+def _sqlite_profile_pragmas(read_only: bool) -> list[str]:
+    """PRAGMAs of the SQLite engine profile configured in settings."""
+    pragmas = [
+        f"journal_mode = {settings.sqlite_journal_mode}",
+        f"synchronous = {settings.sqlite_synchronous}",
+        f"mmap_size = {settings.sqlite_mmap_size}",
+        f"cache_size = {settings.sqlite_cache_size}",
+        f"temp_store = {settings.sqlite_temp_store}",
+    ]
+    if read_only:
+        # Last, the journal mode above may need to write to the database file
+        pragmas.append("query_only = ON")
+    return pragmas
+
+
+def create_db_engine(url: str, read_only: bool = False) -> AsyncEngine:
+    """
+    Create an instrumented async engine.
+
+    Args:
+        url: Database URL
+        read_only: Open SQLite connections with `query_only` so they can never write
+
+    Returns:
+        AsyncEngine with pool sizing from settings, and the SQLite engine profile applied to
+        every new connection
+    """
+    is_sqlite = "sqlite" in url
+    options = {}
+    if ":memory:" not in url:  # In-memory SQLite uses a single static connection
+        if read_only:
+            options.update(pool_size=settings.db_pool_size, max_overflow=settings.db_max_overflow)
+        else:
+            options.update(pool_size=settings.db_writer_pool_size, max_overflow=0)
+
+    new_engine = create_async_engine(
+        url,
+        connect_args={"check_same_thread": False} if is_sqlite else {},
+        **options,
+    )
+    instrument_engine(new_engine)
+
+    if is_sqlite:
+
+        @event.listens_for(new_engine.sync_engine, "connect")
+        def _on_connect(dbapi_connection, connection_record):
+            _set_sqlite_pragmas(dbapi_connection, _sqlite_profile_pragmas(read_only))
+
+        instrument_deadlines(new_engine)
+
+    return new_engine
+
+
+engine = create_db_engine(database_url)
+
+# Single writer, plus a read-only connection pool for read paths (e.g. listing employees)
+# In-memory databases are private to their connection, so they share the writer engine
+read_engine = (
+    engine if ":memory:" in database_url else create_db_engine(database_url, read_only=True)
+)
+
+
+def _pool_stats() -> dict[tuple[str, ...], float]:
+    stats = {}
+    for name, pool in (("writer", engine.pool), ("reader", read_engine.pool)):
+        if not hasattr(pool, "checkedout"):  # e.g. StaticPool for in-memory SQLite
+            continue
+        stats[(name, "size")] = pool.size()
+        stats[(name, "checked_out")] = pool.checkedout()
+        # overflow() is negative while the pool has not grown past its size
+        stats[(name, "overflow")] = max(pool.overflow(), 0)
+    return stats
+
+
+registry.gauge(
+    "db_pool_connections",
+    "Database connection pool size, checked out and overflow connections",
+    ("pool", "state"),
+    callback=_pool_stats,
 )
 
 AsyncSessionLocal = async_sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False, autoflush=False
 )
+ReadSessionLocal = async_sessionmaker(
+    read_engine, class_=AsyncSession, expire_on_commit=False, autoflush=False
+)
 
 Base = declarative_base()
 
 
+async def release_connection(session: AsyncSession) -> None:
+    """
+    Return the connection of a session that only read to its pool.
+
+    Sessions check out a connection on their first statement and hold it until the end of
+    their transaction, i.e. for the rest of the request. Ending the transaction once the
+    reads are done keeps the pool free while the request is rate limited, waits on other
+    requests or serializes its response. Loaded objects stay usable since sessions don't
+    expire them on commit, and the next statement checks out a connection again.
+    """
+    if session.in_transaction() and not (session.new or session.dirty or session.deleted):
+        await session.commit()
+
+
 async def get_db():
     """Dependency to get async database session."""
     async with AsyncSessionLocal() as session:
         yield session
+
+
+async def get_read_db():
+    """Dependency to get async read-only database session."""
+    async with ReadSessionLocal() as session:
+        yield session
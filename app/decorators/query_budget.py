@@ -0,0 +1,54 @@
+from collections.abc import Callable
+from functools import wraps
+
+from app.config import settings
+from app.utils.query_stats import get_query_stats
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised when a request executes more SQL statements than its endpoint's budget."""
+
+
+def query_budget(max_queries: int):
+    """
+    Decorator to declare the maximum number of SQL statements a request to an endpoint
+    may execute, including the ones executed by its dependencies (e.g. authentication).
+
+    The budget is only enforced when `settings.enforce_query_budget` is enabled (as in
+    the test suite), so N+1 regressions fail tests instead of slowing down production.
+    Rare paths of the endpoint declare their extra statements with `allow_extra_queries`
+    (`app.utils.query_stats`) rather than raising the budget of every request.
+
+    Args:
+        max_queries: Maximum number of statements per request
+
+    Example:
+        @query_budget(max_queries=4)
+        async def my_endpoint(current_user: User = Depends(get_current_user)):
+            ...
+
+    Raises:
+        QueryBudgetExceeded: If the request executed more than `max_queries` statements
+    """
+
+    def decorator(func: Callable):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            result = await func(*args, **kwargs)
+
+            stats = get_query_stats()
+            if (
+                settings.enforce_query_budget
+                and stats is not None
+                and stats.count > max_queries + stats.extra_budget
+            ):
+                raise QueryBudgetExceeded(
+                    f"{func.__qualname__} executed {stats.count} queries, "
+                    f"its budget is {max_queries} + {stats.extra_budget} extra"
+                )
+
+            return result
+
+        return wrapper
+
+    return decorator
@@ -4,6 +4,7 @@ from functools import wraps
 from fastapi import HTTPException, status
 
 from app.models.user import User
+from app.utils.metrics import rate_limit_decisions_total
 from app.utils.rate_limiter import RateLimiter
 
 # TODO: Use Redis or similar distributed storage instead of in-memory storage (just for demo)
@@ -63,6 +64,7 @@ def rate_limit(max_requests: int, window_seconds: int):
 
             # Check rate limit
             if not limiter.is_allowed(current_user.id):
+                rate_limit_decisions_total.inc(endpoint=endpoint_key, decision="denied")
                 retry_after = limiter.get_retry_after(current_user.id)
                 raise HTTPException(
                     status_code=status.HTTP_429_TOO_MANY_REQUESTS,
@@ -70,6 +72,8 @@ def rate_limit(max_requests: int, window_seconds: int):
                     headers={"X-RateLimit-Retry-After": str(retry_after)},
                 )
 
+            rate_limit_decisions_total.inc(endpoint=endpoint_key, decision="allowed")
+
             # Call the original function
             result = await func(*args, **kwargs)
 
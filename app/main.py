@@ -1,7 +1,35 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
+from app.config import settings
+from app.database import ReadSessionLocal
+from app.middleware.db_deadline import DbDeadlineMiddleware
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.query_stats import QueryStatsMiddleware
+from app.middleware.server_timing import ServerTimingMiddleware
 from app.routers.employee_router import router as employee_router
+from app.utils.change_log import change_log_follower
+from app.utils.metrics import registry
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Follow employee changes committed by other processes while the app runs."""
+    follower = None
+    if settings.change_log_poll_interval_seconds > 0:
+        follower = asyncio.create_task(
+            change_log_follower.run(ReadSessionLocal, settings.change_log_poll_interval_seconds)
+        )
+    yield
+    if follower is not None:
+        follower.cancel()
+        with suppress(asyncio.CancelledError):
+            await follower
+
 
 app = FastAPI(
     title="HR Employee API",
@@ -9,8 +37,13 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
+# Interrupt database statements past the request's deadline or once its client disconnected
+# (added first, so that CORS headers are added to its 503 and 504 responses too)
+app.add_middleware(DbDeadlineMiddleware)
+
 # CORS middleware configuration
 app.add_middleware(
     CORSMiddleware,
@@ -20,6 +53,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request latency histograms for /metrics
+app.add_middleware(MetricsMiddleware)
+
+# Per-request SQL statement counts and timings
+app.add_middleware(QueryStatsMiddleware)
+
+# Server-Timing phase breakdown (no-op unless enabled in settings)
+app.add_middleware(ServerTimingMiddleware)
+
 # Include routers
 app.include_router(employee_router)
 
@@ -28,3 +70,11 @@ app.include_router(employee_router)
 def health_check():
     """Health check endpoint."""
     return {"status": "healthy"}
+
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def metrics():
+    """Metrics endpoint in the Prometheus text exposition format."""
+    return PlainTextResponse(
+        registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
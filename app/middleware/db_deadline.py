@@ -0,0 +1,89 @@
+import asyncio
+import logging
+
+from fastapi import status
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.utils.db_deadline import is_interrupted, start_db_deadline, stop_db_deadline
+from app.utils.metrics import db_statements_interrupted_total
+
+logger = logging.getLogger(__name__)
+
+
+class DbDeadlineMiddleware:
+    """
+    ASGI middleware giving the statements of each request a deadline of
+    `settings.db_deadline_seconds`, cancelled when the client disconnects with
+    `settings.db_cancel_on_disconnect`.
+
+    Interrupted statements fail the request with 504 Gateway Timeout past the deadline, or
+    503 Service Unavailable (unread by the client) once it disconnected.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or (
+            settings.db_deadline_seconds <= 0 and not settings.db_cancel_on_disconnect
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        deadline, token = start_db_deadline(settings.db_deadline_seconds)
+        watcher = None
+        if settings.db_cancel_on_disconnect:
+            # Read the request's messages ahead of the app, to see the disconnect while the
+            # app is still waiting on the database
+            messages: asyncio.Queue[Message] = asyncio.Queue()
+            upstream_receive = receive
+
+            async def watch_disconnect() -> None:
+                while True:
+                    message = await upstream_receive()
+                    messages.put_nowait(message)
+                    if message["type"] == "http.disconnect":
+                        deadline.cancel()
+                        return
+
+            watcher = asyncio.create_task(watch_disconnect())
+            receive = messages.get
+
+        response_started = False
+
+        async def send_tracking_start(message: Message) -> None:
+            nonlocal response_started
+            response_started = response_started or message["type"] == "http.response.start"
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_tracking_start)
+        except Exception as err:
+            if not is_interrupted(err) or response_started:
+                raise
+            reason = "disconnect" if deadline.cancelled else "deadline"
+            db_statements_interrupted_total.inc(reason=reason)
+            logger.warning(
+                "%s %s interrupted (%s)",
+                scope["method"],
+                scope["path"],
+                reason,
+                extra={"method": scope["method"], "path": scope["path"], "reason": reason},
+            )
+            if deadline.cancelled:
+                response = JSONResponse(
+                    {"detail": "Client disconnected, database queries cancelled"},
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                )
+            else:
+                response = JSONResponse(
+                    {"detail": "Database deadline exceeded"},
+                    status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                )
+            await response(scope, receive, send)
+        finally:
+            if watcher is not None:
+                watcher.cancel()
+            stop_db_deadline(token)
@@ -0,0 +1,41 @@
+import logging
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.utils.query_stats import start_query_stats, stop_query_stats
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStatsMiddleware:
+    """
+    ASGI middleware that collects the number of SQL statements and the time spent
+    executing them for each request, and logs them as structured fields.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats, token = start_query_stats()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            stop_query_stats(token)
+            logger.debug(
+                "%s %s executed %d queries in %.3f ms",
+                scope["method"],
+                scope["path"],
+                stats.count,
+                stats.duration * 1000,
+                extra={
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "queries": stats.count,
+                    "db_ms": round(stats.duration * 1000, 3),
+                },
+            )
@@ -0,0 +1,59 @@
+import logging
+from time import perf_counter
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.utils.server_timing import start_server_timing, stop_server_timing
+
+logger = logging.getLogger(__name__)
+
+
+class ServerTimingMiddleware:
+    """
+    ASGI middleware that collects the phase timers of each request and reports them
+    in a `Server-Timing` response header and as structured log fields.
+
+    Enabled with the `SERVER_TIMING_ENABLED` setting, when disabled requests are passed
+    through untouched and phase timers are no-ops.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.server_timing_enabled:
+            await self.app(scope, receive, send)
+            return
+
+        timing, token = start_server_timing()
+        status_code = None
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # Time between the last timed phase (e.g. row projection) and the response
+                # start is spent validating and serializing the response
+                timing.record_since_last_phase("serialize")
+                timing.record("total", perf_counter() - timing.started_at)
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", timing.header_value())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            stop_server_timing(token)
+            logger.info(
+                "%s %s timings",
+                scope["method"],
+                scope["path"],
+                extra={
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status_code": status_code,
+                    "timings_ms": timing.log_fields(),
+                },
+            )
@@ -1,6 +1,9 @@
 from app.models.company import Company
 from app.models.department import Department
 from app.models.employee import Employee, EmployeeStatus
+from app.models.employee_change import EmployeeChangeLog
+from app.models.employee_count import EmployeeCount
+from app.models.employee_tombstone import EmployeeTombstone
 from app.models.location import Location
 from app.models.organization import Organization
 from app.models.position import Position
@@ -9,6 +12,9 @@ from app.models.user import User
 __all__ = [
     "Employee",
     "EmployeeStatus",
+    "EmployeeCount",
+    "EmployeeChangeLog",
+    "EmployeeTombstone",
     "Organization",
     "Department",
     "Location",
@@ -1,9 +1,16 @@
+from datetime import UTC, datetime
+
 from sqlalchemy import Column, DateTime
 from sqlalchemy.sql import func
 
 from app.database import Base as SQLAlchemyBase
 
 
+def utcnow() -> datetime:
+    """Current UTC time, with microseconds (SQLite's CURRENT_TIMESTAMP only has seconds)."""
+    return datetime.now(UTC)
+
+
 class Base(SQLAlchemyBase):
     """
     Base model class that includes common timestamp fields for all models.
@@ -13,4 +20,5 @@ class Base(SQLAlchemyBase):
     __abstract__ = True
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Set on insert too, so that every row can be synced by (updated_at, id)
+    updated_at = Column(DateTime(timezone=True), default=utcnow, onupdate=utcnow)
@@ -1,8 +1,12 @@
 import enum
 
-from sqlalchemy import Column, ForeignKey, Integer, String
+from sqlalchemy import DDL, Column, ForeignKey, Index, Integer, String, event
 
 from app.models.base import Base
+from app.utils.search_text import digits_only, normalize_search_text, search_text_foldings
+
+# Normalized copies of searchable fields, derived from the other columns
+DERIVED_SEARCH_COLUMNS = ("first_name_search", "last_name_search", "email_search", "phone_digits")
 
 
 class EmployeeStatus(enum.Enum):
@@ -15,6 +19,17 @@ class EmployeeStatus(enum.Enum):
 
 class Employee(Base):
     __tablename__ = "employees"
+    __table_args__ = (
+        Index("ix_employees_org_first_name_search", "organization_id", "first_name_search"),
+        Index("ix_employees_org_last_name_search", "organization_id", "last_name_search"),
+        Index("ix_employees_org_email_search", "organization_id", "email_search"),
+        Index("ix_employees_org_phone_digits", "organization_id", "phone_digits"),
+        # Keyset of the changes delta sync
+        Index("ix_employees_org_updated_at_id", "organization_id", "updated_at", "id"),
+        # Keysets of list sorts, names and email sort on the search columns' indexes above
+        Index("ix_employees_org_status_id", "organization_id", "status", "id"),
+        Index("ix_employees_org_department_id_id", "organization_id", "department_id", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     organization_id = Column(Integer, ForeignKey("organizations.id"), nullable=False, index=True)
@@ -32,3 +47,99 @@ class Employee(Base):
     department_id = Column(Integer, ForeignKey("departments.id"), nullable=True, index=True)
     position_id = Column(Integer, ForeignKey("positions.id"), nullable=True, index=True)
     status = Column(String(20), nullable=False, default=EmployeeStatus.NOT_STARTED.value)
+
+    # Search - normalized copies of the searchable fields, kept in sync on flush, or by the
+    # triggers below for statements that don't write them
+    first_name_search = Column(String(100))
+    last_name_search = Column(String(100))
+    email_search = Column(String(255))
+    phone_digits = Column(String(50))
+
+
+@event.listens_for(Employee, "before_insert")
+@event.listens_for(Employee, "before_update")
+def _set_search_columns(mapper, connection, employee: Employee) -> None:
+    employee.first_name_search = normalize_search_text(employee.first_name)
+    employee.last_name_search = normalize_search_text(employee.last_name)
+    employee.email_search = normalize_search_text(employee.email)
+    employee.phone_digits = digits_only(employee.phone)
+
+
+# Nested replace() calls per statement, within the depth SQLite's parser accepts
+_REPLACEMENTS_PER_STATEMENT = 20
+_SEARCHED_COLUMNS = (
+    ("first_name", "first_name_search"),
+    ("last_name", "last_name_search"),
+    ("email", "email_search"),
+)
+_PHONE_SEPARATORS = [(char, "") for char in map(chr, range(0x20, 0x7F)) if not char.isdigit()]
+
+
+def _replace_all(expression: str, replacements: list[tuple[str, str]]) -> str:
+    for old, new in replacements:
+        old, new = old.replace("'", "''"), new.replace("'", "''")
+        expression = f"replace({expression}, '{old}', '{new}')"
+    return expression
+
+
+def _sync_search_columns() -> str:
+    """
+    Statements deriving the search columns of the NEW row in plain SQL: `lower()` followed
+    by the replacements of `search_text_foldings`, and phone numbers without their ASCII
+    separators, a batch of replacements per statement.
+    """
+    assignments = [f"{search} = lower(NEW.{column})" for column, search in _SEARCHED_COLUMNS]
+    assignments.append("phone_digits = NEW.phone")
+    statements = [assignments]
+    replacements = {search: search_text_foldings() for _, search in _SEARCHED_COLUMNS}
+    replacements["phone_digits"] = _PHONE_SEPARATORS
+    longest = max(map(len, replacements.values()))
+    for start in range(0, longest, _REPLACEMENTS_PER_STATEMENT):
+        end = start + _REPLACEMENTS_PER_STATEMENT
+        statements.append(
+            [
+                f"{column} = {_replace_all(column, pairs[start:end])}"
+                for column, pairs in replacements.items()
+                if pairs[start:end]
+            ]
+        )
+    return "".join(
+        f"""
+    UPDATE employees SET {", ".join(assignments)} WHERE id = NEW.id;"""
+        for assignments in statements
+    )
+
+
+def _stale(column: str, search_column: str) -> str:
+    # Case changes of ASCII letters leave search columns as they are
+    return (
+        f"(lower(NEW.{column}) IS NOT lower(OLD.{column}) "
+        f"AND NEW.{search_column} IS OLD.{search_column})"
+    )
+
+
+# SQLite triggers, also created by the 20261019_07 migration, deriving the search columns
+# for Core, bulk and raw SQL writes that leave them unset or stale. Writes
+# through the ORM don't fire them. Being plain SQL, they fold case and accents of the
+# `SQL_FOLDED_BLOCKS` scripts only, and strip only ASCII separators from phone numbers.
+EMPLOYEE_SEARCH_TRIGGERS = [
+    f"""CREATE TRIGGER IF NOT EXISTS employee_search_insert AFTER INSERT ON employees
+    WHEN NEW.first_name_search IS NULL OR NEW.last_name_search IS NULL
+        OR NEW.email_search IS NULL OR (NEW.phone_digits IS NULL AND NEW.phone IS NOT NULL)
+    BEGIN {_sync_search_columns()}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS employee_search_update
+    AFTER UPDATE OF first_name, last_name, email, phone ON employees
+    WHEN {_stale("first_name", "first_name_search")} OR {_stale("last_name", "last_name_search")}
+        OR {_stale("email", "email_search")}
+        OR (NEW.phone IS NOT OLD.phone AND NEW.phone_digits IS OLD.phone_digits)
+    BEGIN {_sync_search_columns()}
+    END""",
+]
+
+for trigger in EMPLOYEE_SEARCH_TRIGGERS:
+    event.listen(
+        Employee.__table__,
+        "after_create",
+        DDL(trigger.replace("%", "%%")).execute_if(dialect="sqlite"),
+    )
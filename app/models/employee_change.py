@@ -0,0 +1,63 @@
+from sqlalchemy import DDL, Column, Integer, event
+
+from app.database import Base
+from app.models.employee import DERIVED_SEARCH_COLUMNS, Employee
+
+# Rows kept in the log, older changes are pruned by the triggers below
+CHANGE_LOG_MAX_ROWS = 100_000
+
+
+class EmployeeChangeLog(Base):
+    """
+    Log of employee inserts, updates and deletes, written by the triggers below whatever
+    process or statement made them. `seq` only grows, so readers follow the log by keeping
+    the last seq they read.
+    """
+
+    __tablename__ = "employee_changes"
+    __table_args__ = {"sqlite_autoincrement": True}  # Never reuse the seq of pruned rows
+
+    seq = Column(Integer, primary_key=True)
+    organization_id = Column(Integer, nullable=False)
+    employee_id = Column(Integer, nullable=False)
+
+
+def _log(row: str) -> str:
+    return f"""
+    INSERT INTO employee_changes (organization_id, employee_id)
+    VALUES ({row}.organization_id, {row}.id);"""
+
+
+# Rows inserted by a trigger set last_insert_rowid() while the trigger runs
+_PRUNE = f"""
+    DELETE FROM employee_changes WHERE seq <= last_insert_rowid() - {CHANGE_LOG_MAX_ROWS};"""
+
+# Updates of the search columns alone only derive them from the others (see
+# EMPLOYEE_SEARCH_TRIGGERS), they change nothing that readers see
+_LOGGED_COLUMNS = ", ".join(
+    column.name
+    for column in Employee.__table__.columns
+    if column.name not in DERIVED_SEARCH_COLUMNS
+)
+
+# SQLite triggers, also created by the 20261019_03 migration (the update one as of 20261019_06)
+EMPLOYEE_CHANGE_TRIGGERS = [
+    f"""CREATE TRIGGER IF NOT EXISTS employee_changes_insert AFTER INSERT ON employees
+    BEGIN {_log("NEW")} {_PRUNE}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS employee_changes_delete AFTER DELETE ON employees
+    BEGIN {_log("OLD")} {_PRUNE}
+    END""",
+    # An employee moved to another organization changes both
+    f"""CREATE TRIGGER IF NOT EXISTS employee_changes_update
+    AFTER UPDATE OF {_LOGGED_COLUMNS} ON employees
+    BEGIN
+    INSERT INTO employee_changes (organization_id, employee_id)
+    SELECT OLD.organization_id, OLD.id WHERE OLD.organization_id IS NOT NEW.organization_id;
+    {_log("NEW")} {_PRUNE}
+    END""",
+]
+
+for trigger in EMPLOYEE_CHANGE_TRIGGERS:
+    # Only the triggering table has to exist when a trigger is created
+    event.listen(Employee.__table__, "after_create", DDL(trigger).execute_if(dialect="sqlite"))
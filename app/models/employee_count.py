@@ -0,0 +1,61 @@
+from sqlalchemy import DDL, Column, ForeignKey, Integer, String, event
+
+from app.database import Base
+from app.models.employee import Employee
+
+# Employees without a department/location are counted under 0, NULL can't be part of the key
+NO_ID = 0
+
+
+class EmployeeCount(Base):
+    """
+    Number of employees per (organization, status, department, location), maintained by
+    the triggers below on every insert, update and delete of `employees`.
+    """
+
+    __tablename__ = "employee_counts"
+
+    organization_id = Column(Integer, ForeignKey("organizations.id"), primary_key=True)
+    status = Column(String(20), primary_key=True)
+    department_id = Column(Integer, primary_key=True)
+    location_id = Column(Integer, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+def _increment(row: str) -> str:
+    return f"""
+    INSERT INTO employee_counts (organization_id, status, department_id, location_id, count)
+    VALUES (
+        {row}.organization_id, {row}.status,
+        COALESCE({row}.department_id, {NO_ID}), COALESCE({row}.location_id, {NO_ID}), 1
+    )
+    ON CONFLICT (organization_id, status, department_id, location_id)
+    DO UPDATE SET count = count + 1;"""
+
+
+def _decrement(row: str) -> str:
+    bucket = f"""organization_id = {row}.organization_id AND status = {row}.status
+        AND department_id = COALESCE({row}.department_id, {NO_ID})
+        AND location_id = COALESCE({row}.location_id, {NO_ID})"""
+    return f"""
+    UPDATE employee_counts SET count = count - 1 WHERE {bucket};
+    DELETE FROM employee_counts WHERE {bucket} AND count <= 0;"""
+
+
+# SQLite triggers, also created by the 20261019_01 migration
+EMPLOYEE_COUNT_TRIGGERS = [
+    f"""CREATE TRIGGER IF NOT EXISTS employee_counts_insert AFTER INSERT ON employees
+    BEGIN {_increment("NEW")}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS employee_counts_delete AFTER DELETE ON employees
+    BEGIN {_decrement("OLD")}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS employee_counts_update
+    AFTER UPDATE OF organization_id, status, department_id, location_id ON employees
+    BEGIN {_decrement("OLD")} {_increment("NEW")}
+    END""",
+]
+
+for trigger in EMPLOYEE_COUNT_TRIGGERS:
+    # Only the triggering table has to exist when a trigger is created
+    event.listen(Employee.__table__, "after_create", DDL(trigger).execute_if(dialect="sqlite"))
@@ -0,0 +1,55 @@
+from sqlalchemy import DDL, Column, DateTime, Integer, event
+
+from app.database import Base
+from app.models.employee import Employee
+
+# Days tombstones are kept, delta syncs from an older watermark must start over
+TOMBSTONE_RETENTION_DAYS = 30
+
+# SQLite's current time in the format SQLAlchemy stores datetimes in, so that they compare
+# as strings with bound parameters
+_NOW = "strftime('%Y-%m-%d %H:%M:%f', 'now') || '000'"
+
+
+class EmployeeTombstone(Base):
+    """
+    Employee deleted from an organization (or moved out of it), written by the triggers
+    below so that delta syncs can report deletions.
+    """
+
+    __tablename__ = "employee_tombstones"
+
+    organization_id = Column(Integer, primary_key=True)
+    deleted_at = Column(DateTime(timezone=True), primary_key=True)
+    employee_id = Column(Integer, primary_key=True)
+
+
+def _bury(row: str) -> str:
+    return f"""
+    INSERT OR IGNORE INTO employee_tombstones (organization_id, deleted_at, employee_id)
+    VALUES ({row}.organization_id, {_NOW}, {row}.id);
+    DELETE FROM employee_tombstones
+    WHERE organization_id = {row}.organization_id
+        AND deleted_at < strftime('%Y-%m-%d %H:%M:%f', 'now', '-{TOMBSTONE_RETENTION_DAYS} days');"""
+
+
+# SQLite triggers, also created by the 20261019_04 migration
+EMPLOYEE_TOMBSTONE_TRIGGERS = [
+    f"""CREATE TRIGGER IF NOT EXISTS employee_tombstones_delete AFTER DELETE ON employees
+    BEGIN {_bury("OLD")}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS employee_tombstones_move
+    AFTER UPDATE OF organization_id ON employees
+    WHEN OLD.organization_id IS NOT NEW.organization_id
+    BEGIN {_bury("OLD")}
+    END""",
+]
+
+for trigger in EMPLOYEE_TOMBSTONE_TRIGGERS:
+    # Only the triggering table has to exist when a trigger is created, DDL formats
+    # statements with %, so strftime's % are doubled
+    event.listen(
+        Employee.__table__,
+        "after_create",
+        DDL(trigger.replace("%", "%%")).execute_if(dialect="sqlite"),
+    )
@@ -0,0 +1,363 @@
+"""
+In-memory columnar read engine for listing employees, selected with
+`settings.employee_read_engine = "columnar"`.
+
+Each organization's employees are loaded once per data version into NumPy arrays: integer
+columns for ids and foreign keys, and dictionary-encoded ("interned") string columns, where
+each row holds a code into the list of distinct values. Filters and search terms become
+vectorized boolean masks, so counting is a popcount and a page is a slice of the matching
+positions. Requires the optional `numpy` dependency (`pip install .[columnar]`).
+"""
+
+from bisect import bisect_left, bisect_right
+from collections.abc import Callable, Iterable
+from itertools import islice
+from typing import Any
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.department import Department
+from app.models.employee import Employee
+from app.models.employee_count import NO_ID
+from app.models.location import Location
+from app.models.position import Position
+from app.repositories.employee_repository import FILTER_FIELDS, SORT_COLUMNS
+from app.schemas.employee import EmployeeListQueryParams
+from app.utils.data_versions import data_versions
+from app.utils.metrics import employee_list_query_duration_seconds
+from app.utils.pagination_cache import Cursor
+from app.utils.search_text import digits_only, normalize_search_text
+from app.utils.server_timing import timed_phase
+from app.utils.single_flight import SingleFlight
+from app.utils.versioned_cache import VersionedCache
+
+# Foreign key columns, stored as integers with NO_ID for NULL
+ID_COLUMNS = ("company_id", "department_id", "location_id", "position_id")
+# Columns stored as dictionary-encoded strings
+STRING_COLUMNS = (
+    "first_name",
+    "last_name",
+    "email",
+    "phone",
+    "avatar",
+    "status",
+    "first_name_search",
+    "last_name_search",
+    "email_search",
+    "phone_digits",
+)
+SEARCH_COLUMNS = ("first_name_search", "last_name_search", "email_search")
+
+
+class StringColumn:
+    """
+    Dictionary-encoded string column: `codes[i]` is the index of row i's value in `values`.
+
+    Predicates are evaluated once per distinct value rather than once per row, which makes
+    them cheap on repetitive columns such as names and statuses.
+    """
+
+    def __init__(self, column: Iterable[str | None], length: int):
+        index: dict[str | None, int] = {}
+        self.codes = np.fromiter(
+            (index.setdefault(value, len(index)) for value in column), dtype=np.int32, count=length
+        )
+        self.values = list(index)
+        # (value, code) pairs sorted by value, built on the first prefix match
+        self._sorted: list[tuple[str, int]] | None = None
+
+    def matching(self, predicate: Callable[[str], bool]) -> np.ndarray:
+        """Boolean mask of the rows whose (non-NULL) value satisfies `predicate`."""
+        hits = np.fromiter(
+            (value is not None and predicate(value) for value in self.values),
+            dtype=bool,
+            count=len(self.values),
+        )
+        return hits[self.codes]
+
+    def matching_prefix(self, prefix: str) -> np.ndarray:
+        """
+        Boolean mask of the rows whose value starts with `prefix`, found by binary search in
+        the sorted distinct values instead of testing each of them.
+        """
+        if self._sorted is None:
+            self._sorted = sorted(
+                (value, code) for code, value in enumerate(self.values) if value is not None
+            )
+        hits = np.zeros(len(self.values), dtype=bool)
+        for value, code in islice(self._sorted, bisect_left(self._sorted, (prefix,)), None):
+            if not value.startswith(prefix):
+                break
+            hits[code] = True
+        return hits[self.codes]
+
+    def ranks(self) -> np.ndarray:
+        """Rank of each row's value in SQLite's order (NULL first, then by code point)."""
+        order = sorted(range(len(self.values)), key=lambda code: _sort_key(self.values[code]))
+        ranks = np.empty(len(self.values), dtype=np.int32)
+        ranks[order] = np.arange(len(order), dtype=np.int32)
+        return ranks[self.codes]
+
+    def __getitem__(self, position: int) -> str | None:
+        return self.values[self.codes[position]]
+
+
+def _sort_key(value: Any) -> tuple[bool, Any]:
+    # NULL sorts before any value, like in SQLite
+    return value is not None, value
+
+
+class EmployeeColumns:
+    """Columnar snapshot of one organization's employees, ordered by id."""
+
+    def __init__(self, rows: list[dict[str, Any]], names: dict[str, dict[int, str]]):
+        """
+        Args:
+            rows: Employee column values ordered by id
+            names: Related names, "department"/"location"/"position" -> id -> name
+        """
+        length = len(rows)
+        self.ids = np.fromiter((row["id"] for row in rows), dtype=np.int64, count=length)
+        self.id_columns = {
+            column: np.fromiter(
+                (row[column] or NO_ID for row in rows), dtype=np.int64, count=length
+            )
+            for column in ID_COLUMNS
+        }
+        self.string_columns = {
+            column: StringColumn((row[column] for row in rows), length) for column in STRING_COLUMNS
+        }
+        self.names = names
+        # Sort column -> positions in (sort key, id) order, built on the first use
+        self._orders: dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def mask(self, query_params: EmployeeListQueryParams) -> np.ndarray:
+        """Boolean mask of the employees matching the filters and search of `query_params`."""
+        mask = np.ones(len(self), dtype=bool)
+        for field in FILTER_FIELDS:
+            values = getattr(query_params, field)
+            if not values:
+                continue
+            if field == "status":
+                statuses = set(values)
+                mask &= self.string_columns["status"].matching(statuses.__contains__)
+            else:
+                mask &= np.isin(self.id_columns[field], values)
+        if query_params.search:
+            mask &= self._search_mask(query_params.search, query_params.search_mode)
+        return mask
+
+    def order(self, column: str) -> np.ndarray:
+        """Positions of all employees in ascending (`column`, id) order."""
+        if column == "id":
+            return np.arange(len(self))
+        order = self._orders.get(column)
+        if order is None:
+            if column in ID_COLUMNS:
+                # NO_ID sorts before any id, like NULL
+                keys = self.id_columns[column]
+            else:
+                keys = self.string_columns[column].ranks()
+            # Stable, so positions (in id order) of equal keys stay in id order
+            order = self._orders[column] = np.argsort(keys, kind="stable")
+        return order
+
+    def sort_key(self, column: str, position: int) -> Any:
+        """Key of the employee at `position` in (`column`, id) order, comparable to cursors."""
+        if column == "id":
+            return int(self.ids[position])
+        if column in ID_COLUMNS:
+            value = int(self.id_columns[column][position])
+            value = None if value == NO_ID else value
+        else:
+            value = self.string_columns[column][position]
+        return *_sort_key(value), int(self.ids[position])
+
+    def _search_mask(self, search: str, search_mode: str) -> np.ndarray:
+        """
+        Same matching as `EmployeeRepository._search_filter`, except that LIKE wildcards
+        (`%`, `_`) in the term match themselves.
+        """
+        term = normalize_search_text(search)
+        columns = [self.string_columns[column] for column in SEARCH_COLUMNS]
+
+        if search_mode == "prefix":
+            mask = np.zeros(len(self), dtype=bool)
+            for column in columns:
+                mask |= column.matching_prefix(term)
+            digits = digits_only(search)
+            if digits and not any(char.isalpha() for char in search):
+                mask |= self.string_columns["phone_digits"].matching_prefix(digits)
+            return mask
+
+        lowered = search.lower()
+        mask = self.string_columns["phone"].matching(lambda value: lowered in value.lower())
+        for column in columns:
+            mask |= column.matching(lambda value: term in value)
+        return mask
+
+
+class ColumnarEmployee:
+    """
+    Read-only employee of a columnar snapshot. String attributes are decoded on access, so
+    only the displayed columns of a page are looked up.
+    """
+
+    __slots__ = ("id", "_columns", "_position")
+
+    def __init__(self, columns: EmployeeColumns, position: int):
+        self.id = int(columns.ids[position])
+        self._columns = columns
+        self._position = position
+
+    def __getattr__(self, name: str) -> Any:
+        if name in ID_COLUMNS:
+            value = int(self._columns.id_columns[name][self._position])
+            return None if value == NO_ID else value
+        if name in STRING_COLUMNS:
+            return self._columns.string_columns[name][self._position]
+        raise AttributeError(name)
+
+
+# Columnar snapshots per organization, until its employees change
+employee_columns_cache = VersionedCache(
+    "employee_columns", max_entries=settings.columnar_max_organizations
+)
+employee_columns_builds = SingleFlight("employee_columns_build")
+
+
+class ColumnarEmployeeRepository:
+    """Employee list repository evaluating filters on in-memory columns."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def list_employee(
+        self,
+        organization_id: int,
+        query_params: EmployeeListQueryParams,
+        cursor: Cursor | None = None,
+        before: Cursor | None = None,
+    ) -> tuple[list[tuple[ColumnarEmployee, str, str, str]], int]:
+        """
+        Search employees with filters, like `EmployeeRepository.list_employee`.
+
+        The matching positions are taken in the sort order of the snapshot, and cursors are
+        found in them by binary search.
+
+        Args:
+            organization_id: Organization ID to filter by
+            query_params: EmployeeListQueryParams object for filtering
+            cursor: last employee ID from previous page for key set pagination, or its
+                (sort key, ID) when sorted by another column
+            before: first employee ID (or sort key and ID) of the next page, used when
+                `cursor` is unknown
+
+        Returns:
+            Tuple of (employee data list with joined names, total_count)
+            Each item in list is (ColumnarEmployee, department_name, location_name,
+            position_name)
+        """
+        columns = await self.get_columns(organization_id)
+
+        with timed_phase("count"), employee_list_query_duration_seconds.time(query="columnar"):
+            column = SORT_COLUMNS[query_params.sort_by].key
+            descending = query_params.sort_dir == "desc"
+            order = columns.order(column)
+            # Matching positions in ascending order
+            positions = order[columns.mask(query_params)[order]]
+            total_count = len(positions)
+            page_positions = self._page(columns, positions, column, query_params, cursor, before)
+            if descending:
+                page_positions = page_positions[::-1]
+
+        with timed_phase("page"):
+            rows = [self._row(columns, int(position)) for position in page_positions]
+        return rows, total_count
+
+    async def get_columns(self, organization_id: int) -> EmployeeColumns:
+        """Get the organization's snapshot, loading it if missing or stale."""
+        columns = employee_columns_cache.get(organization_id, "")
+        if columns is None:
+            columns = await employee_columns_builds.do(
+                organization_id, lambda: self._load_columns(organization_id)
+            )
+        return columns
+
+    async def _load_columns(self, organization_id: int) -> EmployeeColumns:
+        """Load a snapshot on a session owned by the load, since concurrent callers share it."""
+        # Before loading employees, so that a change committed meanwhile makes it stale
+        version = data_versions.get(organization_id)
+        async with AsyncSession(self.db.bind) as db:
+            with employee_list_query_duration_seconds.time(query="columnar_load"):
+                result = await db.execute(
+                    select(*(getattr(Employee, column) for column in ("id", *ID_COLUMNS)))
+                    .add_columns(*(getattr(Employee, column) for column in STRING_COLUMNS))
+                    .filter(Employee.organization_id == organization_id)
+                    .order_by(Employee.id.asc())
+                )
+                rows = [dict(row) for row in result.mappings()]
+                names = {}
+                for name, model in (
+                    ("department", Department),
+                    ("location", Location),
+                    ("position", Position),
+                ):
+                    result = await db.execute(select(model.id, model.name))
+                    names[name] = dict(result.all())
+
+        columns = EmployeeColumns(rows, names)
+        employee_columns_cache.set(organization_id, "", columns, version=version)
+        return columns
+
+    @staticmethod
+    def _page(
+        columns: EmployeeColumns,
+        positions: np.ndarray,
+        column: str,
+        query_params: EmployeeListQueryParams,
+        cursor: Cursor | None,
+        before: Cursor | None,
+    ) -> np.ndarray:
+        """Slice the page of `query_params` out of `positions`, in ascending order."""
+        limit = query_params.limit
+        descending = query_params.sort_dir == "desc"
+        if cursor is None and before is None:
+            offset = (query_params.page - 1) * limit
+            if descending:
+                # Counted from the end of the ascending positions
+                end = max(len(positions) - offset, 0)
+                return positions[max(end - limit, 0) : end]
+            return positions[offset : offset + limit]
+
+        bound = cursor if cursor is not None else before
+        if column != "id":
+            bound = (*_sort_key(bound[0]), bound[1])
+
+        def key(position: int) -> Any:
+            return columns.sort_key(column, position)
+
+        # Pages after the cursor in descending order, or before the next page in ascending
+        # order, are the positions below the bound
+        if (cursor is not None) == descending:
+            end = bisect_left(positions, bound, key=key)
+            return positions[max(end - limit, 0) : end]
+        start = bisect_right(positions, bound, key=key)
+        return positions[start : start + limit]
+
+    @staticmethod
+    def _row(columns: EmployeeColumns, position: int) -> tuple[ColumnarEmployee, str, str, str]:
+        employee = ColumnarEmployee(columns, position)
+        return (
+            employee,
+            *(
+                columns.names[name].get(int(columns.id_columns[f"{name}_id"][position]))
+                for name in ("department", "location", "position")
+            ),
+        )
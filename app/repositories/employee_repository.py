@@ -1,11 +1,83 @@
-from sqlalchemy import Row, func, or_, select
+import asyncio
+from array import array
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import (
+    ColumnElement,
+    Row,
+    Select,
+    and_,
+    case,
+    func,
+    literal,
+    or_,
+    select,
+    tuple_,
+    union_all,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
 
+from app.config import settings
 from app.models.department import Department
 from app.models.employee import Employee
+from app.models.employee_count import NO_ID, EmployeeCount
+from app.models.employee_tombstone import EmployeeTombstone
 from app.models.location import Location
 from app.models.position import Position
 from app.schemas.employee import EmployeeListQueryParams
+from app.utils.metrics import employee_list_query_duration_seconds
+from app.utils.pagination_cache import Cursor
+from app.utils.search_text import digits_only, normalize_search_text, prefix_upper_bound
+from app.utils.server_timing import timed_phase
+
+# Multi-valued filter fields of EmployeeListQueryParams
+FILTER_FIELDS = ("company_id", "department_id", "location_id", "position_id", "status")
+# Filter fields that are part of the employee_counts buckets
+SUMMARY_FIELDS = ("status", "department_id", "location_id")
+
+# Sort keys of EmployeeListQueryParams -> sorted column. Each column leads an
+# (organization_id, column) index, which SQLite ends with the rowid (id), so a page after a
+# (column, id) cursor is an index seek
+SORT_COLUMNS = {
+    "id": Employee.id,
+    "first_name": Employee.first_name_search,
+    "last_name": Employee.last_name_search,
+    "email": Employee.email_search,
+    "status": Employee.status,
+    "department": Employee.department_id,
+}
+
+# Facet name -> (filter field of EmployeeListQueryParams, grouped column, model holding its name)
+# Integer columns come first, the UNION ALL takes its column types from the first query
+FACETS = {
+    "department": ("department_id", Employee.department_id, Department),
+    "location": ("location_id", Employee.location_id, Location),
+    "position": ("position_id", Employee.position_id, Position),
+    "status": ("status", Employee.status, None),
+}
+
+
+# Employees sampled, in id order, to estimate totals past the count cap
+COUNT_ESTIMATE_SAMPLE_SIZE = 2000
+
+
+class EstimatedCount(int):
+    """
+    Total of a count that stopped past `settings.list_count_cap` matches: the cap itself, or
+    an estimate with `settings.list_count_estimate`.
+    """
+
+
+@dataclass(frozen=True)
+class _PagePlan:
+    """Queries reading a page in sort order, or in reverse order when `reverse`."""
+
+    queries: list[Select]
+    limit: int
+    reverse: bool = False
 
 
 class EmployeeRepository:
@@ -18,28 +90,464 @@ class EmployeeRepository:
         self,
         organization_id: int,
         query_params: EmployeeListQueryParams,
-        previous_id: int | None = None,
+        cursor: Cursor | None = None,
+        before: Cursor | None = None,
     ) -> tuple[list[Row[tuple[Employee, str, str, str]]], int]:
         """
-        Search employees with filters using id-based keyset pagination.
+        Search employees with filters using keyset pagination on the sort key and id.
         Uses JOINs to fetch related department, location, and position names.
 
+        Pages are sought forward after `cursor`, or backward before `before`, reading the
+        index in reverse and reversing the rows. Without a cursor, pages closer to the end
+        than to the start are read backward from the end, so the last page is a seek too.
+
         Args:
             organization_id: Organization ID to filter by
             query_params: EmployeeListQueryParams object for filtering
-            previous_id: last employee ID from previous page for key set pagination
+            cursor: last employee ID from previous page for key set pagination, or its
+                (sort key, ID) when sorted by another column
+            before: first employee ID (or sort key and ID) of the next page, used when
+                `cursor` is unknown
 
         Returns:
             Tuple of (employee data list with joined names, total_count)
             Each item in list is (Employee, department_name, location_name, position_name)
         """
+        filters = self.build_filters(organization_id=organization_id, query_params=query_params)
+
         # Count total records with same filters (for pagination metadata)
-        count_query = select(func.count(Employee.id)).filter(
-            Employee.organization_id == organization_id
+        count_query = self.build_count_query(
+            organization_id=organization_id, query_params=query_params, filters=filters
         )
 
-        # Start with base query filtered by organization with JOINs
+        if settings.concurrent_count_query:
+            # Run the count on a second pooled connection while the page query runs on this
+            # session's connection, so latency is the max of the two instead of their sum.
+            # Both queries are read-only, but they may see slightly different snapshots.
+            # The page can't be located from the end without the total.
+            page = self._page_plan(filters, query_params, cursor=cursor, before=before)
+            total_count, rows = await asyncio.gather(
+                self._count_on_separate_connection(count_query, query_params),
+                self._fetch_plan(page),
+            )
+        else:
+            total_count = await self._count(self.db, count_query, query_params)
+            # A capped total doesn't locate the end of the list
+            page = self._page_plan(
+                filters,
+                query_params,
+                cursor=cursor,
+                before=before,
+                total_count=None if isinstance(total_count, EstimatedCount) else total_count,
+            )
+            rows = await self._fetch_plan(page)
+
+        return rows, total_count
+
+    async def list_ids(
+        self,
+        organization_id: int,
+        query_params: EmployeeListQueryParams,
+        limit: int | None = None,
+    ) -> array:
+        """
+        Find the ids of all employees matching `query_params`.
+
+        The ids are concatenated by SQLite and returned as a single string, which is much
+        cheaper to transfer than one row per employee.
+
+        Args:
+            organization_id: Organization ID to filter by
+            query_params: EmployeeListQueryParams object for filtering
+            limit: Stop after this many ids, any of the matching ones
+
+        Returns:
+            Ascending employee ids as an array of unsigned 32-bit integers
+        """
+        filters = self.build_filters(organization_id=organization_id, query_params=query_params)
+        if limit is None:
+            query = select(func.group_concat(Employee.id)).filter(*filters)
+        else:
+            matches = select(Employee.id).filter(*filters).limit(limit).subquery()
+            query = select(func.group_concat(matches.c.id))
+
+        with timed_phase("count"), employee_list_query_duration_seconds.time(query="ids"):
+            result = await self.db.execute(query)
+            ids = result.scalar()
+        # group_concat doesn't guarantee any order before SQLite 3.44 (ORDER BY in aggregates)
+        return array("I", sorted(map(int, ids.split(",")))) if ids else array("I")
+
+    async def list_filter_fields(
+        self, organization_id: int, fields: tuple[str, ...]
+    ) -> list[dict[str, Any]]:
+        """
+        Load the id and filter `fields` of every employee of an organization, ordered by id,
+        to build its bitmap indexes.
+        """
+        columns = [Employee.id, *(getattr(Employee, field) for field in fields)]
+        with employee_list_query_duration_seconds.time(query="bitmaps"):
+            result = await self.db.execute(
+                select(*columns)
+                .filter(Employee.organization_id == organization_id)
+                .order_by(Employee.id.asc())
+            )
+            return [dict(row) for row in result.mappings()]
+
+    async def list_by_ids(
+        self, employee_ids: list[int]
+    ) -> list[Row[tuple[Employee, str, str, str]]]:
+        """
+        Fetch employees by id with joined names, like a page of `list_employee`.
+
+        Args:
+            employee_ids: IDs of the page's employees, found beforehand (e.g. by a search)
+
+        Returns:
+            Rows ordered by id, each item is (Employee, department_name, location_name,
+            position_name)
+        """
+        query = self._joined_query().filter(self._in_filter(Employee.id, employee_ids))
+        return await self._fetch_page(query.order_by(Employee.id.asc()))
+
+    async def list_changed(
+        self,
+        organization_id: int,
+        changed_since: datetime,
+        after_id: int,
+        until: datetime,
+        limit: int,
+    ) -> list[Row[tuple[Employee, str, str, str]]]:
+        """
+        Fetch employees created or updated after the (changed_since, after_id) watermark and
+        at most at `until`, with joined names, ordered by (updated_at, id).
+
+        A range seek on the (organization_id, updated_at, id) index, proportional to the
+        number of changes rather than to the size of the organization.
+        """
+        watermark = tuple_(
+            literal(changed_since, Employee.updated_at.type), literal(after_id, Employee.id.type)
+        )
+        query = (
+            self._joined_query()
+            .filter(
+                Employee.organization_id == organization_id,
+                tuple_(Employee.updated_at, Employee.id) > watermark,
+                Employee.updated_at <= until,
+            )
+            .order_by(Employee.updated_at.asc(), Employee.id.asc())
+            .limit(limit)
+        )
+        with employee_list_query_duration_seconds.time(query="changes"):
+            result = await self.db.execute(query)
+            return list(result.all())
+
+    async def list_tombstones(
+        self,
+        organization_id: int,
+        changed_since: datetime,
+        after_id: int,
+        until: datetime,
+        limit: int,
+    ) -> list[Row[tuple[datetime, int]]]:
+        """
+        Fetch (deleted_at, employee_id) of the employees deleted from an organization after
+        the (changed_since, after_id) watermark and at most at `until`, in that order.
+        """
+        watermark = tuple_(
+            literal(changed_since, EmployeeTombstone.deleted_at.type),
+            literal(after_id, EmployeeTombstone.employee_id.type),
+        )
+        query = (
+            select(EmployeeTombstone.deleted_at, EmployeeTombstone.employee_id)
+            .filter(
+                EmployeeTombstone.organization_id == organization_id,
+                tuple_(EmployeeTombstone.deleted_at, EmployeeTombstone.employee_id) > watermark,
+                EmployeeTombstone.deleted_at <= until,
+            )
+            .order_by(EmployeeTombstone.deleted_at.asc(), EmployeeTombstone.employee_id.asc())
+            .limit(limit)
+        )
+        with employee_list_query_duration_seconds.time(query="tombstones"):
+            result = await self.db.execute(query)
+            return list(result.all())
+
+    async def search_matches(
+        self,
+        organization_id: int,
+        query_params: EmployeeListQueryParams,
+        limit: int,
+    ) -> list[Row[tuple[int, str | None, str | None, str | None, str | None]]]:
+        """
+        Find the employees matching the search term and filters, with the normalized names,
+        email and the phone number the term was matched against.
+
+        Args:
+            organization_id: Organization ID to filter by
+            query_params: EmployeeListQueryParams object for filtering
+            limit: Stop after this many matches
+
+        Returns:
+            Matches ordered by id, each item is (id, first_name_search, last_name_search,
+            email_search, phone)
+        """
+        filters = self.build_filters(organization_id=organization_id, query_params=query_params)
         query = (
+            select(
+                Employee.id,
+                Employee.first_name_search,
+                Employee.last_name_search,
+                Employee.email_search,
+                Employee.phone,
+            )
+            .filter(*filters)
+            .order_by(Employee.id.asc())
+            .limit(limit)
+        )
+
+        with timed_phase("count"), employee_list_query_duration_seconds.time(query="matches"):
+            result = await self.db.execute(query)
+            return list(result.all())
+
+    async def facet_counts(
+        self,
+        organization_id: int,
+        query_params: EmployeeListQueryParams,
+    ) -> list[Row[tuple[str, int | str | None, str | None, int]]]:
+        """
+        Count employees per value of each facet (department, location, position, status)
+        in a single UNION ALL query.
+
+        Facets are disjunctive: each facet is counted with every filter except its own, so
+        the counts show how many employees selecting another value of that facet would add.
+
+        Args:
+            organization_id: Organization ID to filter by
+            query_params: EmployeeListQueryParams object for filtering
+
+        Returns:
+            List of (facet, value, label, count), label is the related name or the status
+        """
+        facet_queries = []
+        for facet, (field, column, label_model) in FACETS.items():
+            count = func.count(Employee.id)
+            value = column
+            filters = self._summary_filters(
+                organization_id=organization_id, query_params=query_params, exclude=field
+            )
+            if filters is not None and field in SUMMARY_FIELDS:
+                # Sum the matching buckets of employee_counts instead of counting employees
+                column = getattr(EmployeeCount, field)
+                count = func.sum(EmployeeCount.count)
+                value = func.nullif(column, NO_ID) if label_model is not None else column
+            else:
+                filters = self.build_filters(
+                    organization_id=organization_id, query_params=query_params, exclude=field
+                )
+
+            label = label_model.name if label_model is not None else column
+            query = select(
+                literal(facet).label("facet"),
+                value.label("value"),
+                label.label("label"),
+                count.label("count"),
+            )
+            if label_model is not None:
+                query = query.outerjoin(label_model, column == label_model.id)
+            facet_queries.append(query.filter(*filters).group_by(column, label))
+
+        with timed_phase("facets"), employee_list_query_duration_seconds.time(query="facets"):
+            result = await self.db.execute(union_all(*facet_queries))
+            return list(result.all())
+
+    async def list_suggestion_fields(
+        self, organization_id: int, fields: tuple[str, ...]
+    ) -> list[dict[str, Any]]:
+        """
+        Load the id and `fields` of every employee of an organization, to build its
+        typeahead prefix index.
+        """
+        columns = [Employee.id, *(getattr(Employee, field) for field in fields)]
+        with employee_list_query_duration_seconds.time(query="suggestions"):
+            result = await self.db.execute(
+                select(*columns).filter(Employee.organization_id == organization_id)
+            )
+            return [dict(row) for row in result.mappings()]
+
+    async def list_related_names(self, organization_id: int) -> dict[str, dict[int, str]]:
+        """
+        Load the names of the departments, locations and positions of an organization's
+        employees, by id.
+        """
+        query = union_all(
+            *(
+                select(literal(name), model.id, model.name).filter(
+                    model.id.in_(
+                        select(getattr(Employee, f"{name}_id")).filter(
+                            Employee.organization_id == organization_id
+                        )
+                    )
+                )
+                for name, model in (
+                    ("department", Department),
+                    ("location", Location),
+                    ("position", Position),
+                )
+            )
+        )
+        with employee_list_query_duration_seconds.time(query="related_names"):
+            result = await self.db.execute(query)
+        names: dict[str, dict[int, str]] = {"department": {}, "location": {}, "position": {}}
+        for name, id_, value in result.all():
+            names[name][id_] = value
+        return names
+
+    def build_count_query(
+        self,
+        organization_id: int,
+        query_params: EmployeeListQueryParams,
+        filters: list[ColumnElement[bool]],
+    ) -> Select:
+        """
+        Build the query counting employees matching `query_params`.
+
+        Without a search term and with filters on status, department and location only, the
+        count sums the matching buckets of the trigger-maintained employee_counts table, so it
+        reads at most a few hundred bucket rows instead of every matching employee.
+
+        Other counts scan the matching employees, and stop after `settings.list_count_cap` + 1
+        of them. With `settings.list_count_estimate`, the query also returns the sample that
+        `capped_total` estimates the total from, only read when the count stopped.
+
+        Args:
+            organization_id: Organization ID to filter by
+            query_params: EmployeeListQueryParams object for filtering
+            filters: Conditions from `build_filters` for counting employee rows
+        """
+        summary_filters = self._summary_filters(
+            organization_id=organization_id, query_params=query_params
+        )
+        if summary_filters is not None:
+            return select(func.coalesce(func.sum(EmployeeCount.count), 0)).filter(*summary_filters)
+        if settings.list_count_cap <= 0:
+            return select(func.count(Employee.id)).filter(*filters)
+        cap = settings.list_count_cap
+        matches = select(Employee.id).filter(*filters).limit(cap + 1)
+        count = select(func.count().label("count")).select_from(matches.subquery()).subquery()
+        if not settings.list_count_estimate:
+            return select(count.c.count)
+
+        sample = (
+            select(Employee.id)
+            .filter(Employee.organization_id == organization_id)
+            .order_by(Employee.id)
+            .limit(COUNT_ESTIMATE_SAMPLE_SIZE)
+        )
+        sample_matches = select(func.count(Employee.id)).filter(*filters, Employee.id.in_(sample))
+        organization_total = select(func.coalesce(func.sum(EmployeeCount.count), 0)).filter(
+            EmployeeCount.organization_id == organization_id
+        )
+        # SQLite only runs the subqueries of the CASE branch it takes
+        capped = count.c.count > cap
+        return select(
+            count.c.count,
+            case((capped, sample_matches.scalar_subquery())),
+            case((capped, organization_total.scalar_subquery())),
+        )
+
+    @staticmethod
+    def capped_total(sample: tuple[int, int] | None = None) -> EstimatedCount:
+        """
+        Total reported when more than `settings.list_count_cap` employees match: the cap, or
+        with `settings.list_count_estimate` the share of matches among the organization's
+        first `COUNT_ESTIMATE_SAMPLE_SIZE` employees (by id) times its number of employees.
+        The sample is read by primary key whatever the filters, so the estimate costs the
+        same for every query, but assumes matches are spread evenly over ids.
+
+        Args:
+            sample: (matches in the sample, employees of the organization), read by the count
+                query of `build_count_query`
+        """
+        cap = settings.list_count_cap
+        if sample is None:
+            return EstimatedCount(cap)
+        matches, total = sample
+        sampled = min(total, COUNT_ESTIMATE_SAMPLE_SIZE)
+        estimate = round(matches * total / sampled) if sampled else 0
+        # More than the cap matched, whatever the sample says
+        return EstimatedCount(max(estimate, cap + 1))
+
+    @staticmethod
+    def can_count_from_summary(
+        query_params: EmployeeListQueryParams, exclude: str | None = None
+    ) -> bool:
+        """
+        Whether employees matching `query_params` (ignoring the `exclude` filter) are counted
+        from employee_counts buckets rather than by scanning employee rows.
+        """
+        if not settings.count_from_summary or query_params.search:
+            return False
+        return not any(
+            field not in SUMMARY_FIELDS and field != exclude and getattr(query_params, field)
+            for field in FILTER_FIELDS
+        )
+
+    def _summary_filters(
+        self,
+        organization_id: int,
+        query_params: EmployeeListQueryParams,
+        exclude: str | None = None,
+    ) -> list[ColumnElement[bool]] | None:
+        """
+        Build the conditions on employee_counts buckets equivalent to `build_filters`, or None
+        if the filters can't be answered from it (search term, company or position filters).
+        """
+        if not self.can_count_from_summary(query_params=query_params, exclude=exclude):
+            return None
+
+        filters = [EmployeeCount.organization_id == organization_id]
+        for field in SUMMARY_FIELDS:
+            values = getattr(query_params, field)
+            if values and field != exclude:
+                filters.append(self._in_filter(getattr(EmployeeCount, field), values))
+        return filters
+
+    def build_filters(
+        self,
+        organization_id: int,
+        query_params: EmployeeListQueryParams,
+        exclude: str | None = None,
+    ) -> list[ColumnElement[bool]]:
+        """
+        Build the WHERE conditions for the organization, search term and filters of
+        `query_params`, shared by the page, count and facet queries.
+
+        Args:
+            organization_id: Organization ID to filter by
+            query_params: EmployeeListQueryParams object for filtering
+            exclude: Name of a filter field of `query_params` to leave out
+
+        Returns:
+            List of conditions to be ANDed together
+        """
+        filters = [Employee.organization_id == organization_id]
+
+        # Apply search filter
+        if query_params.search:
+            filters.append(self._search_filter(query_params.search, query_params.search_mode))
+
+        # Apply company, department, location, position and status filters
+        # (each supports multiple values)
+        for field in FILTER_FIELDS:
+            values = getattr(query_params, field)
+            if values and field != exclude:
+                filters.append(self._in_filter(getattr(Employee, field), values))
+
+        return filters
+
+    @staticmethod
+    def _joined_query() -> Select:
+        """Select employees with their department, location and position names."""
+        return (
             select(
                 Employee,
                 Department.name.label("department_name"),
@@ -49,67 +557,181 @@ class EmployeeRepository:
             .outerjoin(Department, Employee.department_id == Department.id)
             .outerjoin(Location, Employee.location_id == Location.id)
             .outerjoin(Position, Employee.position_id == Position.id)
-            .filter(Employee.organization_id == organization_id)
         )
 
-        # Apply search filter
-        if query_params.search:
-            search_term = f"%{query_params.search}%"
-            search_filter = or_(
-                Employee.first_name.ilike(search_term),
-                Employee.last_name.ilike(search_term),
-                Employee.email.ilike(search_term),
-                Employee.phone.ilike(search_term),
+    def _page_plan(
+        self,
+        filters: list[ColumnElement[bool]],
+        query_params: EmployeeListQueryParams,
+        cursor: Cursor | None,
+        before: Cursor | None,
+        total_count: int | None = None,
+    ) -> _PagePlan:
+        """Choose how to read the requested page, see `list_employee`."""
+        column = SORT_COLUMNS[query_params.sort_by]
+        descending = query_params.sort_dir == "desc"
+        limit = query_params.limit
+        offset = (query_params.page - 1) * limit
+
+        if cursor is None and before is not None:
+            # Rows before the next page's first row are rows after it in reverse order
+            queries = self._page_queries(filters, column, not descending, cursor=before)
+            return _PagePlan(queries, limit=limit, reverse=True)
+
+        from_end = None if total_count is None else total_count - offset - limit
+        if cursor is None and offset and from_end is not None and offset > from_end:
+            # Closer to the end: skip the rows after the page in reverse order
+            queries = self._page_queries(
+                filters, column, not descending, cursor=None, offset=max(from_end, 0)
             )
-            query = query.filter(search_filter)
-            count_query = count_query.filter(search_filter)
-
-        # Apply company filter (supports multiple IDs)
-        if query_params.company_id and len(query_params.company_id) > 0:
-            company_filter = Employee.company_id.in_(query_params.company_id)
-            query = query.filter(company_filter)
-            count_query = count_query.filter(company_filter)
-
-        # Apply department filter (supports multiple IDs)
-        if query_params.department_id and len(query_params.department_id) > 0:
-            dept_filter = Employee.department_id.in_(query_params.department_id)
-            query = query.filter(dept_filter)
-            count_query = count_query.filter(dept_filter)
-
-        # Apply location filter (supports multiple IDs)
-        if query_params.location_id and len(query_params.location_id) > 0:
-            loc_filter = Employee.location_id.in_(query_params.location_id)
-            query = query.filter(loc_filter)
-            count_query = count_query.filter(loc_filter)
-
-        # Apply position filter (supports multiple IDs)
-        if query_params.position_id and len(query_params.position_id) > 0:
-            pos_filter = Employee.position_id.in_(query_params.position_id)
-            query = query.filter(pos_filter)
-            count_query = count_query.filter(pos_filter)
-
-        # Apply status filter
-        if query_params.status and len(query_params.status) > 0:
-            status_filter = Employee.status.in_(query_params.status)
-            query = query.filter(status_filter)
-            count_query = count_query.filter(status_filter)
-
-        # Get total count
-        count_result = await self.db.execute(count_query)
-        total_count = count_result.scalar() or 0
-
-        if previous_id:
-            # Apply id-based keyset pagination if previous_id is provided
-            query = query.filter(Employee.id > previous_id)
-        elif query_params.page > 1:
-            # Apply offset-based pagination as fallback
-            query = query.offset((query_params.page - 1) * query_params.limit)
-
-        # Order by id for consistent pagination
-        query = query.order_by(Employee.id.asc())
-
-        query = query.limit(query_params.limit)
-        result = await self.db.execute(query)
-        rows = list(result.all())
+            # The last page may be partial, pages past the end are empty
+            limit = max(min(limit, total_count - offset), 0)
+            return _PagePlan(queries, limit=limit, reverse=True)
 
-        return rows, total_count
+        queries = self._page_queries(
+            filters, column, descending, cursor=cursor, offset=0 if cursor else offset
+        )
+        return _PagePlan(queries, limit=limit)
+
+    def _page_queries(
+        self,
+        filters: list[ColumnElement[bool]],
+        column: InstrumentedAttribute,
+        descending: bool,
+        cursor: Cursor | None,
+        offset: int = 0,
+    ) -> list[Select]:
+        """
+        Build the page queries of the employee list, without their limit: one query, or the
+        segments of the sort order after the cursor when it straddles the NULL sort keys
+        (SQLite sorts NULLs first), each of them an index seek.
+        """
+        # Start with base query filtered by organization with JOINs
+        query = self._joined_query().filter(*filters)
+
+        def ordered(query: Select, *columns: InstrumentedAttribute) -> Select:
+            return query.order_by(*(c.desc() if descending else c.asc() for c in columns))
+
+        if column is Employee.id:
+            if cursor:
+                # Apply id-based keyset pagination if a cursor is provided
+                query = query.filter(Employee.id < cursor if descending else Employee.id > cursor)
+            elif offset:
+                # Apply offset-based pagination as fallback
+                query = query.offset(offset)
+            # Order by id for consistent pagination
+            return [ordered(query, Employee.id)]
+
+        if cursor is None:
+            if offset:
+                query = query.offset(offset)
+            return [ordered(query, column, Employee.id)]
+
+        key, previous_id = cursor
+        is_null = column.is_(None)
+        if key is None and descending:
+            return [ordered(query.filter(is_null, Employee.id < previous_id), Employee.id)]
+        if key is None:
+            return [
+                ordered(query.filter(is_null, Employee.id > previous_id), Employee.id),
+                ordered(query.filter(column.is_not(None)), column, Employee.id),
+            ]
+
+        keyset = tuple_(column, Employee.id)
+        bound = tuple_(literal(key, column.type), literal(previous_id, Employee.id.type))
+        if not descending:
+            return [ordered(query.filter(keyset > bound), column, Employee.id)]
+        queries = [ordered(query.filter(keyset < bound), column, Employee.id)]
+        if column.nullable:
+            # NULL keys compare to nothing, they come last in descending order
+            queries.append(ordered(query.filter(is_null), Employee.id))
+        return queries
+
+    @staticmethod
+    def _search_filter(search: str, search_mode: str) -> ColumnElement[bool]:
+        """
+        Match a search term against names, email and phone.
+
+        Names and email are matched on their normalized shadow columns, so matching ignores
+        case and accents. In "prefix" mode every match is a range scan of an
+        (organization_id, column) index, which SQLite combines with a multi-index OR;
+        "contains" mode has to scan all employees of the organization.
+        """
+        term = normalize_search_text(search)
+        text_columns = (
+            Employee.first_name_search,
+            Employee.last_name_search,
+            Employee.email_search,
+        )
+
+        if search_mode == "prefix":
+            upper_bound = prefix_upper_bound(term)
+            conditions = [and_(column >= term, column < upper_bound) for column in text_columns]
+            # Phone numbers are matched on their digits, whatever separators the user types
+            digits = digits_only(search)
+            if digits and not any(char.isalpha() for char in search):
+                conditions.append(
+                    and_(
+                        Employee.phone_digits >= digits,
+                        Employee.phone_digits < prefix_upper_bound(digits),
+                    )
+                )
+            return or_(*conditions)
+
+        pattern = f"%{term}%"
+        return or_(
+            *(column.like(pattern) for column in text_columns),
+            Employee.phone.ilike(f"%{search}%"),
+        )
+
+    @staticmethod
+    def _in_filter(column: InstrumentedAttribute, values: list) -> ColumnElement[bool]:
+        """
+        Build a `column IN (...)` condition.
+
+        `IN (?, ?, ...)` renders one SQL string per list length, so every new length is a miss
+        in the driver's prepared statement cache. With `settings.in_list_padding` the list is
+        padded to the next power of two by repeating its last value, which bounds the number of
+        distinct statements to log2 of the longest list while keeping the length visible to the
+        query planner.
+        """
+        if settings.in_list_padding and len(values) > 1:
+            padded_length = 1 << (len(values) - 1).bit_length()
+            values = [*values, *[values[-1]] * (padded_length - len(values))]
+        return column.in_(values)
+
+    async def _count(
+        self, db: AsyncSession, count_query: Select, query_params: EmployeeListQueryParams
+    ) -> int:
+        """Execute the count query for pagination metadata."""
+        with timed_phase("count"), employee_list_query_duration_seconds.time(query="count"):
+            count_result = await db.execute(count_query)
+            count, *sample = count_result.one()
+        cap = settings.list_count_cap
+        if cap <= 0 or count <= cap or self.can_count_from_summary(query_params):
+            return count or 0
+        return self.capped_total(tuple(sample) if sample else None)
+
+    async def _count_on_separate_connection(
+        self, count_query: Select, query_params: EmployeeListQueryParams
+    ) -> int:
+        """Execute the count query on a new session bound to the same engine."""
+        async with AsyncSession(self.db.bind) as count_db:
+            return await self._count(count_db, count_query, query_params)
+
+    async def _fetch_plan(self, page: _PagePlan) -> list[Row[tuple[Employee, str, str, str]]]:
+        """Fetch a page from the segments of its sort order, until it is full."""
+        rows: list[Row[tuple[Employee, str, str, str]]] = []
+        for query in page.queries:
+            if len(rows) >= page.limit:
+                break
+            rows.extend(await self._fetch_page(query.limit(page.limit - len(rows))))
+        if page.reverse:
+            rows.reverse()
+        return rows
+
+    async def _fetch_page(self, query: Select) -> list[Row[tuple[Employee, str, str, str]]]:
+        """Execute the page query."""
+        with timed_phase("page"), employee_list_query_duration_seconds.time(query="page"):
+            result = await self.db.execute(query)
+            return list(result.all())
@@ -2,6 +2,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.organization import Organization
+from app.utils.server_timing import timed_phase
 
 
 class OrganizationRepository:
@@ -21,7 +22,8 @@ class OrganizationRepository:
         Get the list of columns to display for an organization.
         Returns None if not exist organization, default columns if organization doesn't exist.
         """
-        org = await self.get_organization(organization_id)
+        with timed_phase("org"):
+            org = await self.get_organization(organization_id)
         if not org:
             return None
 
@@ -1,24 +1,40 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.admission import admission_control
 from app.auth import get_current_user
-from app.database import get_db
+from app.database import get_read_db
+from app.decorators.query_budget import query_budget
 from app.decorators.rate_limit import rate_limit
 from app.models.user import User
-from app.schemas.employee import EmployeeListQueryParams, EmployeeListResponse
+from app.schemas.employee import (
+    EmployeeChangesQueryParams,
+    EmployeeChangesResponse,
+    EmployeeFacetsResponse,
+    EmployeeListQueryParams,
+    EmployeeListResponse,
+    EmployeeSuggestQueryParams,
+    EmployeeSuggestResponse,
+)
 from app.services.employee_service import EmployeeService
+from app.utils.admission import db_reads
 
 router = APIRouter(prefix="/api/v1/employees", tags=["Employees"])
 
+# Sheds requests to the endpoints reading employees when too many are in flight
+admit_db_read = admission_control(db_reads)
 
-@router.get("")
+
+@router.get("", dependencies=[Depends(admit_db_read)])
+@query_budget(max_queries=4)  # auth + organization + count + page
 @rate_limit(max_requests=2, window_seconds=60)
 async def list_employee(
     query_params: Annotated[EmployeeListQueryParams, Query()],
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> EmployeeListResponse:
     """
     List employees with filters and pagination.
@@ -29,3 +45,99 @@ async def list_employee(
         organization_id=current_user.organization_id,
         query_params=query_params,
     )
+
+
+@router.get("/facets", dependencies=[Depends(admit_db_read)])
+@query_budget(max_queries=2)  # auth + facets
+@rate_limit(max_requests=2, window_seconds=60)
+async def employee_facets(
+    query_params: Annotated[EmployeeListQueryParams, Query()],
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+) -> EmployeeFacetsResponse:
+    """
+    Count employees per department, location, position and status for the same search and
+    filters as the list endpoint (pagination parameters are ignored).
+    Each facet is counted without its own filter, so all of its values stay selectable.
+    Rate limited to 2 requests per minute per user.
+    """
+    service = EmployeeService(db)
+    return await service.facet_counts(
+        organization_id=current_user.organization_id,
+        query_params=query_params,
+    )
+
+
+@router.get("/changes", dependencies=[Depends(admit_db_read)])
+@query_budget(max_queries=4)  # auth + organization + employees + tombstones
+@rate_limit(max_requests=60, window_seconds=60)
+async def list_employee_changes(
+    query_params: Annotated[EmployeeChangesQueryParams, Query()],
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+) -> EmployeeChangesResponse:
+    """
+    List employees created, updated or deleted since a watermark, for delta syncs.
+    Start a sync with the time of a full export, then pass `next_changed_since` and
+    `next_after_id` of each response until `has_more` is false.
+    Returns 410 when the watermark is older than deletions are kept, the sync must restart
+    from a full export.
+    Rate limited to 60 requests per minute per user.
+    """
+    if EmployeeService.changes_expired(query_params.changed_since):
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="Changes are no longer available since this time, restart from a full export",
+        )
+    service = EmployeeService(db)
+    return await service.list_changes(
+        organization_id=current_user.organization_id,
+        query_params=query_params,
+    )
+
+
+# Not admission controlled, a stream would hold its slot for as long as it is open
+@router.get("/stream", response_class=StreamingResponse)
+@query_budget(max_queries=3)  # auth + organization + related names
+@rate_limit(max_requests=60, window_seconds=60)
+async def stream_employee_changes(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+) -> StreamingResponse:
+    """
+    Stream the organization's employee changes as Server-Sent Events, instead of polling
+    the list: `upsert` (id and display columns), `delete` (id) and `change` (id, the row must
+    be fetched) events, or `invalidate` when changes were missed and the list must be reloaded.
+    Rate limited to 60 connections per minute per user.
+    """
+    service = EmployeeService(db)
+    events = await service.stream_changes(organization_id=current_user.organization_id)
+    if events is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Organization not found")
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        # Disable proxy buffering (nginx), events must reach the client as they are sent
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/suggest", dependencies=[Depends(admit_db_read)])
+@query_budget(max_queries=3)  # auth + organization + employees, on the first request only
+@rate_limit(max_requests=120, window_seconds=60)
+async def suggest_employee(
+    query_params: Annotated[EmployeeSuggestQueryParams, Query()],
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+) -> EmployeeSuggestResponse:
+    """
+    Suggest employees whose first name, last name, full name or email starts with `q`,
+    for typeahead inputs. Matching ignores case and accents.
+    Rate limited to 120 requests per minute per user, one per keystroke.
+    """
+    service = EmployeeService(db)
+    return await service.suggest(
+        organization_id=current_user.organization_id,
+        prefix=query_params.q,
+        limit=query_params.limit,
+    )
@@ -1,6 +1,7 @@
-from typing import Any
+from datetime import UTC, datetime
+from typing import Any, Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
 from app.models import EmployeeStatus
 
@@ -11,6 +12,13 @@ class EmployeeListQueryParams(BaseModel):
     search: str | None = Field(
         None, description="Search term for name, email, or phone", max_length=100
     )
+    search_mode: Literal["contains", "prefix"] = Field(
+        "contains",
+        description=(
+            "Match the search term anywhere in names, email or phone (contains), or at their "
+            "start (prefix, served from indexes, for typeahead)"
+        ),
+    )
     status: list[str] | None = Field(
         None, description="Filter by employee status (Active, Not Started, Terminated)"
     )
@@ -26,6 +34,14 @@ class EmployeeListQueryParams(BaseModel):
     position_id: list[int] | None = Field(
         None, description="Filter by position IDs (supports multiple)"
     )
+    sort_by: Literal["id", "first_name", "last_name", "email", "status", "department"] = Field(
+        "id",
+        description=(
+            "Sort key, ties are ordered by ID. Names and email sort ignoring case and accents, "
+            "department groups employees by department ID"
+        ),
+    )
+    sort_dir: Literal["asc", "desc"] = Field("asc", description="Sort direction")
     limit: int = Field(50, description="Number of results per page", ge=1, le=100)
     page: int = Field(
         1, description="Page number (1-indexed)", ge=1
@@ -41,5 +57,101 @@ class EmployeeListResponse(BaseModel):
     )
     total_returned: int = Field(..., description="Number of employees in current response")
     total_records: int = Field(..., description="Total number of records matching the filters")
+    total_is_estimate: bool = Field(
+        False,
+        description="The count stopped at a cap: total_records is a lower bound or an estimate",
+    )
     total_pages: int = Field(..., description="Total number of pages")
     page: int = Field(..., description="Current page number")
+
+
+class FacetCount(BaseModel):
+    """Number of employees with one value of a facet."""
+
+    value: int | str | None = Field(..., description="Filter value (ID or status)")
+    label: str | None = Field(..., description="Display name of the value")
+    count: int = Field(..., description="Number of matching employees")
+
+
+class EmployeeFacetsResponse(BaseModel):
+    """Response model for employee facet counts."""
+
+    facets: dict[str, list[FacetCount]] = Field(
+        ...,
+        description=(
+            "Counts per facet (department, location, position, status). Each facet is "
+            "counted with all filters except its own"
+        ),
+    )
+
+
+class EmployeeSuggestQueryParams(BaseModel):
+    """Query parameters for employee suggest endpoint."""
+
+    q: str = Field(
+        ...,
+        description="Prefix of a first name, last name, full name or email",
+        min_length=2,
+        max_length=100,
+    )
+    limit: int = Field(10, description="Maximum number of suggestions", ge=1, le=50)
+
+
+class EmployeeSuggestResponse(BaseModel):
+    """Response model for employee suggestions."""
+
+    suggestions: list[dict[str, Any]] = Field(
+        ...,
+        description=(
+            "Matching employees with their ID and the configured name and email columns, "
+            "ordered by the matched value"
+        ),
+    )
+
+
+class EmployeeChangesQueryParams(BaseModel):
+    """Query parameters for employee changes (delta sync) endpoint."""
+
+    changed_since: datetime = Field(
+        ...,
+        description=(
+            "Return changes made after this time (UTC unless it has an offset), "
+            "`next_changed_since` of the previous response to continue a sync"
+        ),
+    )
+    after_id: int = Field(
+        0,
+        description=(
+            "Among changes made exactly at `changed_since`, only return employees with a "
+            "greater ID (`next_after_id` of the previous response)"
+        ),
+        ge=0,
+    )
+    limit: int = Field(100, description="Maximum number of changes", ge=1, le=1000)
+
+    @field_validator("changed_since")
+    @classmethod
+    def to_naive_utc(cls, value: datetime) -> datetime:
+        """Timestamps are stored as naive UTC."""
+        if value.tzinfo is not None:
+            value = value.astimezone(UTC).replace(tzinfo=None)
+        return value
+
+
+class EmployeeChangesResponse(BaseModel):
+    """Response model for employee changes."""
+
+    display_columns: list[str] | None = Field(..., description="List of configured columns")
+    employees: list[dict[str, Any]] = Field(
+        ...,
+        description=(
+            "Employees created or updated since the watermark, with configured columns and "
+            "`updated_at`"
+        ),
+    )
+    deleted_ids: list[int] = Field(
+        ..., description="IDs of employees deleted or moved out of the organization"
+    )
+    next_changed_since: datetime = Field(..., description="`changed_since` of the next request")
+    next_after_id: int = Field(..., description="`after_id` of the next request")
+    has_more: bool = Field(..., description="Whether more changes are ready to be fetched")
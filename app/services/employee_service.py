@@ -1,13 +1,92 @@
 import math
+from array import array
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime, timedelta
 from typing import Any
 
 from sqlalchemy import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.repositories.employee_repository import EmployeeRepository
+from app.config import settings
+from app.database import release_connection
+from app.models.base import utcnow
+from app.models.employee import Employee
+from app.models.employee_tombstone import TOMBSTONE_RETENTION_DAYS
+from app.repositories.employee_repository import (
+    FACETS,
+    SORT_COLUMNS,
+    EmployeeRepository,
+    EstimatedCount,
+)
 from app.repositories.organization_repository import OrganizationRepository
-from app.schemas.employee import EmployeeListQueryParams, EmployeeListResponse
-from app.utils.pagination_cache import pagination_cache
+from app.schemas.employee import (
+    EmployeeChangesQueryParams,
+    EmployeeChangesResponse,
+    EmployeeFacetsResponse,
+    EmployeeListQueryParams,
+    EmployeeListResponse,
+    EmployeeSuggestResponse,
+    FacetCount,
+)
+from app.utils.bitmap_index import BITMAP_FIELDS, BitmapIndex
+from app.utils.change_hub import RELATED_COLUMNS, ChangeHub
+from app.utils.change_log import change_log_follower
+from app.utils.data_versions import data_versions
+from app.utils.employee_changes import subscribe
+from app.utils.metrics import registry
+from app.utils.organization_indexes import OrganizationIndexes
+from app.utils.pagination_cache import Cursor, pagination_cache
+from app.utils.prefix_index import SUGGEST_FIELDS, PrefixIndex
+from app.utils.query_stats import allow_extra_queries
+from app.utils.search_refinement import SearchMatches, can_refine, find_matches, remember
+from app.utils.search_text import normalize_search_text
+from app.utils.server_timing import timed_phase
+from app.utils.single_flight import SingleFlight
+from app.utils.versioned_cache import VersionedCache
+
+# Coalesces identical concurrent list requests (same organization, filters and page)
+list_employee_flights = SingleFlight("list_employee")
+
+# Facet counts per organization and filters, until the organization's employees change
+facet_cache = VersionedCache("employee_facets", max_entries=settings.facet_cache_size)
+
+# Matches of the most recent search terms per organization and filters, refined in memory
+# while the user keeps typing
+search_refinement_cache = VersionedCache(
+    "search_refinement", max_entries=settings.search_refinement_cache_size
+)
+SEARCH_REFINEMENT_TERMS = 4
+
+# Ordered ids of all employees matching heavy list requests, per organization and filters
+result_set_cache = VersionedCache(
+    "result_set", max_entries=10_000, max_bytes=settings.result_set_cache_bytes
+)
+
+# Bitmap indexes of the filter fields per organization, kept up to date like the prefix indexes
+bitmap_indexes = OrganizationIndexes(
+    "bitmap_index", max_organizations=settings.bitmap_index_max_organizations
+)
+subscribe(bitmap_indexes.apply)
+
+# Fans out employee changes to the Server-Sent Events subscribers of this worker
+change_hub = ChangeHub(
+    queue_size=settings.stream_queue_size, heartbeat_seconds=settings.stream_heartbeat_seconds
+)
+subscribe(change_hub.publish)
+# Names of the related rows of each organization's employees, for its stream subscribers
+related_names_cache = VersionedCache("related_names", max_entries=10_000)
+change_log_follower.subscribe(change_hub.invalidate)
+registry.gauge(
+    "change_hub_subscribers",
+    "Number of Server-Sent Events subscribers of this worker",
+    callback=change_hub.size,
+)
+
+# Typeahead prefix indexes per organization, kept up to date with committed employee changes
+suggest_indexes = OrganizationIndexes(
+    "prefix_index", max_organizations=settings.suggest_index_max_organizations
+)
+subscribe(suggest_indexes.apply)
 
 
 class EmployeeService:
@@ -26,7 +105,213 @@ class EmployeeService:
         """
         Search employees with filters and return only configured columns.
         Supports both page-based and cursor-based pagination.
+
+        Identical concurrent calls are coalesced into a single computation.
+        """
+        if not settings.list_single_flight:
+            return await self._list_employee(organization_id, query_params)
+
+        flight_key = pagination_cache.generate_cache_key(
+            organization_id=organization_id, **query_params.model_dump()
+        )
+        return await list_employee_flights.do(
+            flight_key,
+            lambda: self._list_employee_in_new_session(organization_id, query_params),
+        )
+
+    async def facet_counts(
+        self,
+        organization_id: int,
+        query_params: EmployeeListQueryParams,
+    ) -> EmployeeFacetsResponse:
+        """
+        Count employees per department, location, position and status for the current
+        search and filters. Results are cached until the organization's employees change.
         """
+        cache_key = pagination_cache.generate_cache_key(
+            **query_params.model_dump(exclude={"sort_by", "sort_dir", "limit", "page"})
+        )
+        cached = facet_cache.get(organization_id, cache_key)
+        if cached is not None:
+            return cached
+
+        version = data_versions.get(organization_id)
+        rows = await self.employee_repo.facet_counts(
+            organization_id=organization_id, query_params=query_params
+        )
+        await release_connection(self.db)
+
+        facets: dict[str, list[FacetCount]] = {facet: [] for facet in FACETS}
+        for facet, value, label, count in sorted(rows, key=lambda row: (-row[3], str(row[2]))):
+            facets[facet].append(FacetCount(value=value, label=label, count=count))
+
+        response = EmployeeFacetsResponse(facets=facets)
+        facet_cache.set(organization_id, cache_key, response, version=version)
+        return response
+
+    async def list_changes(
+        self,
+        organization_id: int,
+        query_params: EmployeeChangesQueryParams,
+    ) -> EmployeeChangesResponse:
+        """
+        List the employees created, updated or deleted since a watermark, in (time, id)
+        order, with the watermark to continue from.
+
+        Changes of the last `changes_settle_seconds` are held back: timestamps are taken
+        when a change is written, so a transaction that waited for the database lock can
+        commit after a later timestamp was already synced.
+        """
+        display_columns = await self.org_repo.get_display_columns(organization_id=organization_id)
+        response = EmployeeChangesResponse(
+            display_columns=display_columns,
+            employees=[],
+            deleted_ids=[],
+            next_changed_since=query_params.changed_since,
+            next_after_id=query_params.after_id,
+            has_more=False,
+        )
+        if display_columns is None:
+            # Organization does not exist
+            return response
+
+        watermark = {
+            "organization_id": organization_id,
+            "changed_since": query_params.changed_since,
+            "after_id": query_params.after_id,
+            "until": self._naive(utcnow() - timedelta(seconds=settings.changes_settle_seconds)),
+            # One more than requested, to know if there are more
+            "limit": query_params.limit + 1,
+        }
+        rows = await self.employee_repo.list_changed(**watermark)
+        tombstones = await self.employee_repo.list_tombstones(**watermark)
+        await release_connection(self.db)
+
+        # Merge both streams in (time, id) order
+        changes = sorted(
+            [(self._naive(row[0].updated_at), row[0].id, row) for row in rows]
+            + [(deleted_at, employee_id, None) for deleted_at, employee_id in tombstones],
+            key=lambda change: change[:2],
+        )
+        response.has_more = len(changes) > query_params.limit
+        for changed_at, employee_id, row in changes[: query_params.limit]:
+            if row is None:
+                response.deleted_ids.append(employee_id)
+            else:
+                employee = self._filter_employee_columns_from_joined_data(
+                    row=row, display_columns=display_columns
+                )
+                employee["updated_at"] = changed_at
+                response.employees.append(employee)
+            response.next_changed_since, response.next_after_id = changed_at, employee_id
+        return response
+
+    async def stream_changes(self, organization_id: int) -> AsyncIterator[bytes] | None:
+        """
+        Stream the organization's employee changes as Server-Sent Events, with the values of
+        its display columns. Returns None if the organization does not exist.
+
+        The database connection is released before streaming, a subscriber only holds a
+        queue in this worker's change hub.
+        """
+        display_columns = await self.org_repo.get_display_columns(organization_id=organization_id)
+        if display_columns is None:
+            return None
+        related_names = None
+        if any(column in RELATED_COLUMNS for column in display_columns):
+            related_names = await self._related_names(organization_id)
+        await release_connection(self.db)
+        return change_hub.events(organization_id, tuple(display_columns), related_names)
+
+    async def _related_names(self, organization_id: int) -> dict[str, dict[int, str]]:
+        """
+        Names of the departments, locations and positions of the organization's employees,
+        cached until its employees change.
+        """
+        names = related_names_cache.get(organization_id, "")
+        if names is None:
+            # Before loading, so that a change committed meanwhile makes the names stale
+            version = data_versions.get(organization_id)
+            names = await self.employee_repo.list_related_names(organization_id)
+            related_names_cache.set(organization_id, "", names, version=version)
+        return names
+
+    @staticmethod
+    def changes_expired(changed_since: datetime) -> bool:
+        """Whether deletions since `changed_since` may have been pruned, so a sync must restart."""
+        horizon = utcnow() - timedelta(days=TOMBSTONE_RETENTION_DAYS)
+        return changed_since < EmployeeService._naive(horizon)
+
+    @staticmethod
+    def _naive(value: datetime) -> datetime:
+        """
+        UTC datetime without its timezone, as stored (employees loaded in the session before
+        still have the aware value they were written with).
+        """
+        if value.tzinfo is not None:
+            value = value.astimezone(UTC).replace(tzinfo=None)
+        return value
+
+    async def suggest(
+        self,
+        organization_id: int,
+        prefix: str,
+        limit: int,
+    ) -> EmployeeSuggestResponse:
+        """
+        Suggest employees whose name or email starts with `prefix`.
+
+        Served from the organization's in-memory prefix index, only its first build (or a
+        rebuild after a change the index could not apply) queries the database.
+        """
+        index = await suggest_indexes.get(
+            organization_id, lambda: self._build_suggest_index(organization_id)
+        )
+        return EmployeeSuggestResponse(
+            suggestions=index.search(normalize_search_text(prefix), limit=limit)
+        )
+
+    async def _build_suggest_index(self, organization_id: int) -> PrefixIndex:
+        """
+        Build an organization's prefix index on a session owned by the build, since it is
+        shared by every request waiting for it.
+        """
+        # Before loading employees, so that a change committed meanwhile makes the index stale
+        version = data_versions.get(organization_id)
+        async with AsyncSession(self.db.bind, expire_on_commit=False, autoflush=False) as db:
+            display_columns = await OrganizationRepository(db).get_display_columns(
+                organization_id=organization_id
+            )
+            # Only suggest what the organization displays in the employee list
+            fields = tuple(field for field in SUGGEST_FIELDS if field in (display_columns or ()))
+            employees = []
+            if fields:
+                employees = await EmployeeRepository(db).list_suggestion_fields(
+                    organization_id=organization_id, fields=fields
+                )
+
+        index = PrefixIndex(version=version, fields=fields)
+        index.build(employees)
+        return index
+
+    async def _list_employee_in_new_session(
+        self,
+        organization_id: int,
+        query_params: EmployeeListQueryParams,
+    ) -> EmployeeListResponse:
+        """
+        List employees on a session owned by the computation rather than by the calling
+        request, since coalesced callers must not depend on the leader request's lifetime.
+        """
+        async with AsyncSession(self.db.bind, expire_on_commit=False, autoflush=False) as db:
+            return await EmployeeService(db)._list_employee(organization_id, query_params)
+
+    async def _list_employee(
+        self,
+        organization_id: int,
+        query_params: EmployeeListQueryParams,
+    ) -> EmployeeListResponse:
+        """List employees on this service's session."""
         # Get configured columns for this organization
         display_columns = await self.org_repo.get_display_columns(organization_id=organization_id)
         if display_columns is None:
@@ -43,53 +328,333 @@ class EmployeeService:
         pagination_cache_key = pagination_cache.generate_cache_key(
             organization_id=organization_id,
             search=query_params.search,
+            search_mode=query_params.search_mode,
+            company_id=query_params.company_id,
             department_id=query_params.department_id,
             location_id=query_params.location_id,
             position_id=query_params.position_id,
             status=query_params.status,
+            sort_by=query_params.sort_by,
+            sort_dir=query_params.sort_dir,
             limit=query_params.limit,
         )
 
         endpoint = "list_employee"
         page = query_params.page
-        rows, total_count = await self.employee_repo.list_employee(
+        cursor = pagination_cache.get_cursor(
+            endpoint=endpoint,
+            cache_key=pagination_cache_key,
+            page=page,
             organization_id=organization_id,
-            query_params=query_params,
-            previous_id=pagination_cache.get_cursor(
-                endpoint=endpoint, cache_key=pagination_cache_key, page=page
-            ),
         )
-
-        if len(rows):
-            # Cache the current page cursor for effective page-based pagination by leveraging keyset pagination
-            pagination_cache.set_cursor(
+        before = None
+        if cursor is None:
+            # Coming back from the next page
+            before = pagination_cache.get_cursor(
                 endpoint=endpoint,
                 cache_key=pagination_cache_key,
                 page=page,
-                previous_id=rows[0][0].id - 1,  # first employee id in the current page - 1
+                organization_id=organization_id,
+                backward=True,
+            )
+        if settings.employee_read_engine == "columnar" or not self._sorted_by_id(query_params):
+            # The columnar engine reads every sort order. The in-memory indexes of the SQL
+            # engine list in id order, other sorts are keyset seeks on the sort key's index
+            rows, total_count = await self._list_repository().list_employee(
+                organization_id=organization_id,
+                query_params=query_params,
+                cursor=cursor,
+                before=before,
             )
+        elif self._refines_search(query_params):
+            rows, total_count = await self._list_searched_employee(
+                organization_id=organization_id,
+                query_params=query_params,
+                previous_id=cursor,
+                next_id=before,
+            )
+        else:
+            rows, total_count = await self._list_page(
+                organization_id=organization_id,
+                query_params=query_params,
+                previous_id=cursor,
+                next_id=before,
+            )
+        await release_connection(self.db)
+
+        if len(rows):
+            if query_params.sort_by == "id":
+                # Cache the current page cursor for effective page-based pagination by leveraging keyset pagination
+                first_id = rows[0][0].id
+                pagination_cache.set_cursor(
+                    endpoint=endpoint,
+                    cache_key=pagination_cache_key,
+                    page=page,
+                    # first employee id in the current page - 1 (+ 1 in descending order)
+                    cursor=first_id + 1 if query_params.sort_dir == "desc" else first_id - 1,
+                    organization_id=organization_id,
+                )
 
             # Cache the next page cursor for effective page-based pagination by leveraging keyset pagination
             pagination_cache.set_cursor(
                 endpoint=endpoint,
                 cache_key=pagination_cache_key,
                 page=page + 1,
-                previous_id=rows[-1][0].id,  # last employee id in the current page
+                cursor=self._cursor(rows[-1][0], query_params),  # last employee in the current page
+                organization_id=organization_id,
             )
 
-        employee_data = [
-            self._filter_employee_columns_from_joined_data(row=row, display_columns=display_columns)
-            for row in rows
-        ]
+            if page > 1:
+                # Cache the previous page cursor, sought backward from the current page
+                pagination_cache.set_cursor(
+                    endpoint=endpoint,
+                    cache_key=pagination_cache_key,
+                    page=page - 1,
+                    cursor=self._cursor(rows[0][0], query_params),  # first employee
+                    organization_id=organization_id,
+                    backward=True,
+                )
+
+        with timed_phase("project"):
+            employee_data = [
+                self._filter_employee_columns_from_joined_data(
+                    row=row, display_columns=display_columns
+                )
+                for row in rows
+            ]
         return EmployeeListResponse(
             display_columns=display_columns,
             employees=employee_data,
             total_returned=len(employee_data),
             total_records=total_count,
+            total_is_estimate=isinstance(total_count, EstimatedCount),
             total_pages=math.ceil(total_count / query_params.limit) if total_count > 0 else 0,
             page=page,
         )
 
+    def _list_repository(self) -> Any:
+        """Repository of the employee list's read engine."""
+        if settings.employee_read_engine == "columnar":
+            # numpy is an optional dependency, only needed by the columnar engine
+            from app.repositories.columnar_employee_repository import (
+                ColumnarEmployeeRepository,
+            )
+
+            return ColumnarEmployeeRepository(self.db)
+        return self.employee_repo
+
+    @staticmethod
+    def _sorted_by_id(query_params: EmployeeListQueryParams) -> bool:
+        """Whether the list is in ascending id order, the order of every read path."""
+        return query_params.sort_by == "id" and query_params.sort_dir == "asc"
+
+    @staticmethod
+    def _cursor(employee: Employee, query_params: EmployeeListQueryParams) -> Cursor:
+        """
+        Cursor of the page after `employee` (or backward cursor of the page before it): its
+        id, or its sort key and id.
+        """
+        if query_params.sort_by == "id":
+            return employee.id
+        return (getattr(employee, SORT_COLUMNS[query_params.sort_by].key), employee.id)
+
+    @staticmethod
+    def _refines_search(query_params: EmployeeListQueryParams) -> bool:
+        """
+        Whether the search is answered from the matches of recent terms. Prefix searches are
+        index range scans already.
+        """
+        return (
+            settings.search_refinement_cache_size > 0
+            and bool(query_params.search)
+            and query_params.search_mode == "contains"
+            and can_refine(query_params.search)
+        )
+
+    async def _list_searched_employee(
+        self,
+        organization_id: int,
+        query_params: EmployeeListQueryParams,
+        previous_id: int | None,
+        next_id: int | None = None,
+    ) -> tuple[list[Row], int]:
+        """
+        List employees matching a search term, filtering the matches of a recent term that it
+        extends ("john" after "jo") in memory when possible.
+
+        The matches give the total and the ids of the page, so only the page's employees are
+        read from the database. Terms without recent matches are searched with one scan that
+        returns their matches, or are counted and paged in the database as usual if there are
+        more than `search_refinement_max_ids`.
+        """
+        cache_key = pagination_cache.generate_cache_key(
+            **query_params.model_dump(exclude={"search", "limit", "page"})
+        )
+        # Before reading the cache, so that refined matches are never newer than their version
+        version = data_versions.get(organization_id)
+        recent = search_refinement_cache.get(organization_id, cache_key) or ()
+        matches = find_matches(recent, query_params.search)
+
+        if (
+            matches is None
+            and settings.result_set_cache_bytes > 0
+            and result_set_cache.get(organization_id, self._result_set_key(query_params))
+            is not None
+        ):
+            # Too many matches to refine, but all of them are already listed (or known to
+            # exceed the count cap)
+            return await self._list_page(
+                organization_id=organization_id,
+                query_params=query_params,
+                previous_id=previous_id,
+                next_id=next_id,
+            )
+
+        if matches is None:
+            max_ids = settings.search_refinement_max_ids
+            rows = await self.employee_repo.search_matches(
+                organization_id=organization_id, query_params=query_params, limit=max_ids + 1
+            )
+            if len(rows) > max_ids:
+                # The scan is wasted, the term is counted and paged as usual
+                allow_extra_queries(1)
+                return await self._list_page(
+                    organization_id=organization_id,
+                    query_params=query_params,
+                    previous_id=previous_id,
+                    next_id=next_id,
+                )
+            matches = SearchMatches.from_rows(query_params.search, rows)
+
+        search_refinement_cache.set(
+            organization_id,
+            cache_key,
+            remember(recent, matches, max_terms=SEARCH_REFINEMENT_TERMS),
+            version=version,
+        )
+        return await self._page_from_ids(matches.ids, query_params)
+
+    async def _list_page(
+        self,
+        organization_id: int,
+        query_params: EmployeeListQueryParams,
+        previous_id: int | None,
+        next_id: int | None = None,
+    ) -> tuple[list[Row], int]:
+        """
+        List a page with its total: from bitmap indexes for requests without a search term,
+        from the ids of all matches for other requests that would scan employees to count
+        them, or with a count and a page query otherwise, sought after `previous_id` (last
+        id of the previous page) or before `next_id` (first id of the next page).
+
+        Requests matching more than `settings.list_count_cap` employees are never listed from
+        their ids, whose number would be an exact count past the cap.
+        """
+        if settings.bitmap_index_max_organizations > 0 and not query_params.search:
+            return await self._list_from_bitmaps(
+                organization_id=organization_id, query_params=query_params
+            )
+        if settings.result_set_cache_bytes > 0 and not self.employee_repo.can_count_from_summary(
+            query_params=query_params
+        ):
+            ids = await self._result_set_ids(
+                organization_id=organization_id, query_params=query_params
+            )
+            if not 0 < settings.list_count_cap < len(ids):
+                return await self._page_from_ids(ids, query_params)
+        return await self.employee_repo.list_employee(
+            organization_id=organization_id,
+            query_params=query_params,
+            cursor=previous_id,
+            before=next_id,
+        )
+
+    async def _list_from_bitmaps(
+        self,
+        organization_id: int,
+        query_params: EmployeeListQueryParams,
+    ) -> tuple[list[Row], int]:
+        """
+        List a page by combining the bitmaps of the filtered values. The total is a popcount
+        and the page's ids come from rank/select, so only the page's employees are read.
+        """
+        index = await bitmap_indexes.get(
+            organization_id, lambda: self._build_bitmap_index(organization_id)
+        )
+        with timed_phase("count"):
+            matches = index.match({field: getattr(query_params, field) for field in BITMAP_FIELDS})
+            page_ids = index.page(
+                matches,
+                limit=query_params.limit,
+                offset=(query_params.page - 1) * query_params.limit,
+            )
+        rows = await self.employee_repo.list_by_ids(page_ids) if page_ids else []
+        return rows, matches.bit_count()
+
+    async def _build_bitmap_index(self, organization_id: int) -> BitmapIndex:
+        """
+        Build an organization's bitmap indexes on a session owned by the build, since it is
+        shared by every request waiting for it.
+        """
+        # Before loading employees, so that a change committed meanwhile makes the index stale
+        version = data_versions.get(organization_id)
+        async with AsyncSession(self.db.bind, expire_on_commit=False, autoflush=False) as db:
+            employees = await EmployeeRepository(db).list_filter_fields(
+                organization_id=organization_id, fields=BITMAP_FIELDS
+            )
+
+        index = BitmapIndex(version=version)
+        index.build(employees)
+        return index
+
+    async def _result_set_ids(
+        self,
+        organization_id: int,
+        query_params: EmployeeListQueryParams,
+    ) -> array:
+        """
+        Get the ordered ids of all matching employees, to list pages by slicing them.
+
+        The ids are read once, cached until the organization's employees change, and give
+        the total of every page. Each page then costs one primary key lookup of its
+        employees, with no count and no `OFFSET` scan.
+
+        At most `settings.list_count_cap` + 1 ids are read: more ids than the cap tell that
+        the request must be counted and paged in the database instead.
+        """
+        cache_key = self._result_set_key(query_params)
+        ids = result_set_cache.get(organization_id, cache_key)
+        if ids is None:
+            version = data_versions.get(organization_id)
+            cap = settings.list_count_cap
+            ids = await self.employee_repo.list_ids(
+                organization_id=organization_id,
+                query_params=query_params,
+                limit=cap + 1 if cap > 0 else None,
+            )
+            if 0 < cap < len(ids):
+                # Counted and paged as usual on top of this query, until the ids are evicted
+                allow_extra_queries(1)
+            result_set_cache.set(organization_id, cache_key, ids, version=version)
+        return ids
+
+    async def _page_from_ids(
+        self, ids: array, query_params: EmployeeListQueryParams
+    ) -> tuple[list[Row], int]:
+        """Read the employees of the requested page of `ids`, with the total."""
+        start = (query_params.page - 1) * query_params.limit
+        page_ids = ids[start : start + query_params.limit]
+        rows = await self.employee_repo.list_by_ids(page_ids.tolist()) if page_ids else []
+        return rows, len(ids)
+
+    @staticmethod
+    def _result_set_key(query_params: EmployeeListQueryParams) -> str:
+        # Ids read under a lower cap may be incomplete
+        return pagination_cache.generate_cache_key(
+            **query_params.model_dump(exclude={"limit", "page"}),
+            count_cap=settings.list_count_cap,
+        )
+
     @staticmethod
     def _filter_employee_columns_from_joined_data(
         row: Row,
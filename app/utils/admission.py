@@ -0,0 +1,199 @@
+"""
+Adaptive admission control for database-bound requests.
+
+Requests past the concurrency limit wait in a short FIFO queue, and are shed as soon as the
+queue is full or they waited too long, instead of piling up on the connection pool until
+every request times out.
+"""
+
+import asyncio
+import math
+from collections import deque
+from contextlib import suppress
+
+from app.config import settings
+from app.utils.metrics import admission_requests_total, registry
+
+# Requests (per route) over which the recent and the long-term average latencies are taken
+SHORT_LATENCY_WINDOW = 20
+LONG_LATENCY_WINDOW = 500
+# Factor applied to the limit when requests get slower than the latency tolerance allows
+LIMIT_BACKOFF = 0.9
+
+
+class _LatencyBaseline:
+    """
+    Exponential moving averages of the latency of one route, recent and long-term. Until a
+    window is full, its average is the plain average of the latencies observed so far.
+    """
+
+    __slots__ = ("recent", "long_term", "samples")
+
+    def __init__(self):
+        self.recent = 0.0
+        self.long_term = 0.0
+        self.samples = 0
+
+    def observe(self, latency: float, loaded: bool) -> None:
+        """
+        Add a latency to the averages. Once its window is full, latencies measured under
+        load are kept out of the long-term average, which would otherwise rise until it
+        accepts any overload.
+        """
+        self.samples += 1
+        self.recent += (latency - self.recent) * self._weight(SHORT_LATENCY_WINDOW)
+        if not loaded or self.samples <= LONG_LATENCY_WINDOW:
+            self.long_term += (latency - self.long_term) * self._weight(LONG_LATENCY_WINDOW)
+
+    def overloaded(self, tolerance: float) -> bool:
+        """Whether the recent average is over `tolerance` times the long-term one."""
+        return self.samples > SHORT_LATENCY_WINDOW and self.recent > self.long_term * tolerance
+
+    def _weight(self, window: int) -> float:
+        return max(1 / self.samples, 2 / (window + 1))
+
+
+class Overloaded(Exception):
+    """Raised when a request is shed instead of admitted."""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionLimiter:
+    """
+    Concurrency limiter adapting its limit to latency (AIMD), between 1 and `max_limit`:
+
+    - While the recent average latency of a route is over `latency_tolerance` times its
+      long-term average, requests queue somewhere below (the connection pool, SQLite's
+      locks): each completed request multiplies the limit by `LIMIT_BACKOFF`.
+    - Otherwise, while at least half the limit is in use, the limit grows by one for every
+      `limit` completed requests.
+
+    Each route is compared with its own history, so routes that are fast and slow by nature,
+    or requests of varying cost, never look like overload as long as their mix is steady.
+    The long-term averages only learn from requests completed while at most half the limit
+    was in use, i.e. with no contention to measure.
+    Latencies are measured from admission to release, without the time spent in the queue.
+    A `max_limit` of 0 disables the limiter.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_limit: int,
+        queue_size: int,
+        max_wait_seconds: float,
+        latency_tolerance: float = 2.0,
+    ):
+        self.name = name
+        self.max_limit = max_limit
+        self.queue_size = queue_size
+        self.max_wait_seconds = max_wait_seconds
+        self.latency_tolerance = latency_tolerance
+        self.limit = float(max_limit)
+        self.in_flight = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self._baselines: dict[str, _LatencyBaseline] = {}
+        self._releases_at_floor = 0
+
+    def queue_depth(self) -> int:
+        """Number of requests waiting for admission."""
+        return sum(not waiter.done() for waiter in self._waiters)
+
+    async def acquire(self) -> None:
+        """
+        Wait for admission, at most `max_wait_seconds`.
+
+        Raises:
+            Overloaded: If the queue is full or the wait timed out
+        """
+        if self.max_limit <= 0:
+            return
+        if self.in_flight < self.limit and not self.queue_depth():
+            self.in_flight += 1
+            admission_requests_total.inc(limiter=self.name, decision="admitted")
+            return
+        if self.queue_depth() >= self.queue_size:
+            self._shed("queue_full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self.max_wait_seconds)
+        except (TimeoutError, asyncio.CancelledError) as err:
+            if waiter.done() and not waiter.cancelled():
+                # Handed a slot just as the wait ended, pass it on
+                self._release_slot()
+            with suppress(ValueError):
+                self._waiters.remove(waiter)
+            if isinstance(err, TimeoutError):
+                self._shed("timeout")
+            raise
+        admission_requests_total.inc(limiter=self.name, decision="queued")
+
+    def release(self, latency: float, route: str = "") -> None:
+        """Release the slot of an admitted request to `route` that took `latency` seconds."""
+        if self.max_limit <= 0:
+            return
+        self._adapt_limit(latency, route)
+        self._release_slot()
+
+    def _release_slot(self) -> None:
+        self.in_flight -= 1
+        # Free slots go to the longest waiting requests, including the slots a raised limit
+        # just added
+        while self._waiters and self.in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def _adapt_limit(self, latency: float, route: str) -> None:
+        baseline = self._baselines.setdefault(route, _LatencyBaseline())
+        busy = self.in_flight * 2 >= self.limit
+        self._releases_at_floor = self._releases_at_floor + 1 if self.limit == 1 else 0
+        # Still slow after a window of requests run one at a time, the route got slower by
+        # itself (e.g. its data grew)
+        baseline.observe(
+            latency,
+            loaded=(busy or baseline.overloaded(self.latency_tolerance))
+            and self._releases_at_floor < SHORT_LATENCY_WINDOW,
+        )
+        if baseline.overloaded(self.latency_tolerance):
+            self.limit = max(self.limit * LIMIT_BACKOFF, 1.0)
+        elif busy:
+            # One more slot for every `limit` requests completed
+            self.limit = min(self.limit + 1 / self.limit, self.max_limit)
+
+    def _shed(self, reason: str) -> None:
+        admission_requests_total.inc(limiter=self.name, decision=f"shed_{reason}")
+        raise Overloaded(reason, retry_after=max(math.ceil(self.max_wait_seconds), 1))
+
+
+# Requests of endpoints reading employees from the database
+db_reads = AdmissionLimiter(
+    "db_reads",
+    max_limit=settings.admission_max_in_flight,
+    queue_size=settings.admission_queue_size,
+    max_wait_seconds=settings.admission_max_wait_seconds,
+    latency_tolerance=settings.admission_latency_tolerance,
+)
+
+registry.gauge(
+    "admission_queue_depth",
+    "Requests waiting for admission",
+    ("limiter",),
+    callback=lambda: {(db_reads.name,): db_reads.queue_depth()},
+)
+registry.gauge(
+    "admission_in_flight",
+    "Admitted requests in flight, and the current concurrency limit",
+    ("limiter", "state"),
+    callback=lambda: {
+        (db_reads.name, "in_flight"): db_reads.in_flight,
+        (db_reads.name, "limit"): db_reads.limit,
+    },
+)
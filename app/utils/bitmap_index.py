@@ -0,0 +1,181 @@
+"""
+Bitmap indexes of employee filter fields.
+
+Each employee of an organization gets a dense row ordinal, in employee id order, and each
+value of a filter field (a status, a department id, ...) a bitset of the ordinals having
+it, stored as a Python int. Filters OR the bitsets of their values and AND the fields, the
+total is a popcount, and a page is found by rank/select on the result, without reading any
+employee row.
+"""
+
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Any
+
+# Multi-valued filter fields of EmployeeListQueryParams, ANDed across fields, ORed within
+BITMAP_FIELDS = ("company_id", "department_id", "location_id", "position_id", "status")
+
+
+class BitmapIndex:
+    """
+    Bitmap indexes of one organization's employees.
+
+    Ordinals follow employee ids, so the ordinals of a bitset are in list order. Removed
+    employees leave a hole (cleared in the `live` bitset); an employee inserted with an id
+    lower than the highest indexed id shifts the ordinals after it.
+    """
+
+    def __init__(self, version: int):
+        # Data version of the organization the index is up to date with
+        self.version = version
+        # ordinal -> employee id, ascending
+        self._ids = array("q")
+        # Ordinals of indexed employees, excluding holes
+        self._live = 0
+        # field -> value -> bitset of ordinals
+        self._bitmaps: dict[str, dict[Any, int]] = {field: {} for field in BITMAP_FIELDS}
+        # field -> ordinal -> value, to clear the previous bit when an employee changes
+        self._values: dict[str, list[Any]] = {field: [] for field in BITMAP_FIELDS}
+
+    def build(self, employees: list[dict[str, Any]]) -> None:
+        """Index `employees` (dicts with an "id" and the bitmap fields), ordered by id."""
+        self._ids = array("q", (employee["id"] for employee in employees))
+        self._live = (1 << len(employees)) - 1
+        for field in BITMAP_FIELDS:
+            self._values[field] = [employee[field] for employee in employees]
+            ordinals_by_value: dict[Any, list[int]] = defaultdict(list)
+            for ordinal, value in enumerate(self._values[field]):
+                ordinals_by_value[value].append(ordinal)
+            self._bitmaps[field] = {
+                value: _bitset(ordinals, len(employees))
+                for value, ordinals in ordinals_by_value.items()
+            }
+
+    def upsert(self, employee: dict[str, Any]) -> None:
+        """Add an employee or move it to the bitsets of its new values."""
+        ordinal = self._ordinal(employee["id"])
+        if ordinal is None:
+            ordinal = bisect_left(self._ids, employee["id"])
+            if ordinal < len(self._ids):
+                self._shift(ordinal)
+            else:
+                for values in self._values.values():
+                    values.append(None)
+            self._ids.insert(ordinal, employee["id"])
+        elif self._live >> ordinal & 1:
+            self._clear(ordinal)
+
+        bit = 1 << ordinal
+        self._live |= bit
+        for field in BITMAP_FIELDS:
+            value = employee[field]
+            self._values[field][ordinal] = value
+            bitmaps = self._bitmaps[field]
+            bitmaps[value] = bitmaps.get(value, 0) | bit
+
+    def remove(self, employee_id: int) -> None:
+        """Remove an employee, if indexed, leaving a hole at its ordinal."""
+        ordinal = self._ordinal(employee_id)
+        if ordinal is not None and self._live >> ordinal & 1:
+            self._clear(ordinal)
+            self._live &= ~(1 << ordinal)
+
+    def match(self, filters: dict[str, list[Any]]) -> int:
+        """
+        Bitset of the employees matching `filters`, field -> accepted values (empty or
+        missing fields don't filter).
+        """
+        result = self._live
+        for field, values in filters.items():
+            if not values:
+                continue
+            bitmaps = self._bitmaps[field]
+            accepted = 0
+            for value in set(values):
+                accepted |= bitmaps.get(value, 0)
+            result &= accepted
+        return result
+
+    def page(self, matches: int, limit: int, offset: int = 0) -> list[int]:
+        """
+        Employee ids of a page of `matches`, in id order.
+
+        Args:
+            matches: Bitset from `match`
+            limit: Page size
+            offset: Number of matches to skip
+        """
+        start = _select(matches, offset)
+        if start is None:
+            return []
+
+        ids = []
+        remaining = matches >> start
+        ordinal = start
+        while remaining and len(ids) < limit:
+            # Skip to the lowest set bit
+            gap = (remaining & -remaining).bit_length() - 1
+            ordinal += gap
+            remaining >>= gap
+            ids.append(self._ids[ordinal])
+            remaining >>= 1
+            ordinal += 1
+        return ids
+
+    def __len__(self) -> int:
+        return self._live.bit_count()
+
+    def _ordinal(self, employee_id: int) -> int | None:
+        ordinal = bisect_left(self._ids, employee_id)
+        if ordinal < len(self._ids) and self._ids[ordinal] == employee_id:
+            return ordinal
+        return None
+
+    def _clear(self, ordinal: int) -> None:
+        """Clear the bits of the employee at `ordinal` in the bitsets of its values."""
+        mask = ~(1 << ordinal)
+        for field in BITMAP_FIELDS:
+            value = self._values[field][ordinal]
+            bitmaps = self._bitmaps[field]
+            bitmaps[value] &= mask
+            if not bitmaps[value]:
+                del bitmaps[value]
+
+    def _shift(self, ordinal: int) -> None:
+        """Make room for a new ordinal by moving the bits at and after `ordinal` up by one."""
+        self._live = _insert_bit(self._live, ordinal)
+        for field in BITMAP_FIELDS:
+            self._values[field].insert(ordinal, None)
+            bitmaps = self._bitmaps[field]
+            for value, bitset in bitmaps.items():
+                bitmaps[value] = _insert_bit(bitset, ordinal)
+
+
+def _bitset(ordinals: list[int], length: int) -> int:
+    """Bitset with the given bits set, built through a byte buffer rather than bit by bit."""
+    buffer = bytearray((length + 7) // 8)
+    for ordinal in ordinals:
+        buffer[ordinal >> 3] |= 1 << (ordinal & 7)
+    return int.from_bytes(buffer, "little")
+
+
+def _insert_bit(bitset: int, position: int) -> int:
+    """Insert a zero bit at `position`, moving the higher bits up."""
+    low = bitset & ((1 << position) - 1)
+    return (bitset >> position << (position + 1)) | low
+
+
+def _select(bitset: int, rank: int) -> int | None:
+    """Position of the set bit with `rank` set bits below it, or None if there are fewer."""
+    if bitset.bit_count() <= rank:
+        return None
+    # Lowest position with more than `rank` set bits at or below it
+    low, high = 0, bitset.bit_length() - 1
+    while low < high:
+        middle = (low + high) // 2
+        if (bitset & ((2 << middle) - 1)).bit_count() > rank:
+            high = middle
+        else:
+            low = middle + 1
+    return low
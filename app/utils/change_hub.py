@@ -0,0 +1,211 @@
+"""
+In-process fan-out of employee changes to Server-Sent Events subscribers.
+
+Each worker has one hub. It receives the employee changes committed by this process, and the
+organizations that the change log follower saw changed by other processes, and pushes them
+to the subscribers of each organization. Subscribers are grouped by the display columns of
+their organization: each change is encoded once per group, and the same bytes are queued
+for every subscriber of the group. An idle subscriber is a parked queue `get`, one heartbeat
+task pings all of them.
+"""
+
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from typing import Any
+
+from app.utils.employee_changes import EmployeeChange
+
+# Display columns read from the employee row
+EMPLOYEE_COLUMNS = ("avatar", "first_name", "last_name", "email", "phone", "status")
+# Display columns showing the name of a related row: column -> foreign key
+RELATED_COLUMNS = {
+    "department": "department_id",
+    "location": "location_id",
+    "position": "position_id",
+}
+
+HEARTBEAT = b": heartbeat\n\n"
+
+
+def encode_event(event: str, data: dict[str, Any]) -> bytes:
+    """Encode a Server-Sent Event with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n".encode()
+
+
+# Sent when a subscriber may have missed changes it can't be told about, it must reload
+INVALIDATE = encode_event("invalidate", {})
+
+
+class Subscription:
+    """Queue of encoded events of one subscriber."""
+
+    __slots__ = ("organization_id", "columns", "queue")
+
+    def __init__(self, organization_id: int, columns: tuple[str, ...], queue_size: int):
+        self.organization_id = organization_id
+        self.columns = columns
+        self.queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize=queue_size)
+
+    def push(self, frame: bytes) -> None:
+        try:
+            self.queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            # A slow client: drop what it hasn't read, it reloads instead
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(INVALIDATE)
+
+
+class ChangeHub:
+    """
+    Fans out employee changes to the subscribers of their organizations.
+
+    `publish` and `invalidate` may be called from any thread, events are dispatched on the
+    event loop of the subscribers.
+    """
+
+    def __init__(self, queue_size: int, heartbeat_seconds: float):
+        self.queue_size = queue_size
+        self.heartbeat_seconds = heartbeat_seconds
+        # organization_id -> display columns -> subscriptions
+        self._groups: dict[int, dict[tuple[str, ...], set[Subscription]]] = {}
+        # organization_id -> names of the related rows of its employees,
+        # "department"/"location"/"position" -> id -> name
+        self._related_names: dict[int, dict[str, dict[int, str]]] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._heartbeat: asyncio.Task | None = None
+
+    def size(self) -> int:
+        return sum(
+            len(subscriptions)
+            for groups in list(self._groups.values())
+            for subscriptions in list(groups.values())
+        )
+
+    async def events(
+        self,
+        organization_id: int,
+        columns: tuple[str, ...],
+        related_names: dict[str, dict[int, str]] | None = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        Subscribe to an organization's changes for as long as the iterator is consumed.
+
+        Yields encoded events, starting with a retry delay for reconnecting clients.
+
+        Args:
+            organization_id: Organization whose changes are streamed
+            columns: Display columns of the organization
+            related_names: Names of the related rows of the organization's employees, needed
+                by related `columns`. They replace the names loaded by earlier subscribers
+                of the organization.
+        """
+        subscription = self._subscribe(organization_id, columns, related_names)
+        try:
+            yield b"retry: 3000\n\n"
+            while True:
+                yield await subscription.queue.get()
+        finally:
+            self._unsubscribe(subscription)
+
+    def publish(self, changes: list[EmployeeChange]) -> None:
+        """Push committed employee changes (subscribed to `employee_changes`)."""
+        if self._groups:
+            self._call_soon(self._dispatch, changes)
+
+    def invalidate(self, organization_ids: set[int] | None) -> None:
+        """Tell the subscribers of organizations changed elsewhere (None for all) to reload."""
+        if self._groups:
+            self._call_soon(self._dispatch_invalidate, organization_ids)
+
+    def _call_soon(self, callback, *args) -> None:
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            callback(*args)
+        else:
+            loop.call_soon_threadsafe(callback, *args)
+
+    def _subscribe(
+        self,
+        organization_id: int,
+        columns: tuple[str, ...],
+        related_names: dict[str, dict[int, str]] | None,
+    ) -> Subscription:
+        self._loop = asyncio.get_running_loop()
+        if related_names is not None:
+            self._related_names[organization_id] = related_names
+        subscription = Subscription(organization_id, columns, self.queue_size)
+        groups = self._groups.setdefault(organization_id, {})
+        groups.setdefault(columns, set()).add(subscription)
+        if self._heartbeat is None or self._heartbeat.done():
+            self._heartbeat = asyncio.create_task(self._send_heartbeats())
+        return subscription
+
+    def _unsubscribe(self, subscription: Subscription) -> None:
+        groups = self._groups.get(subscription.organization_id, {})
+        subscriptions = groups.get(subscription.columns, set())
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            groups.pop(subscription.columns, None)
+        if not groups:
+            self._groups.pop(subscription.organization_id, None)
+            self._related_names.pop(subscription.organization_id, None)
+
+    def _dispatch(self, changes: list[EmployeeChange]) -> None:
+        for organization_id in {id_ for change in changes for id_ in change.organization_ids}:
+            for columns, subscriptions in list(self._groups.get(organization_id, {}).items()):
+                frame = b"".join(
+                    self._encode(change, organization_id, columns)
+                    for change in changes
+                    if organization_id in change.organization_ids
+                )
+                for subscription in list(subscriptions):
+                    subscription.push(frame)
+
+    def _dispatch_invalidate(self, organization_ids: set[int] | None) -> None:
+        for organization_id, groups in list(self._groups.items()):
+            if organization_ids is None or organization_id in organization_ids:
+                for subscriptions in list(groups.values()):
+                    for subscription in list(subscriptions):
+                        subscription.push(INVALIDATE)
+
+    def _encode(
+        self, change: EmployeeChange, organization_id: int, columns: tuple[str, ...]
+    ) -> bytes:
+        """
+        Encode a change for subscribers of an organization showing `columns`: the employee's
+        displayed values, a deletion, or only its id if a related name is unknown.
+        """
+        values = change.values
+        if values is None or values["organization_id"] != organization_id:
+            return encode_event("delete", {"id": change.employee_id})
+
+        row = {"id": change.employee_id}
+        related_names = self._related_names.get(organization_id, {})
+        for column in columns:
+            if column in EMPLOYEE_COLUMNS:
+                row[column] = values[column]
+            elif column in RELATED_COLUMNS:
+                related_id = values[RELATED_COLUMNS[column]]
+                name = related_names.get(column, {}).get(related_id)
+                if related_id is not None and name is None:
+                    # Created after the names were loaded, the client reloads the employee
+                    return encode_event("change", {"id": change.employee_id})
+                row[column] = name
+        return encode_event("upsert", row)
+
+    async def _send_heartbeats(self) -> None:
+        """Keep connections open through proxies while there are subscribers."""
+        while self._groups:
+            await asyncio.sleep(self.heartbeat_seconds)
+            for groups in list(self._groups.values()):
+                for subscriptions in list(groups.values()):
+                    for subscription in list(subscriptions):
+                        subscription.push(HEARTBEAT)
@@ -0,0 +1,196 @@
+"""
+Follows the `employee_changes` log written by database triggers.
+
+Changes committed through this process's ORM sessions are published by `employee_changes`
+and bump data versions right away. Every other change (other workers, scripts, bulk
+statements) is only seen in the log, which each process polls to invalidate the cached data
+of the organizations it names. A transaction of this process reads the log rows it wrote
+before committing, so its own changes are not invalidated a second time by the next poll.
+"""
+
+import asyncio
+import logging
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.employee import Employee
+from app.models.employee_change import EmployeeChangeLog
+from app.utils.data_versions import data_versions
+from app.utils.metrics import change_log_changes_total
+
+logger = logging.getLogger(__name__)
+
+_PENDING_LOG = "pending_change_log"
+
+POLL_BATCH_SIZE = 10_000
+
+
+class ChangeLogFollower:
+    """
+    Reads the change log past the last seq it has seen and bumps the data version of the
+    organizations changed since. If the log was pruned past that seq, the changes in between
+    are unknown and every organization is invalidated.
+    """
+
+    def __init__(self):
+        # Highest seq whose change this process has seen, None while not following
+        self.last_seq: int | None = None
+        self._lock = threading.Lock()
+        self._subscribers: list[Callable[[set[int] | None], None]] = []
+
+    def subscribe(self, callback: Callable[[set[int] | None], None]) -> None:
+        """
+        Call `callback` with the organizations changed by other processes, or None if any
+        may have changed, after their versions are bumped.
+        """
+        self._subscribers.append(callback)
+
+    @property
+    def following(self) -> bool:
+        return self.last_seq is not None
+
+    async def start(self, db: AsyncSession) -> None:
+        """Follow the log from its current end, earlier changes are already in the database."""
+        self.last_seq = await db.scalar(select(func.max(EmployeeChangeLog.seq))) or 0
+
+    def stop(self) -> None:
+        self.last_seq = None
+
+    async def poll(self, db: AsyncSession, batch_size: int = POLL_BATCH_SIZE) -> int:
+        """
+        Invalidate the organizations changed since the last poll.
+
+        Returns:
+            Number of log rows read, `batch_size` if more may be waiting
+        """
+        since = self.last_seq
+        if since is None:
+            return 0
+        result = await db.execute(
+            select(EmployeeChangeLog.seq, EmployeeChangeLog.organization_id)
+            .filter(EmployeeChangeLog.seq > since)
+            .order_by(EmployeeChangeLog.seq.asc())
+            .limit(batch_size)
+        )
+        rows = result.all()
+        if rows:
+            self.invalidate(since, rows[0].seq, {row.organization_id for row in rows})
+            self.advance(rows[-1].seq)
+            change_log_changes_total.inc(len(rows), source="other")
+        return len(rows)
+
+    async def run(self, session_factory: Callable[[], AsyncSession], interval: float) -> None:
+        """Follow the log until cancelled, polling every `interval` seconds."""
+        async with session_factory() as db:
+            await self.start(db)
+        try:
+            while True:
+                await asyncio.sleep(interval)
+                try:
+                    async with session_factory() as db:
+                        while await self.poll(db) == POLL_BATCH_SIZE:
+                            pass
+                except Exception:
+                    logger.exception("Failed to poll the employee change log")
+        finally:
+            self.stop()
+
+    def invalidate(self, since: int, first_seq: int, organization_ids: set[int]) -> None:
+        """Bump the versions of organizations changed after `since`, or all if some were pruned."""
+        if first_seq > since + 1:
+            data_versions.bump_all()
+            changed = None
+        else:
+            for organization_id in organization_ids:
+                data_versions.bump(organization_id)
+            changed = organization_ids
+        if changed is None or changed:
+            for callback in self._subscribers:
+                callback(changed)
+
+    def advance(self, seq: int) -> None:
+        with self._lock:
+            if self.last_seq is not None and seq > self.last_seq:
+                self.last_seq = seq
+
+
+# Global follower, started with the application when polling is enabled
+change_log_follower = ChangeLogFollower()
+
+
+@dataclass
+class _OwnTransactionLog:
+    """Log rows read by a transaction of this process before it commits."""
+
+    since: int
+    first_seq: int
+    last_seq: int
+    # Organizations changed by other processes before the transaction
+    other_organization_ids: set[int] = field(default_factory=set)
+    own_changes: int = 0
+    other_changes: int = 0
+
+
+@event.listens_for(Session, "after_flush")
+def _read_own_log_rows(session: Session, flush_context) -> None:
+    """
+    Read the log rows written since the last seen seq, in the flushing transaction.
+
+    SQLite has a single writer, so no other transaction can commit between this flush and
+    the commit: rows of the employees changed by this transaction are its own, the others
+    were committed by other processes before it and are invalidated with it.
+    """
+    log: _OwnTransactionLog | None = session.info.get(_PENDING_LOG)
+    since = log.last_seq if log else change_log_follower.last_seq
+    if since is None:
+        return
+    employee_ids = {
+        instance.id
+        for instance in (*session.new, *session.dirty, *session.deleted)
+        if isinstance(instance, Employee)
+    }
+    if not employee_ids:
+        return
+
+    result = session.connection().execute(
+        select(
+            EmployeeChangeLog.seq, EmployeeChangeLog.organization_id, EmployeeChangeLog.employee_id
+        )
+        .filter(EmployeeChangeLog.seq > since)
+        .order_by(EmployeeChangeLog.seq.asc())
+    )
+    rows = result.all()
+    if not rows:
+        return
+    if log is None:
+        log = session.info[_PENDING_LOG] = _OwnTransactionLog(
+            since=since, first_seq=rows[0].seq, last_seq=since
+        )
+    for row in rows:
+        if row.employee_id in employee_ids:
+            log.own_changes += 1
+        else:
+            log.other_changes += 1
+            log.other_organization_ids.add(row.organization_id)
+    log.last_seq = rows[-1].seq
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_own_log_rows(session: Session) -> None:
+    log: _OwnTransactionLog | None = session.info.pop(_PENDING_LOG, None)
+    if log is None or not change_log_follower.following:
+        return
+    change_log_follower.invalidate(log.since, log.first_seq, log.other_organization_ids)
+    change_log_follower.advance(log.last_seq)
+    change_log_changes_total.inc(log.own_changes, source="own")
+    change_log_changes_total.inc(log.other_changes, source="other")
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_own_log_rows(session: Session, previous_transaction) -> None:
+    session.info.pop(_PENDING_LOG, None)
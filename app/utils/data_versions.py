@@ -0,0 +1,53 @@
+"""
+Per-organization data versions for invalidating cached employee query results.
+"""
+
+import threading
+
+from app.utils.employee_changes import EmployeeChange, subscribe
+
+
+class DataVersions:
+    """
+    Version counter per organization, bumped whenever its employees change.
+
+    Cached results computed at version N are stale once the version moves past N.
+    Versions are bumped once per committed transaction that changed employees through an
+    ORM session of this process, and by the `change_log` follower for changes committed
+    by other processes or by bulk statements that bypass the ORM unit of work.
+    """
+
+    def __init__(self):
+        self._versions: dict[int, int] = {}
+        # Added to every organization's version, bumped to invalidate all of them at once
+        self._epoch = 0
+        self._lock = threading.Lock()
+
+    def get(self, organization_id: int) -> int:
+        """Current data version of an organization."""
+        return self._epoch + self._versions.get(organization_id, 0)
+
+    def bump(self, organization_id: int) -> int:
+        """Invalidate everything cached for an organization, returns its new version."""
+        with self._lock:
+            version = self._versions.get(organization_id, 0) + 1
+            self._versions[organization_id] = version
+        return self._epoch + version
+
+    def bump_all(self) -> None:
+        """Invalidate everything cached for every organization."""
+        with self._lock:
+            self._epoch += 1
+
+
+# Global data versions instance
+data_versions = DataVersions()
+
+
+def _bump_changed_organizations(changes: list[EmployeeChange]) -> None:
+    for organization_id in {id_ for change in changes for id_ in change.organization_ids}:
+        data_versions.bump(organization_id)
+
+
+# First subscriber, so that later subscribers see the bumped versions
+subscribe(_bump_changed_organizations)
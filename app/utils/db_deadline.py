@@ -0,0 +1,147 @@
+"""
+Per-request database deadlines.
+
+Each request gets a deadline, and the SQLite connections it runs statements on check it
+from a progress handler: a statement still running past the deadline, or after the deadline
+was cancelled (e.g. the client disconnected), is interrupted by SQLite and fails with an
+"interrupted" `OperationalError`, so its connection goes back to the pool right away.
+"""
+
+from contextvars import ContextVar
+from math import inf
+from time import monotonic
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.config import settings
+
+# SQLite virtual machine instructions between two deadline checks (about a millisecond), each
+# check takes the GIL
+PROGRESS_HANDLER_INSTRUCTIONS = 100_000
+
+# Key of the deadline of the connection's current statement in its pool record's info
+_DEADLINE_KEY = "db_deadline"
+
+
+class DbDeadline:
+    """Time (monotonic) by which a request's statements must finish, unless cancelled first."""
+
+    __slots__ = ("expires_at", "cancelled")
+
+    def __init__(self, expires_at: float = inf):
+        self.expires_at = expires_at
+        self.cancelled = False
+
+    @classmethod
+    def after(cls, seconds: float) -> "DbDeadline":
+        """Deadline in `seconds` from now, or none if `seconds` is 0."""
+        return cls(monotonic() + seconds if seconds > 0 else inf)
+
+    def cancel(self) -> None:
+        """Interrupt the statements running under this deadline."""
+        self.cancelled = True
+
+    def interrupted(self) -> bool:
+        return self.cancelled or monotonic() >= self.expires_at
+
+
+_current_deadline: ContextVar[DbDeadline | None] = ContextVar("db_deadline", default=None)
+
+
+def start_db_deadline(seconds: float) -> tuple[DbDeadline, object]:
+    """
+    Give the statements of the current request a deadline in `seconds` (0 = none).
+
+    Returns:
+        Tuple of (deadline, token to pass to `stop_db_deadline`)
+    """
+    deadline = DbDeadline.after(seconds)
+    return deadline, _current_deadline.set(deadline)
+
+
+def stop_db_deadline(token) -> None:
+    """Stop applying the deadline started by `start_db_deadline`."""
+    _current_deadline.reset(token)
+
+
+def get_db_deadline() -> DbDeadline | None:
+    """Get the deadline of the current request's statements, if any."""
+    return _current_deadline.get()
+
+
+def use_db_deadline(deadline: DbDeadline) -> None:
+    """Apply `deadline` to the statements of the current task, e.g. a shared computation."""
+    _current_deadline.set(deadline)
+
+
+class SharedDbDeadline(DbDeadline):
+    """
+    Deadline of a computation shared by several requests (see `SingleFlight`): it expires
+    with the deadline of the request that started it, and is cancelled once every request
+    waiting for it is, so one client disconnecting never fails the others.
+    """
+
+    __slots__ = ("requests",)
+
+    def __init__(self, expires_at: float = inf):
+        super().__init__(expires_at)
+        self.requests: list[DbDeadline] = []
+
+    def join(self, deadline: DbDeadline | None) -> DbDeadline:
+        """Add the deadline of a request waiting for the computation, returned for `leave`."""
+        deadline = deadline or DbDeadline()
+        self.requests.append(deadline)
+        return deadline
+
+    def leave(self, deadline: DbDeadline) -> None:
+        """Remove a request that stopped waiting for the computation."""
+        self.requests.remove(deadline)
+
+    def interrupted(self) -> bool:
+        # Read from the driver's thread, iterate over a copy
+        return super().interrupted() or all(request.cancelled for request in self.requests[:])
+
+
+def is_interrupted(error: BaseException) -> bool:
+    """Whether `error` is a statement interrupted by its deadline."""
+    return isinstance(error, OperationalError) and "interrupted" in str(error.orig)
+
+
+def _on_connect(dbapi_connection, connection_record) -> None:
+    info = connection_record.info
+
+    def check_deadline() -> bool:
+        # Runs in the driver's thread, a true return value interrupts the statement
+        deadline = info.get(_DEADLINE_KEY)
+        return deadline is not None and deadline.interrupted()
+
+    dbapi_connection.run_async(
+        lambda connection: connection.set_progress_handler(
+            check_deadline, PROGRESS_HANDLER_INSTRUCTIONS
+        )
+    )
+
+
+def _before_cursor_execute(conn: Connection, cursor, statement, parameters, context, executemany):
+    conn.info[_DEADLINE_KEY] = _current_deadline.get()
+
+
+def _on_reset(dbapi_connection, connection_record, reset_state) -> None:
+    # Never interrupt the rollback ending the connection's transaction
+    connection_record.info.pop(_DEADLINE_KEY, None)
+
+
+def instrument_deadlines(engine: AsyncEngine) -> None:
+    """
+    Check statement deadlines on the (aiosqlite) connections of an async engine, if
+    deadlines or cancellation on disconnect are enabled in settings.
+    """
+    if settings.db_deadline_seconds <= 0 and not settings.db_cancel_on_disconnect:
+        return
+    sync_engine = engine.sync_engine
+    event.listen(sync_engine, "connect", _on_connect)
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine.pool, "reset", _on_reset)
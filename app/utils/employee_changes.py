@@ -0,0 +1,85 @@
+"""
+Publishes committed employee changes made through ORM sessions.
+
+In-memory derived data (data versions, prefix indexes) subscribes to keep itself up to date.
+Bulk statements that bypass the ORM unit of work (e.g. `insert(Employee)` in seed scripts)
+are not seen.
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.models.employee import Employee
+
+_PENDING_CHANGES = "pending_employee_changes"
+
+
+@dataclass(frozen=True)
+class EmployeeChange:
+    """One employee inserted, updated or deleted by a committed transaction."""
+
+    employee_id: int
+    # Organizations the employee belonged to before and after the change
+    organization_ids: frozenset[int]
+    # Column values after the change, None if the employee was deleted
+    values: dict[str, Any] | None
+
+
+_subscribers: list[Callable[[list[EmployeeChange]], None]] = []
+
+
+def subscribe(callback: Callable[[list[EmployeeChange]], None]) -> None:
+    """
+    Call `callback` with the employee changes of every committed transaction, in the
+    order subscribers were registered.
+    """
+    _subscribers.append(callback)
+
+
+def _snapshot(employee: Employee, deleted: bool) -> EmployeeChange:
+    state = inspect(employee)
+    organization_ids = {employee.organization_id}
+    organization_ids.update(state.attrs.organization_id.history.deleted)
+    values = None
+    if not deleted:
+        values = {attr.key: getattr(employee, attr.key) for attr in state.mapper.column_attrs}
+    return EmployeeChange(
+        employee_id=employee.id, organization_ids=frozenset(organization_ids), values=values
+    )
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changes(session: Session, flush_context) -> None:
+    pending = session.info.setdefault(_PENDING_CHANGES, {})
+    deleted = set(session.deleted)
+    for instance in (*session.new, *session.dirty, *deleted):
+        if isinstance(instance, Employee):
+            # Keep the last change per employee if it's flushed several times
+            change = _snapshot(instance, deleted=instance in deleted)
+            previous = pending.get(change.employee_id)
+            if previous is not None:
+                change = EmployeeChange(
+                    employee_id=change.employee_id,
+                    organization_ids=previous.organization_ids | change.organization_ids,
+                    values=change.values,
+                )
+            pending[change.employee_id] = change
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_changes(session: Session) -> None:
+    pending = session.info.pop(_PENDING_CHANGES, None)
+    if not pending:
+        return
+    changes = list(pending.values())
+    for callback in _subscribers:
+        callback(changes)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_changes(session: Session, previous_transaction) -> None:
+    session.info.pop(_PENDING_CHANGES, None)
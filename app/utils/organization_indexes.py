@@ -0,0 +1,101 @@
+"""
+Per-organization in-memory indexes of employees, built lazily and kept up to date with
+committed ORM changes.
+"""
+
+import threading
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Any, Protocol
+
+from app.utils.data_versions import data_versions
+from app.utils.employee_changes import EmployeeChange
+from app.utils.metrics import registry
+from app.utils.single_flight import SingleFlight
+
+
+class OrganizationIndex(Protocol):
+    """An index of one organization's employees that can be updated in place."""
+
+    # Data version of the organization the index is up to date with
+    version: int
+
+    def upsert(self, employee: dict[str, Any]) -> None:
+        """Add an employee (dict of its column values) or replace its previous entry."""
+
+    def remove(self, employee_id: int) -> None:
+        """Remove an employee, if indexed."""
+
+    def __len__(self) -> int:
+        """Number of indexed employees."""
+
+
+class OrganizationIndexes:
+    """
+    Indexes per organization, built lazily and kept up to date with committed ORM changes
+    (subscribe `apply` to `employee_changes`). Least recently used indexes are dropped
+    beyond `max_organizations`.
+    """
+
+    def __init__(self, name: str, max_organizations: int):
+        self.name = name
+        self.max_organizations = max_organizations
+        self._indexes: OrderedDict[int, OrganizationIndex] = OrderedDict()
+        self._lock = threading.Lock()
+        self._builds = SingleFlight(f"{name}_build")
+
+        registry.gauge(
+            f"{name}_employees",
+            f"Number of employees in the {name} indexes",
+            callback=lambda: sum(len(index) for index in list(self._indexes.values())),
+        )
+
+    async def get(
+        self, organization_id: int, build: Callable[[], Awaitable[OrganizationIndex]]
+    ) -> OrganizationIndex:
+        """
+        Get the organization's index, building it with `build` if missing or stale.
+
+        `build` must read the organization's data version before loading employees, so an
+        index missing a change committed during the build is detected as stale.
+        """
+        index = self._indexes.get(organization_id)
+        if index is not None and index.version == data_versions.get(organization_id):
+            with self._lock:
+                if organization_id in self._indexes:
+                    self._indexes.move_to_end(organization_id)
+            return index
+
+        index = await self._builds.do(organization_id, build)
+        with self._lock:
+            self._indexes[organization_id] = index
+            while len(self._indexes) > self.max_organizations:
+                self._indexes.popitem(last=False)
+        return index
+
+    def apply(self, changes: list[EmployeeChange]) -> None:
+        """Apply committed employee changes to the loaded indexes."""
+        by_organization: dict[int, list[EmployeeChange]] = {}
+        for change in changes:
+            for organization_id in change.organization_ids:
+                by_organization.setdefault(organization_id, []).append(change)
+
+        for organization_id, organization_changes in by_organization.items():
+            index = self._indexes.get(organization_id)
+            version = data_versions.get(organization_id)
+            # Data versions are bumped once per commit before this runs, an index that was
+            # not at the previous version already missed a change and will be rebuilt
+            if index is None or index.version != version - 1:
+                continue
+            for change in organization_changes:
+                values = change.values
+                if values is None or values["organization_id"] != organization_id:
+                    index.remove(change.employee_id)
+                else:
+                    index.upsert(values)
+            index.version = version
+
+    def clear(self) -> None:
+        """Drop all indexes."""
+        with self._lock:
+            self._indexes.clear()
@@ -3,21 +3,43 @@ Simple in-memory pagination cache for mapping page numbers to cursors.
 This will be replaced with Redis in production.
 """
 
+from typing import Any
+
+from app.utils.data_versions import data_versions
+from app.utils.metrics import pagination_cache_lookups_total, registry
+
+# Last id of the previous page (or first id of the next page for backward cursors), or its
+# (sort key, id) for lists sorted by another column
+Cursor = int | tuple[Any, int]
+
 
 class PaginationCache:
     """
     In-memory cache for pagination cursors.
-    Maps (endpoint, cache_key, page_number) -> cursor (last id of previous page).
+    Maps (endpoint, cache_key, page_number) -> cursor (last id, or sort key and id, of
+    previous page).
     to facilitate page-based pagination using keyset pagination under the hood
     for performance with large datasets rather than offset-based pagination.
+    Backward cursors (first id, or sort key and id, of the next page) let a page be sought
+    from the page after it, e.g. going back from the last page.
+
+    Cursors of a query are dropped once the data version of its organization moves past
+    the version they were computed at, so changed employees never shift pages.
     """
 
     def __init__(self):
-        # endpoint -> cache_key (include query params) -> page_number -> cursor (last id of previous page)
+        # endpoint -> cache_key (include query params) -> (data version, (page_number, backward) -> cursor)
         # TODO: Replace with Redis later, just for demo
-        self._cache: dict[str, dict[str, dict[int, int]]] = {}
+        self._cache: dict[str, dict[str, tuple[int, dict[tuple[int, bool], Cursor]]]] = {}
 
-    def get_cursor(self, endpoint: str, cache_key: str, page: int) -> str | None:
+    def get_cursor(
+        self,
+        endpoint: str,
+        cache_key: str,
+        page: int,
+        organization_id: int,
+        backward: bool = False,
+    ) -> Cursor | None:
         """
         Get cursor for a specific page.
 
@@ -25,17 +47,28 @@ class PaginationCache:
             endpoint: API endpoint name
             cache_key: Unique key for the query (includes filters)
             page: Page number
+            organization_id: Organization of the query, whose data version the cursor must match
+            backward: Get the cursor of the next page's first row instead
 
         Returns:
-            Cursor string or None if not cached
+            Cursor or None if not cached
         """
-        if endpoint not in self._cache:
-            return None
-        if cache_key not in self._cache[endpoint]:
-            return None
-        return self._cache[endpoint].get(cache_key, {}).get(page)
+        cursor = None
+        entry = self._cache.get(endpoint, {}).get(cache_key)
+        if entry is not None and entry[0] == data_versions.get(organization_id):
+            cursor = entry[1].get((page, backward))
+        pagination_cache_lookups_total.inc(result="miss" if cursor is None else "hit")
+        return cursor
 
-    def set_cursor(self, endpoint: str, cache_key: str, page: int, previous_id: int) -> None:
+    def set_cursor(
+        self,
+        endpoint: str,
+        cache_key: str,
+        page: int,
+        cursor: Cursor,
+        organization_id: int,
+        backward: bool = False,
+    ) -> None:
         """
         Store cursor for a specific page.
 
@@ -43,13 +76,17 @@ class PaginationCache:
             endpoint: API endpoint name
             cache_key: Unique key for the query (includes filters)
             page: Page number
-            previous_id: last id of previous page to be used as cursor
+            cursor: last id (or sort key and id) of previous page
+            organization_id: Organization of the query
+            backward: `cursor` is the first id (or sort key and id) of the next page
         """
-        if endpoint not in self._cache:
-            self._cache[endpoint] = {}
-        if cache_key not in self._cache[endpoint]:
-            self._cache[endpoint][cache_key] = {}
-        self._cache[endpoint][cache_key][page] = previous_id
+        version = data_versions.get(organization_id)
+        queries = self._cache.setdefault(endpoint, {})
+        entry = queries.get(cache_key)
+        if entry is None or entry[0] != version:
+            # Cursors of an older version would point into pages that have moved
+            entry = queries[cache_key] = (version, {})
+        entry[1][page, backward] = cursor
 
     def clear(self, endpoint: str | None = None) -> None:
         """
@@ -58,12 +95,15 @@ class PaginationCache:
         Args:
             endpoint: Optional specific endpoint to clear
         """
-        # TODO: Call when relevant employee data changes (e.g., created/updated/deleted) for cache invalidation
         if endpoint:
             self._cache.pop(endpoint, None)
         else:
             self._cache.clear()
 
+    def size(self) -> int:
+        """Number of cached cursors across all endpoints and queries."""
+        return sum(len(pages) for queries in self._cache.values() for _, pages in queries.values())
+
     @staticmethod
     def generate_cache_key(**kwargs) -> str:
         """
@@ -80,3 +120,9 @@ class PaginationCache:
 
 # Global cache instance
 pagination_cache = PaginationCache()
+
+registry.gauge(
+    "pagination_cache_size",
+    "Number of cursors in the pagination cache",
+    callback=pagination_cache.size,
+)
@@ -0,0 +1,93 @@
+"""
+In-memory sorted prefix indexes for typeahead suggestions.
+
+Each organization's employees are kept as a sorted array of (normalized key, employee id)
+pairs, so the employees whose name or email starts with a prefix are found with one
+binary search (`bisect`) and a short scan, without a database round trip.
+"""
+
+from bisect import bisect_left, insort
+from typing import Any
+
+from app.utils.search_text import normalize_search_text
+
+# Fields that can be searched and suggested, if the organization displays them
+SUGGEST_FIELDS = ("first_name", "last_name", "email")
+
+
+class PrefixIndex:
+    """
+    Sorted prefix index of one organization's employees.
+
+    Keys are the normalized first name, last name, full name and email of each employee,
+    limited to `fields`, so that nothing the organization doesn't display can be searched.
+    """
+
+    def __init__(self, version: int, fields: tuple[str, ...]):
+        # Data version of the organization the index is up to date with
+        self.version = version
+        self.fields = fields
+        self._keys: list[tuple[str, int]] = []
+        # employee id -> suggested fields
+        self._employees: dict[int, dict[str, Any]] = {}
+
+    def build(self, employees: list[dict[str, Any]]) -> None:
+        """Index `employees` (dicts with an "id" and the suggested fields) at once."""
+        for employee in employees:
+            self._employees[employee["id"]] = self._suggestion(employee)
+        self._keys = sorted(
+            (key, employee_id)
+            for employee_id, employee in self._employees.items()
+            for key in self._keys_for(employee)
+        )
+
+    def upsert(self, employee: dict[str, Any]) -> None:
+        """Add an employee or replace its previous keys."""
+        self.remove(employee["id"])
+        suggestion = self._suggestion(employee)
+        self._employees[employee["id"]] = suggestion
+        for key in self._keys_for(suggestion):
+            insort(self._keys, (key, employee["id"]))
+
+    def remove(self, employee_id: int) -> None:
+        """Remove an employee, if indexed."""
+        employee = self._employees.pop(employee_id, None)
+        if employee is None:
+            return
+        for key in self._keys_for(employee):
+            position = bisect_left(self._keys, (key, employee_id))
+            if position < len(self._keys) and self._keys[position] == (key, employee_id):
+                del self._keys[position]
+
+    def search(self, prefix: str, limit: int) -> list[dict[str, Any]]:
+        """
+        Employees with a key starting with `prefix`, in key order.
+
+        Args:
+            prefix: Search prefix, normalized like the keys
+            limit: Maximum number of employees to return
+        """
+        results = []
+        seen = set()
+        for position in range(bisect_left(self._keys, (prefix,)), len(self._keys)):
+            key, employee_id = self._keys[position]
+            if not key.startswith(prefix):
+                break
+            if employee_id not in seen:
+                seen.add(employee_id)
+                results.append(self._employees[employee_id])
+                if len(results) == limit:
+                    break
+        return results
+
+    def __len__(self) -> int:
+        return len(self._employees)
+
+    def _suggestion(self, employee: dict[str, Any]) -> dict[str, Any]:
+        return {"id": employee["id"], **{field: employee[field] for field in self.fields}}
+
+    def _keys_for(self, employee: dict[str, Any]) -> set[str]:
+        values = [employee[field] for field in self.fields if employee[field]]
+        if "first_name" in self.fields and "last_name" in self.fields:
+            values.append(f"{employee['first_name']} {employee['last_name']}")
+        return {normalize_search_text(value) for value in values}
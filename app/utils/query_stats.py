@@ -0,0 +1,132 @@
+"""
+SQL statement instrumentation.
+
+Counts statements and the time spent executing them per request, and logs statements
+slower than `settings.slow_query_threshold_ms` with their parameters and query plan.
+"""
+
+import logging
+from contextvars import ContextVar
+from time import perf_counter
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStats:
+    """
+    Number of statements and total execution time (seconds) of one request, and the
+    statements its rare paths may execute on top of its endpoint's budget.
+    """
+
+    __slots__ = ("count", "duration", "extra_budget")
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.extra_budget = 0
+
+
+_current_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def start_query_stats() -> tuple[QueryStats, object]:
+    """
+    Start collecting statement stats for the current request.
+
+    Returns:
+        Tuple of (stats, token to pass to `stop_query_stats`)
+    """
+    stats = QueryStats()
+    return stats, _current_stats.set(stats)
+
+
+def stop_query_stats(token) -> None:
+    """Stop collecting the stats started by `start_query_stats`."""
+    _current_stats.reset(token)
+
+
+def get_query_stats() -> QueryStats | None:
+    """Get the statement stats of the current request, if collected."""
+    return _current_stats.get()
+
+
+def allow_extra_queries(count: int) -> None:
+    """
+    Let the current request execute `count` statements more than its endpoint's budget, for
+    a rare path such as a fallback after a query that could not answer the request.
+
+    Args:
+        count: Number of extra statements of the path
+    """
+    stats = get_query_stats()
+    if stats is not None:
+        stats.extra_budget += count
+
+
+def _before_cursor_execute(conn: Connection, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.count += 1
+    # On the statement's execution context rather than the connection, so that statements
+    # that fail (no after_cursor_execute) leave nothing behind
+    context._query_start_time = perf_counter()
+
+
+def _after_cursor_execute(conn: Connection, cursor, statement, parameters, context, executemany):
+    duration = perf_counter() - context._query_start_time
+
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.duration += duration
+
+    threshold_ms = settings.slow_query_threshold_ms
+    if threshold_ms > 0 and duration * 1000 >= threshold_ms:
+        logger.warning(
+            "Slow query (%.1f ms): %s | parameters: %r | plan: %s",
+            duration * 1000,
+            statement,
+            parameters,
+            _explain_query_plan(conn, statement, parameters, executemany),
+            extra={
+                "duration_ms": round(duration * 1000, 3),
+                "statement": statement,
+                "parameters": parameters,
+            },
+        )
+
+
+def _explain_query_plan(conn: Connection, statement: str, parameters, executemany: bool) -> str:
+    """Get the SQLite query plan of a SELECT statement as a single line."""
+    if (
+        not settings.slow_query_explain
+        or executemany
+        or conn.dialect.name != "sqlite"
+        or not statement.lstrip().upper().startswith(("SELECT", "WITH"))
+    ):
+        return "n/a"
+
+    try:
+        # Use a raw DBAPI cursor so that the EXPLAIN itself is not instrumented
+        cursor = conn.connection.dbapi_connection.cursor()
+        try:
+            cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            return "; ".join(row[-1] for row in cursor.fetchall())
+        finally:
+            cursor.close()
+    except Exception as err:  # Never fail the original query because of the plan
+        return f"unavailable ({err})"
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Attach the statement instrumentation to an async engine."""
+    sync_engine = engine.sync_engine
+    if event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
@@ -0,0 +1,96 @@
+"""
+Matching employees of recent search terms, refined in memory as the user keeps typing.
+
+Every employee matching "john" also matches "jo", so once the matches of "jo" are known,
+"joh" and "john" are answered by filtering them instead of scanning the organization again.
+Matches are kept as a compact id array with the text the term was matched against.
+"""
+
+from array import array
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from app.utils.search_text import normalize_search_text
+
+# Separates the searched fields of an employee, so that a term never matches across two
+_FIELD_SEPARATOR = "\x1f"
+
+# LIKE wildcards, a term containing them doesn't mean the same thing in SQL and in memory
+_LIKE_WILDCARDS = ("%", "_")
+
+
+def can_refine(term: str) -> bool:
+    """Whether the "contains" matches of `term` can be computed and refined in memory."""
+    return not any(wildcard in term for wildcard in _LIKE_WILDCARDS)
+
+
+@dataclass(frozen=True, slots=True)
+class SearchMatches:
+    """
+    Employees matching a search term in "contains" mode, ordered by id.
+
+    Mirrors `EmployeeRepository._search_filter`: the normalized term is matched against the
+    normalized names and email, the lowercased term against the phone number.
+    """
+
+    term: str
+    # Matching employee ids, 4 bytes each
+    ids: array
+    # Normalized first name, last name and email of each match, joined by _FIELD_SEPARATOR
+    texts: list[str]
+    # Lowercased phone number of each match
+    phones: list[str]
+
+    @classmethod
+    def from_rows(
+        cls, term: str, rows: Iterable[tuple[int, str | None, str | None, str | None, str | None]]
+    ) -> "SearchMatches":
+        """Build from (id, first_name_search, last_name_search, email_search, phone) rows."""
+        ids, texts, phones = array("I"), [], []
+        for employee_id, first_name, last_name, email, phone in rows:
+            ids.append(employee_id)
+            texts.append(_FIELD_SEPARATOR.join((first_name or "", last_name or "", email or "")))
+            phones.append((phone or "").lower())
+        return cls(term=term, ids=ids, texts=texts, phones=phones)
+
+    def is_refined_by(self, term: str) -> bool:
+        """Whether every employee matching `term` is one of these matches."""
+        return (
+            normalize_search_text(self.term) in normalize_search_text(term)
+            and self.term.lower() in term.lower()
+        )
+
+    def refine(self, term: str) -> "SearchMatches":
+        """Matches of `term`, which must refine this term, filtered in memory."""
+        normalized, lowered = normalize_search_text(term), term.lower()
+        ids, texts, phones = array("I"), [], []
+        for employee_id, text, phone in zip(self.ids, self.texts, self.phones, strict=True):
+            if normalized in text or lowered in phone:
+                ids.append(employee_id)
+                texts.append(text)
+                phones.append(phone)
+        return SearchMatches(term=term, ids=ids, texts=texts, phones=phones)
+
+
+def find_matches(recent: tuple[SearchMatches, ...], term: str) -> SearchMatches | None:
+    """
+    Matches of `term` from the recent terms, refining the most selective term it extends.
+
+    Returns:
+        SearchMatches, or None if no recent term is refined by `term`
+    """
+    for matches in recent:
+        if matches.term == term:
+            return matches
+    candidates = [matches for matches in recent if matches.is_refined_by(term)]
+    if not candidates:
+        return None
+    return min(candidates, key=lambda matches: len(matches.ids)).refine(term)
+
+
+def remember(
+    recent: tuple[SearchMatches, ...], matches: SearchMatches, max_terms: int
+) -> tuple[SearchMatches, ...]:
+    """Recent terms with `matches` first, keeping at most `max_terms`."""
+    others = tuple(previous for previous in recent if previous.term != matches.term)
+    return (matches, *others)[:max_terms]
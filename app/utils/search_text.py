@@ -0,0 +1,57 @@
+"""
+Normalization of searchable employee fields.
+
+Search terms and the `*_search` shadow columns of employees go through the same
+normalization, so matching is case and accent insensitive for any script rather than
+relying on SQLite's ASCII-only case folding in LIKE.
+"""
+
+import unicodedata
+
+# Sorts after any character a normalized value can continue with, for prefix range scans
+_MAX_CHAR = "\U0010ffff"
+
+# Unicode blocks normalized in plain SQL by `search_text_foldings`: Latin-1 Supplement and
+# Latin Extended-A/B, combining diacritical marks, Greek and Cyrillic
+SQL_FOLDED_BLOCKS = ((0x00C0, 0x0250), (0x0300, 0x0370), (0x0370, 0x0530))
+
+
+def normalize_search_text(value: str | None) -> str | None:
+    """
+    Casefold and strip accents: "Zoë Ångström" -> "zoe angstrom".
+    """
+    if value is None:
+        return None
+    decomposed = unicodedata.normalize("NFKD", value)
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+
+def digits_only(value: str | None) -> str | None:
+    """
+    Keep only the digits of a phone number: "+1-555-0001" -> "15550001".
+    """
+    if value is None:
+        return None
+    return "".join(char for char in value if char.isdigit())
+
+
+def search_text_foldings() -> list[tuple[str, str]]:
+    """
+    (character, normalized text) pairs of the characters of `SQL_FOLDED_BLOCKS` that
+    `normalize_search_text` changes. Replacing them after SQLite's ASCII-only `lower()`
+    normalizes text of these scripts in plain SQL, e.g. in triggers.
+    """
+    return [
+        (char, normalized)
+        for start, end in SQL_FOLDED_BLOCKS
+        for char in map(chr, range(start, end))
+        if (normalized := normalize_search_text(char)) != char
+    ]
+
+
+def prefix_upper_bound(prefix: str) -> str:
+    """
+    Exclusive upper bound of the strings starting with `prefix`, so that a prefix match is
+    the index range scan `prefix <= column < prefix_upper_bound(prefix)`.
+    """
+    return prefix + _MAX_CHAR
@@ -0,0 +1,117 @@
+"""
+Lightweight per-request phase timers reported through the `Server-Timing` header.
+
+Timers are no-ops unless a `ServerTiming` collector was activated for the current
+request (see `app.middleware.server_timing.ServerTimingMiddleware`).
+"""
+
+from contextvars import ContextVar
+from time import perf_counter
+
+
+class ServerTiming:
+    """
+    Collects the durations of the phases of a single request.
+    Durations of phases with the same name are accumulated.
+    """
+
+    def __init__(self):
+        self.started_at = perf_counter()
+        self.last_phase_end = self.started_at
+        self.phases: dict[str, float] = {}
+
+    def record(self, name: str, duration: float) -> None:
+        """
+        Record a phase duration.
+
+        Args:
+            name: Phase name (must be a valid HTTP token, e.g. "count")
+            duration: Duration in seconds
+        """
+        self.phases[name] = self.phases.get(name, 0.0) + duration
+        self.last_phase_end = perf_counter()
+
+    def record_since_last_phase(self, name: str) -> None:
+        """Record the time elapsed since the end of the last recorded phase."""
+        if self.phases:
+            self.record(name, perf_counter() - self.last_phase_end)
+
+    def header_value(self) -> str:
+        """Format the phases as a `Server-Timing` header value (durations in ms)."""
+        return ", ".join(
+            f"{name};dur={duration * 1000:.3f}" for name, duration in self.phases.items()
+        )
+
+    def log_fields(self) -> dict[str, float]:
+        """Phase durations in milliseconds, for structured logging."""
+        return {name: round(duration * 1000, 3) for name, duration in self.phases.items()}
+
+
+_current_timing: ContextVar[ServerTiming | None] = ContextVar("server_timing", default=None)
+
+
+def start_server_timing() -> tuple[ServerTiming, object]:
+    """
+    Activate a new collector for the current request.
+
+    Returns:
+        Tuple of (collector, token to pass to `stop_server_timing`)
+    """
+    timing = ServerTiming()
+    return timing, _current_timing.set(timing)
+
+
+def stop_server_timing(token) -> None:
+    """Deactivate the collector activated by `start_server_timing`."""
+    _current_timing.reset(token)
+
+
+def get_server_timing() -> ServerTiming | None:
+    """Get the collector of the current request, if any."""
+    return _current_timing.get()
+
+
+class _Phase:
+    __slots__ = ("timing", "name", "start")
+
+    def __init__(self, timing: ServerTiming, name: str):
+        self.timing = timing
+        self.name = name
+
+    def __enter__(self):
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.timing.record(self.name, perf_counter() - self.start)
+        return False
+
+
+class _NoopPhase:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NOOP_PHASE = _NoopPhase()
+
+
+def timed_phase(name: str) -> _Phase | _NoopPhase:
+    """
+    Context manager timing a phase of the current request.
+
+    When Server-Timing is disabled this returns a shared no-op context manager,
+    so the cost is a single context variable lookup.
+
+    Example:
+        with timed_phase("count"):
+            result = await db.execute(count_query)
+    """
+    timing = _current_timing.get()
+    if timing is None:
+        return _NOOP_PHASE
+    return _Phase(timing, name)
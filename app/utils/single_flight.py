@@ -0,0 +1,101 @@
+"""
+Single-flight request coalescing.
+
+Concurrent calls with the same key share one in-flight computation instead of each
+running their own, e.g. when a whole team opens the same dashboard at once.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from math import inf
+from typing import Any
+
+from app.utils.db_deadline import SharedDbDeadline, get_db_deadline, use_db_deadline
+from app.utils.metrics import single_flight_calls_total
+
+
+class _Flight:
+    __slots__ = ("task", "waiters", "deadline")
+
+    def __init__(self, fn: Callable[[], Awaitable[Any]]):
+        leader_deadline = get_db_deadline()
+        self.deadline = SharedDbDeadline(
+            leader_deadline.expires_at if leader_deadline is not None else inf
+        )
+        self.task = asyncio.ensure_future(self._run(fn))
+        self.waiters = 0
+
+    async def _run(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        # The task's context is a copy of the leader's, with the leader's deadline
+        use_db_deadline(self.deadline)
+        return await fn()
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key into a single computation.
+
+    - The first caller (leader) starts the computation as a separate task, later callers
+      with the same key (followers) await that task instead of starting their own.
+    - The result or exception of the computation is returned or raised to every caller.
+    - A cancelled caller only stops waiting, the computation keeps running for the other
+      callers. It is cancelled once no caller is waiting for it anymore, and later calls
+      start a new one.
+    - The computation's database statements have the deadline of the leader's request, and
+      are only interrupted on disconnect once every caller's client disconnected.
+    - Nothing is cached: once the computation finishes the next call starts a new one.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._flights: dict[Hashable, _Flight] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run `fn` unless a computation for `key` is already in flight, then await its result.
+
+        Args:
+            key: Key identifying identical computations
+            fn: Coroutine function computing the result, must not depend on the state of
+                the calling request (e.g. its DB session), since other callers share it
+
+        Returns:
+            Result of the (possibly shared) computation
+        """
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(fn)
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+            single_flight_calls_total.inc(flight=self.name, role="leader")
+        else:
+            single_flight_calls_total.inc(flight=self.name, role="follower")
+
+        flight.waiters += 1
+        deadline = flight.deadline.join(get_db_deadline())
+        try:
+            # Shield the shared task so that cancelling one caller does not cancel it
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            flight.deadline.leave(deadline)
+            if flight.waiters == 0 and not flight.task.done():
+                # Every caller was cancelled, nobody needs the result anymore. Forget it
+                # first, so that a later call starts a new computation instead of
+                # joining the cancelled one.
+                self._forget_key(key, flight)
+                flight.task.cancel()
+
+    def in_flight(self) -> int:
+        """Number of computations currently in flight."""
+        return len(self._flights)
+
+    def _forget_key(self, key: Hashable, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def _forget(self, key: Hashable, flight: _Flight) -> None:
+        self._forget_key(key, flight)
+        if not flight.task.cancelled():
+            # Mark the exception as retrieved when every caller was cancelled
+            flight.task.exception()
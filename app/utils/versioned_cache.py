@@ -0,0 +1,105 @@
+"""
+In-memory LRU cache of per-organization results, invalidated by data version.
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+from app.utils.data_versions import data_versions
+from app.utils.metrics import registry, result_cache_lookups_total
+
+
+class VersionedCache:
+    """
+    LRU cache mapping (organization_id, key) -> value computed at a data version.
+
+    Entries are only returned while their organization is still at the version they
+    were computed at, so writes invalidate them without scanning the cache.
+
+    The cache holds at most `max_entries` entries and, if `max_bytes` is set, values of at
+    most `max_bytes` bytes in total as measured by `sizeof`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int,
+        max_bytes: int = 0,
+        sizeof: Callable[[Any], int] = sys.getsizeof,
+    ):
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        # (organization_id, key) -> (data version, value, size in bytes)
+        self._entries: OrderedDict[tuple[int, str], tuple[int, Any, int]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        registry.gauge(
+            f"{name}_cache_size",
+            f"Number of entries in the {name} cache",
+            callback=self.size,
+        )
+        registry.gauge(
+            f"{name}_cache_bytes",
+            f"Size of the values in the {name} cache in bytes",
+            callback=lambda: self._bytes,
+        )
+
+    def get(self, organization_id: int, key: str) -> Any | None:
+        """
+        Get a cached value, or None if missing or computed at an older data version.
+        """
+        cache_key = (organization_id, key)
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None and entry[0] == data_versions.get(organization_id):
+                self._entries.move_to_end(cache_key)
+                result_cache_lookups_total.inc(cache=self.name, result="hit")
+                return entry[1]
+            if entry is not None:
+                self._remove(cache_key)
+        result_cache_lookups_total.inc(cache=self.name, result="miss")
+        return None
+
+    def set(self, organization_id: int, key: str, value: Any, version: int) -> None:
+        """
+        Store a value computed at `version`.
+
+        Callers read the version before computing, so a write committed during the
+        computation leaves an entry that is already stale rather than one that looks fresh.
+        Values larger than the whole byte budget are not stored.
+        """
+        if self.max_entries <= 0:
+            return
+        size = self.sizeof(value) if self.max_bytes else 0
+        if self.max_bytes and size > self.max_bytes:
+            return
+        cache_key = (organization_id, key)
+        with self._lock:
+            self._remove(cache_key)
+            self._entries[cache_key] = (version, value, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or (
+                self.max_bytes and self._bytes > self.max_bytes
+            ):
+                self._remove(next(iter(self._entries)))
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def size(self) -> int:
+        """Number of cached entries."""
+        return len(self._entries)
+
+    def _remove(self, cache_key: tuple[int, str]) -> None:
+        entry = self._entries.pop(cache_key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
@@ -0,0 +1,6 @@
+"""
+Benchmark suite for the employee list pipeline.
+
+Run with `python -m tests.benchmarks run` and compare two result files with
+`python -m tests.benchmarks compare base.json head.json`.
+"""
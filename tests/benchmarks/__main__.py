@@ -0,0 +1,96 @@
+"""
+Command line entry point for the benchmark suite.
+
+Usage:
+    python -m tests.benchmarks run --sizes 1000,10000 --output .benchmarks/head.json
+    python -m tests.benchmarks compare .benchmarks/base.json .benchmarks/head.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from pathlib import Path
+
+# Benchmarks seed their own databases, the app settings only need to be loadable
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("ENVIRONMENT", "benchmark")
+
+
+def _parse_sizes(value: str) -> list[int]:
+    return [int(size) for size in value.split(",") if size]
+
+
+def run_command(args: argparse.Namespace) -> int:
+    from tests.benchmarks.runner import TARGETS, run_benchmarks
+
+    report = asyncio.run(
+        run_benchmarks(
+            sizes=args.sizes,
+            iterations=args.iterations,
+            warmup=args.warmup,
+            alloc_iterations=args.alloc_iterations,
+            targets=tuple(args.targets) if args.targets else TARGETS,
+            name_filter=args.filter,
+            seed=args.seed,
+        )
+    )
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"Wrote {len(report['results'])} results to {output}", file=sys.stderr)
+    return 0
+
+
+def compare_command(args: argparse.Namespace) -> int:
+    from tests.benchmarks.compare import compare_results, format_table
+
+    rows, regressions = compare_results(
+        args.base, args.head, threshold_pct=args.threshold, min_delta_ms=args.min_delta_ms
+    )
+    print(format_table(rows))
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s):")
+        for regression in regressions:
+            print(f"  - {regression}")
+        return 1
+
+    print("\nNo regressions.")
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m tests.benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run the benchmark suite")
+    run_parser.add_argument("--sizes", type=_parse_sizes, default=[1_000, 10_000])
+    run_parser.add_argument("--iterations", type=int, default=50)
+    run_parser.add_argument("--warmup", type=int, default=5)
+    run_parser.add_argument("--alloc-iterations", type=int, default=5)
+    run_parser.add_argument("--targets", nargs="+", choices=["service", "http"])
+    run_parser.add_argument("--filter", help="Only run scenarios whose name contains this")
+    run_parser.add_argument("--seed", type=int, default=42)
+    run_parser.add_argument("--output", default=".benchmarks/results.json")
+    run_parser.set_defaults(func=run_command)
+
+    compare_parser = subparsers.add_parser("compare", help="Diff two benchmark runs")
+    compare_parser.add_argument("base")
+    compare_parser.add_argument("head")
+    compare_parser.add_argument(
+        "--threshold", type=float, default=10.0, help="Allowed p95 increase in percent"
+    )
+    compare_parser.add_argument(
+        "--min-delta-ms", type=float, default=0.2, help="Ignore p95 increases below this"
+    )
+    compare_parser.set_defaults(func=compare_command)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""
+Compare two benchmark result files and flag regressions.
+"""
+
+import json
+from pathlib import Path
+from typing import Any
+
+METRICS = (
+    "p50_ms",
+    "p95_ms",
+    "p99_ms",
+    "requests_per_second",
+    "queries_per_request",
+    "alloc_peak_kib",
+)
+
+
+def load_results(path: str | Path) -> dict[tuple, dict[str, Any]]:
+    """Load a result file indexed by (dataset_size, target, scenario)."""
+    data = json.loads(Path(path).read_text())
+    return {
+        (result["dataset_size"], result["target"], result["scenario"]): result
+        for result in data["results"]
+    }
+
+
+def _delta_pct(base: float | None, head: float | None) -> float | None:
+    if base is None or head is None or base == 0:
+        return None
+    return (head - base) / base * 100
+
+
+def compare_results(
+    base_path: str | Path,
+    head_path: str | Path,
+    threshold_pct: float = 10.0,
+    min_delta_ms: float = 0.2,
+) -> tuple[list[dict[str, Any]], list[str]]:
+    """
+    Diff two benchmark runs.
+
+    A scenario regresses when its p95 latency grows by more than `threshold_pct`
+    percent and `min_delta_ms` milliseconds (to ignore noise on very fast
+    requests), or when it issues more queries per request than before.
+
+    Returns:
+        Tuple of (rows with per-metric deltas, list of regression messages)
+    """
+    base = load_results(base_path)
+    head = load_results(head_path)
+
+    rows = []
+    regressions = []
+    for key in sorted(base.keys() & head.keys()):
+        base_result, head_result = base[key], head[key]
+        row = {"dataset_size": key[0], "target": key[1], "scenario": key[2]}
+        for metric in METRICS:
+            row[metric] = (base_result.get(metric), head_result.get(metric))
+            row[f"{metric}_delta_pct"] = _delta_pct(*row[metric])
+        rows.append(row)
+
+        base_p95, head_p95 = row["p95_ms"]
+        if head_p95 - base_p95 > min_delta_ms and (row["p95_ms_delta_pct"] or 0) > threshold_pct:
+            regressions.append(
+                f"{key}: p95 {base_p95:.3f}ms -> {head_p95:.3f}ms (+{row['p95_ms_delta_pct']:.1f}%)"
+            )
+
+        base_queries, head_queries = row["queries_per_request"]
+        if head_queries > base_queries:
+            regressions.append(f"{key}: queries per request {base_queries} -> {head_queries}")
+
+    for key in sorted(base.keys() - head.keys()):
+        regressions.append(f"{key}: missing from head run")
+
+    return rows, regressions
+
+
+def format_table(rows: list[dict[str, Any]]) -> str:
+    """Render comparison rows as a plain-text table."""
+    lines = [
+        f"{'size':>7} {'target':<7} {'scenario':<44} "
+        f"{'p50 ms':>18} {'p95 ms':>18} {'p99 ms':>18} {'queries':>10}"
+    ]
+    for row in rows:
+        cells = []
+        for metric in ("p50_ms", "p95_ms", "p99_ms"):
+            _, head = row[metric]
+            delta = row[f"{metric}_delta_pct"]
+            delta_str = f"{delta:+.1f}%" if delta is not None else "n/a"
+            cells.append(f"{head:>9.3f} {delta_str:>8}")
+        base_queries, head_queries = row["queries_per_request"]
+        lines.append(
+            f"{row['dataset_size']:>7} {row['target']:<7} {row['scenario']:<44} "
+            f"{cells[0]} {cells[1]} {cells[2]} {base_queries:>4}->{head_queries:<4}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,157 @@
+"""
+Deterministic dataset generation for benchmarks.
+"""
+
+import random
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.database import Base
+from app.models import (
+    Company,
+    Department,
+    Employee,
+    EmployeeStatus,
+    Location,
+    Organization,
+    Position,
+    User,
+)
+from app.utils.search_text import digits_only, normalize_search_text
+
+BENCH_ORGANIZATION_ID = 1
+BENCH_USER_ID = 1
+
+NUM_COMPANIES = 5
+NUM_DEPARTMENTS = 20
+NUM_LOCATIONS = 50
+NUM_POSITIONS = 30
+
+# Every RARE_NAME_EVERY-th employee gets a rare first name so that "rare" searches
+# have a known, small selectivity
+RARE_NAME = "Zebulon"
+RARE_NAME_EVERY = 1000
+
+FIRST_NAMES = [
+    "James", "Mary", "John", "Patricia", "Robert", "Jennifer", "Michael", "Linda",
+    "William", "Elizabeth", "David", "Barbara", "Richard", "Susan", "Joseph", "Jessica",
+    "Thomas", "Sarah", "Charles", "Karen", "Daniel", "Nancy", "Matthew", "Lisa",
+    "Anthony", "Betty", "Mark", "Margaret", "Donald", "Sandra", "Steven", "Ashley",
+    "Paul", "Kimberly", "Andrew", "Emily", "Joshua", "Donna", "Kenneth", "Michelle",
+]  # fmt: skip
+LAST_NAMES = [
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis",
+    "Rodriguez", "Martinez", "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson",
+    "Thomas", "Taylor", "Moore", "Jackson", "Martin", "Lee", "Perez", "Thompson",
+    "White", "Harris", "Sanchez", "Clark", "Ramirez", "Lewis", "Robinson",
+]  # fmt: skip
+
+# Weighted status distribution: mostly active, few terminated
+STATUS_WEIGHTS = [
+    (EmployeeStatus.ACTIVE.value, 80),
+    (EmployeeStatus.NOT_STARTED.value, 15),
+    (EmployeeStatus.TERMINATED.value, 5),
+]
+
+INSERT_BATCH_SIZE = 5000
+
+
+def generate_employees(size: int, seed: int = 42) -> list[dict]:
+    """
+    Generate `size` employee rows for the benchmark organization.
+
+    The same (size, seed) pair always produces the same rows, so results of two
+    runs are comparable.
+    """
+    rng = random.Random(seed)
+    statuses = [status for status, _ in STATUS_WEIGHTS]
+    weights = [weight for _, weight in STATUS_WEIGHTS]
+
+    rows = []
+    for employee_id in range(1, size + 1):
+        first_name = RARE_NAME if employee_id % RARE_NAME_EVERY == 0 else rng.choice(FIRST_NAMES)
+        last_name = rng.choice(LAST_NAMES)
+        email = f"{first_name}.{last_name}{employee_id}@example.com".lower()
+        phone = f"+1-555-{employee_id:07d}"
+        rows.append(
+            {
+                "id": employee_id,
+                "organization_id": BENCH_ORGANIZATION_ID,
+                "first_name": first_name,
+                "last_name": last_name,
+                "email": email,
+                "phone": phone,
+                "avatar": f"https://i.pravatar.cc/150?img={employee_id % 70}",
+                "company_id": rng.randint(1, NUM_COMPANIES),
+                "department_id": rng.randint(1, NUM_DEPARTMENTS),
+                "location_id": rng.randint(1, NUM_LOCATIONS),
+                "position_id": rng.randint(1, NUM_POSITIONS),
+                "status": rng.choices(statuses, weights)[0],
+                # Bulk inserts bypass the ORM events that fill the search columns
+                "first_name_search": normalize_search_text(first_name),
+                "last_name_search": normalize_search_text(last_name),
+                "email_search": normalize_search_text(email),
+                "phone_digits": digits_only(phone),
+            }
+        )
+    return rows
+
+
+async def seed_dataset(engine: AsyncEngine, size: int, seed: int = 42) -> None:
+    """
+    (Re)create all tables on `engine` and bulk insert a dataset of `size` employees.
+    """
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+        await conn.execute(
+            insert(Organization),
+            [
+                {
+                    "id": BENCH_ORGANIZATION_ID,
+                    "name": "Bench Corp",
+                    "display_columns": [
+                        "avatar",
+                        "first_name",
+                        "last_name",
+                        "email",
+                        "phone",
+                        "department",
+                        "position",
+                        "location",
+                        "status",
+                    ],
+                }
+            ],
+        )
+        await conn.execute(
+            insert(User),
+            [
+                {
+                    "id": BENCH_USER_ID,
+                    "organization_id": BENCH_ORGANIZATION_ID,
+                    "email": "bench@example.com",
+                    "hashed_password": "hashed_password",
+                    "full_name": "Bench User",
+                    "is_active": 1,
+                }
+            ],
+        )
+        for model, count in (
+            (Company, NUM_COMPANIES),
+            (Department, NUM_DEPARTMENTS),
+            (Location, NUM_LOCATIONS),
+            (Position, NUM_POSITIONS),
+        ):
+            await conn.execute(
+                insert(model),
+                [{"id": i, "name": f"{model.__name__} {i}"} for i in range(1, count + 1)],
+            )
+
+        rows = generate_employees(size=size, seed=seed)
+        for start in range(0, len(rows), INSERT_BATCH_SIZE):
+            await conn.execute(insert(Employee), rows[start : start + INSERT_BATCH_SIZE])
+
+        await conn.exec_driver_sql("ANALYZE")
@@ -0,0 +1,349 @@
+"""
+Benchmark runner: measures latency, queries and allocations per request.
+"""
+
+import asyncio
+import math
+import platform
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from datetime import UTC, datetime
+from pathlib import Path
+from statistics import fmean, median
+from time import perf_counter
+from typing import Any
+
+import sqlalchemy
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.auth import create_access_token
+from app.config import settings
+from app.database import create_db_engine, get_db, get_read_db
+from app.decorators.rate_limit import _limiters, reset_all_limiters
+from app.main import app
+from app.schemas.employee import EmployeeListQueryParams
+from app.services.employee_service import (
+    EmployeeService,
+    result_set_cache,
+    search_refinement_cache,
+)
+from app.utils.pagination_cache import pagination_cache
+from tests.benchmarks.dataset import BENCH_ORGANIZATION_ID, BENCH_USER_ID, seed_dataset
+from tests.benchmarks.scenarios import Scenario, build_scenarios
+
+TARGETS = ("service", "http")
+
+# Settings read when an engine is created, scenarios overriding them run on a new engine
+ENGINE_SETTING_PREFIXES = ("db_", "sqlite_")
+
+
+class QueryCounter:
+    """Counts SQL statements executed on an engine."""
+
+    def __init__(self, engine: AsyncEngine):
+        self.count = 0
+        event.listen(engine.sync_engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args) -> None:
+        self.count += 1
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of `values`."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+@contextmanager
+def override_settings(overrides: dict[str, Any]) -> Iterator[None]:
+    """Temporarily override application settings."""
+    previous = {name: getattr(settings, name) for name in overrides}
+    for name, value in overrides.items():
+        setattr(settings, name, value)
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            setattr(settings, name, value)
+
+
+@contextmanager
+def rate_limits_lifted() -> Iterator[None]:
+    """
+    Lift the per-user rate limits of every endpoint: all benchmark requests come from one
+    user, up to `concurrency` of them at once.
+    """
+    previous = {limiter: limiter.max_requests for limiter in _limiters.values()}
+    for limiter in previous:
+        limiter.max_requests = sys.maxsize
+    try:
+        yield
+    finally:
+        for limiter, max_requests in previous.items():
+            limiter.max_requests = max_requests
+        reset_all_limiters()
+
+
+class BenchmarkRunner:
+    """Runs scenarios against one seeded dataset."""
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        dataset_size: int,
+        iterations: int,
+        warmup: int,
+        alloc_iterations: int,
+    ):
+        self.dataset_size = dataset_size
+        self.iterations = iterations
+        self.warmup = warmup
+        self.alloc_iterations = alloc_iterations
+        self.headers = {"Authorization": f"Bearer {create_access_token(BENCH_USER_ID)}"}
+        self.use_engine(engine)
+
+    def use_engine(self, engine: AsyncEngine) -> None:
+        """Run the following requests on `engine`."""
+        self.engine = engine
+        self.session_factory = async_sessionmaker(
+            engine, class_=AsyncSession, expire_on_commit=False, autoflush=False
+        )
+        self.query_counter = QueryCounter(engine)
+
+    @asynccontextmanager
+    async def engine_settings(self, scenario: Scenario) -> AsyncIterator[None]:
+        """Run the scenario on a new engine if it overrides settings read at engine creation."""
+        if not any(name.startswith(ENGINE_SETTING_PREFIXES) for name in scenario.settings):
+            yield
+            return
+
+        # Close every connection first, SQLite can only change the journal mode without readers
+        url = self.engine.url.render_as_string(hide_password=False)
+        await self.engine.dispose()
+        self.use_engine(create_db_engine(url, read_only=True))
+        try:
+            yield
+        finally:
+            await self.engine.dispose()
+            self.use_engine(create_db_engine(url, read_only=True))
+
+    async def call_service(
+        self, scenario: Scenario, page: int | None = None, search: str | None = None
+    ) -> None:
+        params = scenario.query_params(page)
+        if search is not None:
+            params["search"] = search
+        async with self.session_factory() as session:
+            await EmployeeService(session).list_employee(
+                organization_id=BENCH_ORGANIZATION_ID,
+                query_params=EmployeeListQueryParams(**params),
+            )
+
+    async def call_http(
+        self, client: AsyncClient, scenario: Scenario, page: int | None = None
+    ) -> None:
+        # Keeps the limiters' request timestamps from piling up, see `rate_limits_lifted`
+        reset_all_limiters()
+        response = await client.get(
+            "/api/v1/employees", params=scenario.query_params(page), headers=self.headers
+        )
+        response.raise_for_status()
+
+    async def prepare(self, scenario: Scenario) -> None:
+        """Put the pagination and result caches in the state the scenario's path expects."""
+        pagination_cache.clear()
+        result_set_cache.clear()
+        search_refinement_cache.clear()
+        if scenario.path == "keyset":
+            # Walk the previous pages once so that the measured page has a cached cursor
+            for page in range(1, scenario.page):
+                await self.call_service(scenario, page=page)
+
+    async def reset(self, scenario: Scenario) -> None:
+        """Clear what previous requests cached, before each request on the offset path."""
+        pagination_cache.clear()
+        result_set_cache.clear()
+        search_refinement_cache.clear()
+        if scenario.refine_from:
+            await self.call_service(scenario, search=scenario.refine_from)
+
+    async def measure(
+        self, scenario: Scenario, target: str, call: Callable[[], Awaitable[None]]
+    ) -> dict[str, Any]:
+        """Measure one scenario on one target."""
+        latencies: list[float] = []
+        queries: list[float] = []
+        measured_time = 0.0
+
+        async def timed_call() -> float:
+            start = perf_counter()
+            await call()
+            return perf_counter() - start
+
+        await self.prepare(scenario)
+        for i in range(self.warmup + self.iterations):
+            if scenario.path == "offset":
+                await self.reset(scenario)
+            queries_before = self.query_counter.count
+            start = perf_counter()
+            elapsed = await asyncio.gather(*(timed_call() for _ in range(scenario.concurrency)))
+            if i >= self.warmup:
+                measured_time += perf_counter() - start
+                latencies.extend(e * 1000 for e in elapsed)
+                queries.append((self.query_counter.count - queries_before) / scenario.concurrency)
+
+        # Allocation pass is separate, tracemalloc overhead would distort latencies
+        alloc_peaks: list[int] = []
+        tracemalloc.start()
+        try:
+            for _ in range(self.alloc_iterations):
+                if scenario.path == "offset":
+                    await self.reset(scenario)
+                tracemalloc.reset_peak()
+                baseline, _ = tracemalloc.get_traced_memory()
+                await asyncio.gather(*(call() for _ in range(scenario.concurrency)))
+                _, peak = tracemalloc.get_traced_memory()
+                alloc_peaks.append(peak - baseline)
+        finally:
+            tracemalloc.stop()
+
+        return {
+            "scenario": scenario.name,
+            "target": target,
+            "dataset_size": self.dataset_size,
+            "page": scenario.page,
+            "path": scenario.path,
+            "params": scenario.params,
+            "settings": scenario.settings,
+            "concurrency": scenario.concurrency,
+            "iterations": len(latencies),
+            "mean_ms": round(fmean(latencies), 4),
+            "p50_ms": round(percentile(latencies, 50), 4),
+            "p95_ms": round(percentile(latencies, 95), 4),
+            "p99_ms": round(percentile(latencies, 99), 4),
+            "requests_per_second": round(len(latencies) / measured_time, 2),
+            "queries_per_request": round(fmean(queries), 2),
+            "alloc_peak_kib": round(median(alloc_peaks) / 1024, 2) if alloc_peaks else None,
+        }
+
+    async def run(self, scenarios: list[Scenario], targets: tuple[str, ...]) -> list[dict]:
+        """Run all applicable scenarios on all targets."""
+        results = []
+
+        async def override_get_db():
+            async with self.session_factory() as session:
+                yield session
+
+        app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides[get_read_db] = override_get_db
+        try:
+            async with AsyncClient(
+                transport=ASGITransport(app=app), base_url="http://bench"
+            ) as client:
+                for scenario in scenarios:
+                    if not scenario.applies_to(self.dataset_size):
+                        continue
+                    for target in targets:
+                        if target == "service":
+
+                            async def call(scenario=scenario):
+                                await self.call_service(scenario)
+                        else:
+
+                            async def call(scenario=scenario):
+                                await self.call_http(client, scenario)
+
+                        with override_settings(scenario.settings), rate_limits_lifted():
+                            async with self.engine_settings(scenario):
+                                result = await self.measure(scenario, target, call)
+                        print(
+                            f"[{self.dataset_size:>7}] {target:<7} {scenario.name:<44} "
+                            f"p50={result['p50_ms']:.3f}ms p95={result['p95_ms']:.3f}ms "
+                            f"rps={result['requests_per_second']:.1f} "
+                            f"queries={result['queries_per_request']}",
+                            file=sys.stderr,
+                        )
+                        results.append(result)
+        finally:
+            app.dependency_overrides.clear()
+            pagination_cache.clear()
+            result_set_cache.clear()
+            search_refinement_cache.clear()
+
+        return results
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run_benchmarks(
+    sizes: list[int],
+    iterations: int = 50,
+    warmup: int = 5,
+    alloc_iterations: int = 5,
+    targets: tuple[str, ...] = TARGETS,
+    name_filter: str | None = None,
+    seed: int = 42,
+) -> dict[str, Any]:
+    """
+    Seed one database per dataset size and run every scenario against it.
+
+    Returns:
+        JSON-serializable report with run metadata and one result per
+        (dataset_size, target, scenario)
+    """
+    scenarios = [s for s in build_scenarios() if not name_filter or name_filter in s.name]
+    results = []
+
+    with tempfile.TemporaryDirectory(prefix="hr_employee_bench_") as tmp_dir:
+        for size in sizes:
+            db_url = f"sqlite+aiosqlite:///{Path(tmp_dir) / f'bench_{size}.db'}"
+            writer = create_db_engine(db_url)
+            try:
+                await seed_dataset(writer, size=size, seed=seed)
+            finally:
+                await writer.dispose()
+
+            # Requests only read, like the list endpoint they run on the read-only pool
+            runner = BenchmarkRunner(
+                engine=create_db_engine(db_url, read_only=True),
+                dataset_size=size,
+                iterations=iterations,
+                warmup=warmup,
+                alloc_iterations=alloc_iterations,
+            )
+            try:
+                results.extend(await runner.run(scenarios, targets))
+            finally:
+                await runner.engine.dispose()
+
+    return {
+        "meta": {
+            "created_at": datetime.now(UTC).isoformat(),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "sqlalchemy": sqlalchemy.__version__,
+            "platform": platform.platform(),
+            "sizes": sizes,
+            "iterations": iterations,
+            "warmup": warmup,
+            "seed": seed,
+        },
+        "results": results,
+    }
@@ -0,0 +1,274 @@
+"""
+Benchmark scenarios for the employee list pipeline.
+
+Each scenario is one point in the space of dataset size x filter selectivity x
+search term x page depth x pagination path x concurrent requests.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Literal
+
+from tests.benchmarks.dataset import RARE_NAME
+
+PAGE_LIMIT = 50
+
+# Filter selectivity: broad matches ~80% of the organization, selective ~0.25%
+FILTERS: dict[str, dict[str, Any]] = {
+    "broad": {"status": ["Active"]},
+    "medium": {"department_id": [1, 2, 3]},
+    "selective": {"department_id": [1], "status": ["Terminated"]},
+    "multi-dimension": {"location_id": list(range(1, 11)), "position_id": [1, 2, 3]},
+}
+
+# Search terms: common hits many names, rare hits 0.1%, miss hits nothing
+SEARCHES: dict[str, str] = {
+    "common": "an",
+    "rare": RARE_NAME.lower(),
+    "miss": "qqqq",
+}
+
+# Typeahead prefixes for search_mode=prefix: common, rare, miss and phone digits
+PREFIX_SEARCHES: dict[str, str] = {
+    "common": "ma",
+    "rare": RARE_NAME[:3].lower(),
+    "miss": "qqqq",
+    "phone": "1555000",
+}
+
+# Search terms typed one more character at a time, the previous term matching few enough
+# employees to be refined: name -> (previous term, measured term, filters)
+REFINED_SEARCHES: dict[str, tuple[str, str, dict[str, Any]]] = {
+    "common": ("marg", "marga", FILTERS["medium"]),
+    "rare": (RARE_NAME[:4].lower(), RARE_NAME[:5].lower(), {}),
+}
+
+# Sort orders other than ids, paged with (sort key, id) keyset cursors
+SORTS: dict[str, dict[str, Any]] = {
+    "last-name": {"sort_by": "last_name"},
+    "department-desc": {"sort_by": "department", "sort_dir": "desc"},
+}
+
+PAGE_DEPTHS = (10, 50)
+# "offset" clears cached cursors and id lists before each request, "keyset" warms them first
+PATHS = ("offset", "keyset")
+
+# Filter list lengths, to check that long id lists don't change the plan or statement caching
+# (ids past NUM_LOCATIONS match nothing)
+ID_LIST_LENGTHS = (1, 10, 100, 1000)
+
+# Concurrent readers, with coalescing of identical requests disabled so every request queries
+CONCURRENT_READERS = (8,)
+
+# SQLite's own defaults, to compare against the engine profile from settings
+SQLITE_DEFAULTS: dict[str, Any] = {
+    "sqlite_journal_mode": "DELETE",
+    "sqlite_synchronous": "FULL",
+    "sqlite_mmap_size": 0,
+    "sqlite_cache_size": -2000,
+    "sqlite_temp_store": "DEFAULT",
+}
+
+# Settings variants, each run against a few representative scenarios:
+# variant -> (settings overrides, scenario names)
+VARIANTS: dict[str, tuple[dict[str, Any], tuple[str, ...]]] = {
+    "concurrent-count": (
+        {"concurrent_count_query": True, "bitmap_index_max_organizations": 0},
+        ("baseline", "filter-medium", "search-common", "page-10-offset"),
+    ),
+    # One statement per list length, as before lists were padded
+    "unpadded-in": (
+        {"in_list_padding": False},
+        tuple(f"filter-location-ids-{length}" for length in ID_LIST_LENGTHS),
+    ),
+    # Scan employees for every search term
+    "no-refinement": (
+        {"search_refinement_cache_size": 0},
+        ("search-common", "search-rare", *(f"search-refined-{name}" for name in REFINED_SEARCHES)),
+    ),
+    # Count and page every request in the database instead of slicing cached id lists
+    "no-result-set": (
+        {"result_set_cache_bytes": 0, "bitmap_index_max_organizations": 0},
+        (
+            "filter-multi-dimension",
+            "search-common",
+            "prefix-search-common",
+            *(f"search-common-page-{depth}-{path}" for depth in PAGE_DEPTHS for path in PATHS),
+        ),
+    ),
+    # Count and page unsearched requests in the database instead of on bitmaps
+    "no-bitmap": (
+        {"bitmap_index_max_organizations": 0},
+        (
+            "baseline",
+            *(f"filter-{name}" for name in FILTERS),
+            "filter-location-ids-100",
+            *(
+                f"{name}-{depth}-offset"
+                for name in ("page", "filter-broad-page")
+                for depth in PAGE_DEPTHS
+            ),
+        ),
+    ),
+    # Filter, count and page on in-memory NumPy columns (loaded during warmup)
+    "columnar": (
+        {"employee_read_engine": "columnar"},
+        (
+            "baseline",
+            *(f"filter-{name}" for name in FILTERS),
+            "search-common",
+            "search-rare",
+            "prefix-search-common",
+            "page-50-offset",
+            "filter-broad-page-50-offset",
+            "search-common-page-50-offset",
+        ),
+    ),
+    # Count employee rows instead of summing employee_counts buckets
+    "scan-count": (
+        {
+            "count_from_summary": False,
+            "result_set_cache_bytes": 0,
+            "bitmap_index_max_organizations": 0,
+        },
+        ("baseline", "filter-broad", "filter-medium", "filter-selective"),
+    ),
+    # Count every match of scanning counts, to compare with the capped counts of no-result-set
+    "exact-count": (
+        {"list_count_cap": 0, "result_set_cache_bytes": 0, "bitmap_index_max_organizations": 0},
+        ("filter-multi-dimension", "search-common", "prefix-search-common"),
+    ),
+    "estimated-count": (
+        {
+            "list_count_estimate": True,
+            "result_set_cache_bytes": 0,
+            "bitmap_index_max_organizations": 0,
+        },
+        ("filter-multi-dimension", "search-common", "prefix-search-common"),
+    ),
+    "sqlite-defaults": (
+        SQLITE_DEFAULTS,
+        (
+            "baseline",
+            "search-common",
+            *(f"concurrent-readers-{readers}" for readers in CONCURRENT_READERS),
+            *(f"search-common-concurrent-readers-{readers}" for readers in CONCURRENT_READERS),
+        ),
+    ),
+}
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """A single benchmarked list request."""
+
+    name: str
+    params: dict[str, Any] = field(default_factory=dict)
+    page: int = 1
+    # See PATHS
+    path: Literal["offset", "keyset"] = "offset"
+    # Settings overridden while this scenario runs, to compare implementation variants
+    settings: dict[str, Any] = field(default_factory=dict)
+    # Requests issued at the same time in each iteration
+    concurrency: int = 1
+    # Search term requested before each iteration, so that the measured term refines its matches
+    refine_from: str | None = None
+
+    def applies_to(self, dataset_size: int) -> bool:
+        """Skip deep pages that would be past the end of the dataset."""
+        return (self.page - 1) * PAGE_LIMIT < dataset_size
+
+    def query_params(self, page: int | None = None) -> dict[str, Any]:
+        """Query parameters for this scenario, optionally for another page."""
+        return {**self.params, "limit": PAGE_LIMIT, "page": page or self.page}
+
+
+def build_scenarios() -> list[Scenario]:
+    """Build the default list of scenarios."""
+    scenarios = [Scenario(name="baseline")]
+
+    for name, params in FILTERS.items():
+        scenarios.append(Scenario(name=f"filter-{name}", params=params))
+
+    for length in ID_LIST_LENGTHS:
+        scenarios.append(
+            Scenario(
+                name=f"filter-location-ids-{length}",
+                params={"location_id": list(range(1, length + 1))},
+            )
+        )
+
+    for name, term in SEARCHES.items():
+        scenarios.append(Scenario(name=f"search-{name}", params={"search": term}))
+
+    for name, params in SORTS.items():
+        scenarios.append(Scenario(name=f"sort-{name}", params=params))
+
+    for name, term in PREFIX_SEARCHES.items():
+        scenarios.append(
+            Scenario(name=f"prefix-search-{name}", params={"search": term, "search_mode": "prefix"})
+        )
+
+    for name, (previous, term, filters) in REFINED_SEARCHES.items():
+        scenarios.append(
+            Scenario(
+                name=f"search-refined-{name}",
+                params={**filters, "search": term},
+                refine_from=previous,
+            )
+        )
+
+    for depth in PAGE_DEPTHS:
+        for path in PATHS:
+            scenarios.append(Scenario(name=f"page-{depth}-{path}", page=depth, path=path))
+            scenarios.append(
+                Scenario(
+                    name=f"filter-broad-page-{depth}-{path}",
+                    params=FILTERS["broad"],
+                    page=depth,
+                    path=path,
+                )
+            )
+            scenarios.append(
+                Scenario(
+                    name=f"search-common-page-{depth}-{path}",
+                    params={"search": SEARCHES["common"]},
+                    page=depth,
+                    path=path,
+                )
+            )
+            for name, params in SORTS.items():
+                scenarios.append(
+                    Scenario(
+                        name=f"sort-{name}-page-{depth}-{path}",
+                        params=params,
+                        page=depth,
+                        path=path,
+                    )
+                )
+
+    for readers in CONCURRENT_READERS:
+        for name, params in (("", {}), ("search-common-", {"search": SEARCHES["common"]})):
+            scenarios.append(
+                Scenario(
+                    name=f"{name}concurrent-readers-{readers}",
+                    params=params,
+                    settings={"list_single_flight": False},
+                    concurrency=readers,
+                )
+            )
+
+    for variant, (overrides, names) in VARIANTS.items():
+        for scenario in [s for s in scenarios if s.name in names]:
+            scenarios.append(
+                Scenario(
+                    name=f"{scenario.name}+{variant}",
+                    params=scenario.params,
+                    page=scenario.page,
+                    path=scenario.path,
+                    settings={**scenario.settings, **overrides},
+                    concurrency=scenario.concurrency,
+                    refine_from=scenario.refine_from,
+                )
+            )
+
+    return scenarios
@@ -3,9 +3,11 @@ import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
-from app.database import Base, get_db
+from app.config import settings
+from app.database import Base, get_db, get_read_db
 from app.main import app
 from app.models import Employee, Organization
+from app.utils.query_stats import instrument_engine
 
 # Create test database
 TEST_DATABASE_URL = "sqlite+aiosqlite:///./test_hr_employees.db"
@@ -13,6 +15,7 @@ test_engine = create_async_engine(TEST_DATABASE_URL, connect_args={"check_same_t
 AsyncTestSessionLocal = async_sessionmaker(
     test_engine, class_=AsyncSession, expire_on_commit=False, autoflush=False
 )
+instrument_engine(test_engine)
 
 
 @pytest_asyncio.fixture(scope="session", autouse=True)
@@ -51,6 +54,7 @@ async def client(db_session):
         yield db_session
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
     async with AsyncClient(
         transport=ASGITransport(app=app), base_url="http://test"
     ) as async_client:
@@ -204,3 +208,36 @@ def reset_rate_limiters():
     reset_all_limiters()
     yield
     reset_all_limiters()
+
+
+@pytest.fixture(autouse=True)
+def clear_result_caches():
+    """Clear cached results before each test."""
+    from app.services.employee_service import (
+        bitmap_indexes,
+        facet_cache,
+        related_names_cache,
+        result_set_cache,
+        search_refinement_cache,
+        suggest_indexes,
+    )
+
+    bitmap_indexes.clear()
+    facet_cache.clear()
+    related_names_cache.clear()
+    result_set_cache.clear()
+    search_refinement_cache.clear()
+    suggest_indexes.clear()
+    yield
+    bitmap_indexes.clear()
+    facet_cache.clear()
+    related_names_cache.clear()
+    result_set_cache.clear()
+    search_refinement_cache.clear()
+    suggest_indexes.clear()
+
+
+@pytest.fixture(autouse=True)
+def enforce_query_budget(monkeypatch):
+    """Fail any request that executes more queries than its endpoint's budget."""
+    monkeypatch.setattr(settings, "enforce_query_budget", True)
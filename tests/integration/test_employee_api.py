@@ -1,4 +1,7 @@
+from datetime import UTC, datetime, timedelta
+
 from app.auth import create_access_token
+from app.config import settings
 
 
 class TestRateLimitingAPI:
@@ -35,6 +38,19 @@ class TestRateLimitingAPI:
         assert response.status_code == 429
         assert "Rate limit exceeded" in response.json()["detail"]
 
+    async def test_rate_limited_requests_release_connection(
+        self, client, db_session, sample_employees, sample_users
+    ):
+        """Test that requests don't hold a database connection once their reads are done."""
+        user = sample_users[0]
+        token = create_access_token(user.id)
+        headers = {"Authorization": f"Bearer {token}"}
+
+        for expected_status in (200, 200, 429, 429):
+            response = await client.get("/api/v1/employees", headers=headers)
+            assert response.status_code == expected_status
+            assert not db_session.in_transaction()
+
     async def test_rate_limit_different_users_have_separate_limits(
         self, client, sample_employees, sample_users
     ):
@@ -69,4 +85,243 @@ class TestRateLimitingAPI:
         assert response.status_code == 403
 
 
+class TestServerTimingAPI:
+    """Integration tests for the Server-Timing header."""
+
+    async def test_server_timing_disabled_by_default(self, client, sample_employees, sample_users):
+        """Test that no Server-Timing header is sent when the setting is off."""
+        headers = {"Authorization": f"Bearer {create_access_token(sample_users[0].id)}"}
+
+        response = await client.get("/api/v1/employees", headers=headers)
+
+        assert response.status_code == 200
+        assert "server-timing" not in response.headers
+
+    async def test_server_timing_reports_request_phases(
+        self, client, sample_employees, sample_users, monkeypatch
+    ):
+        """Test that every phase of a list request is reported when enabled."""
+        monkeypatch.setattr(settings, "server_timing_enabled", True)
+        headers = {"Authorization": f"Bearer {create_access_token(sample_users[0].id)}"}
+
+        response = await client.get("/api/v1/employees", headers=headers)
+
+        assert response.status_code == 200
+        phases = [entry.split(";")[0] for entry in response.headers["server-timing"].split(", ")]
+        assert phases == ["auth", "org", "count", "page", "project", "serialize", "total"]
+
+
+class TestQueryBudgetAPI:
+    """Integration tests for the list endpoint query budget."""
+
+    async def test_list_employee_within_query_budget(self, client, sample_employees, sample_users):
+        """Test that listing employees stays within 4 queries with filters and search."""
+        headers = {"Authorization": f"Bearer {create_access_token(sample_users[0].id)}"}
+        params = {"search": "j", "department_id": [1, 2], "status": ["Active"], "limit": 1}
+
+        # Fails with QueryBudgetExceeded if the budget is exceeded
+        response = await client.get("/api/v1/employees", params=params, headers=headers)
+
+        assert response.status_code == 200
+        assert response.json()["total_records"] == 3
+
+    async def test_capped_search_fallback_within_query_budget(
+        self, client, sample_employees, sample_users, monkeypatch
+    ):
+        """Test that estimated totals and search fallbacks only add their declared queries."""
+        headers = {"Authorization": f"Bearer {create_access_token(sample_users[0].id)}"}
+        monkeypatch.setattr(settings, "list_count_cap", 1)
+        monkeypatch.setattr(settings, "list_count_estimate", True)
+        # Too many matches to refine, listed ids past the cap: both queries are wasted
+        monkeypatch.setattr(settings, "search_refinement_max_ids", 1)
+
+        for _ in range(2):
+            response = await client.get(
+                "/api/v1/employees", params={"search": "j", "limit": 1}, headers=headers
+            )
+            assert response.status_code == 200
+            body = response.json()
+            assert body["total_is_estimate"] is True
+            assert body["total_records"] == 3
+
+
+class TestMetricsAPI:
+    """Integration tests for the metrics endpoint."""
+
+    async def test_metrics_expose_request_and_component_metrics(
+        self, client, sample_employees, sample_users
+    ):
+        """Test that a list request shows up in the exposed metrics."""
+        headers = {"Authorization": f"Bearer {create_access_token(sample_users[0].id)}"}
+        await client.get("/api/v1/employees", headers=headers)
+
+        response = await client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        body = response.text
+        assert (
+            'http_request_duration_seconds_count{method="GET",route="/api/v1/employees",'
+            'status="200"}' in body
+        )
+        assert 'rate_limit_decisions_total{endpoint="app.routers.employee_router' in body
+        assert 'pagination_cache_lookups_total{result="miss"}' in body
+        assert "pagination_cache_size" in body
+        # Unsearched lists are counted on bitmaps, loaded by the first request
+        assert 'employee_list_query_duration_seconds_count{query="bitmaps"}' in body
+        assert 'employee_list_query_duration_seconds_count{query="page"}' in body
+
+
+class TestFacetsAPI:
+    """Integration tests for the facet counts endpoint."""
+
+    async def test_employee_facets(self, client, sample_employees, sample_users):
+        """Test that facets are returned for the user's organization in one query."""
+        headers = {"Authorization": f"Bearer {create_access_token(sample_users[0].id)}"}
+
+        # Fails with QueryBudgetExceeded if more than auth + facets queries run
+        response = await client.get(
+            "/api/v1/employees/facets", params={"department_id": [1]}, headers=headers
+        )
+
+        assert response.status_code == 200
+        facets = response.json()["facets"]
+        assert set(facets) == {"department", "location", "position", "status"}
+        # The department facet ignores the department filter, the others apply it
+        assert facets["department"] == [
+            {"value": 1, "label": "Engineering", "count": 2},
+            {"value": 2, "label": "Sales", "count": 1},
+        ]
+        assert facets["status"] == [{"value": "Active", "label": "Active", "count": 2}]
+
+
+class TestSuggestAPI:
+    """Integration tests for the employee suggest endpoint."""
+
+    async def test_suggest_employee(self, client, sample_employees, sample_users):
+        """Test that suggestions only include the organization's configured columns."""
+        headers = {"Authorization": f"Bearer {create_access_token(sample_users[2].id)}"}
+
+        response = await client.get(
+            "/api/v1/employees/suggest", params={"q": "al"}, headers=headers
+        )
+
+        # Organization 2 doesn't display names or emails, so there is nothing to match
+        assert response.status_code == 200
+        assert response.json() == {"suggestions": []}
+
+        headers = {"Authorization": f"Bearer {create_access_token(sample_users[0].id)}"}
+        response = await client.get(
+            "/api/v1/employees/suggest", params={"q": "john d", "limit": 1}, headers=headers
+        )
+
+        assert response.status_code == 200
+        assert response.json()["suggestions"] == [
+            {"id": 1, "first_name": "John", "last_name": "Doe", "email": "john@test.com"}
+        ]
+
+    async def test_suggest_requires_two_characters(self, client, sample_employees, sample_users):
+        """Test that single character prefixes are rejected."""
+        headers = {"Authorization": f"Bearer {create_access_token(sample_users[0].id)}"}
+
+        response = await client.get("/api/v1/employees/suggest", params={"q": "j"}, headers=headers)
+
+        assert response.status_code == 422
+
+
+class TestChangesAPI:
+    """Integration tests for the employee changes (delta sync) endpoint."""
+
+    async def test_sync_changes_since_watermark(
+        self, client, db_session, sample_employees, sample_users, monkeypatch
+    ):
+        """Test that a sync pages through changes, then only returns later ones."""
+        monkeypatch.setattr(settings, "changes_settle_seconds", 0)
+        headers = {"Authorization": f"Bearer {create_access_token(sample_users[0].id)}"}
+        params = {"changed_since": (datetime.now(UTC) - timedelta(hours=1)).isoformat()}
+
+        response = await client.get(
+            "/api/v1/employees/changes", params={**params, "limit": 2}, headers=headers
+        )
+        assert response.status_code == 200
+        body = response.json()
+        assert [e["id"] for e in body["employees"]] == [1, 2]
+        assert body["has_more"] is True
+        assert set(body["employees"][0]) == {
+            "id",
+            "first_name",
+            "last_name",
+            "email",
+            "department",
+            "location",
+            "position",
+            "updated_at",
+        }
+
+        params = {"changed_since": body["next_changed_since"], "after_id": body["next_after_id"]}
+        body = (
+            await client.get("/api/v1/employees/changes", params=params, headers=headers)
+        ).json()
+        assert [e["id"] for e in body["employees"]] == [3]
+        assert body["has_more"] is False
+
+        sample_employees[0].last_name = "Dough"
+        await db_session.delete(sample_employees[1])
+        await db_session.commit()
+
+        params = {"changed_since": body["next_changed_since"], "after_id": body["next_after_id"]}
+        body = (
+            await client.get("/api/v1/employees/changes", params=params, headers=headers)
+        ).json()
+        assert [e["last_name"] for e in body["employees"]] == ["Dough"]
+        assert body["deleted_ids"] == [2]
+
+        params = {"changed_since": body["next_changed_since"], "after_id": body["next_after_id"]}
+        body = (
+            await client.get("/api/v1/employees/changes", params=params, headers=headers)
+        ).json()
+        assert body["employees"] == []
+        assert body["deleted_ids"] == []
+        assert body["next_changed_since"] == params["changed_since"]
+
+    async def test_expired_watermark(self, client, sample_employees, sample_users):
+        """Test that watermarks older than the tombstone retention are rejected."""
+        headers = {"Authorization": f"Bearer {create_access_token(sample_users[0].id)}"}
+
+        response = await client.get(
+            "/api/v1/employees/changes",
+            params={"changed_since": "2020-01-01T00:00:00Z"},
+            headers=headers,
+        )
+
+        assert response.status_code == 410
+
+
 # TODO: add integrations for list employee with different org configs and filters
+
+
+class TestAdmissionControlAPI:
+    """Integration tests for admission control of database-bound endpoints."""
+
+    async def test_overloaded_requests_are_shed(
+        self, client, sample_employees, sample_users, monkeypatch
+    ):
+        """Test that requests past the limit and queue get 503 with Retry-After."""
+        from app.utils.admission import db_reads
+
+        headers = {"Authorization": f"Bearer {create_access_token(sample_users[0].id)}"}
+        monkeypatch.setattr(db_reads, "limit", 0)
+        monkeypatch.setattr(db_reads, "queue_size", 0)
+
+        response = await client.get("/api/v1/employees/facets", headers=headers)
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "1"
+
+        # Shed before authenticating, which would reject the request with 403
+        response = await client.get("/api/v1/employees/facets")
+        assert response.status_code == 503
+
+        monkeypatch.setattr(db_reads, "limit", 1)
+        response = await client.get("/api/v1/employees/facets", headers=headers)
+        assert response.status_code == 200
+        assert db_reads.in_flight == 0
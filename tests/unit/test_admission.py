@@ -0,0 +1,100 @@
+"""
+Unit tests for adaptive admission control.
+"""
+
+import asyncio
+import random
+
+import pytest
+
+from app.utils.admission import (
+    LONG_LATENCY_WINDOW,
+    SHORT_LATENCY_WINDOW,
+    AdmissionLimiter,
+    Overloaded,
+)
+
+
+def _limiter(**options) -> AdmissionLimiter:
+    return AdmissionLimiter(
+        "test", **{"max_limit": 2, "queue_size": 1, "max_wait_seconds": 0.05, **options}
+    )
+
+
+class TestAdmissionLimiter:
+    """Test cases for AdmissionLimiter."""
+
+    async def test_queued_request_gets_released_slot(self):
+        """Test that past the limit requests queue, and take the slot of a finished one."""
+        limiter = _limiter(max_wait_seconds=1)
+        await limiter.acquire()
+        await limiter.acquire()
+
+        queued = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        assert limiter.queue_depth() == 1
+
+        limiter.release(0.01)
+        await queued
+        assert limiter.in_flight == 2
+        assert limiter.queue_depth() == 0
+
+    async def test_excess_requests_are_shed(self):
+        """Test that requests are shed when the queue is full or after the maximum wait."""
+        limiter = _limiter()
+        await limiter.acquire()
+        await limiter.acquire()
+
+        queued = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        with pytest.raises(Overloaded) as exc_info:
+            await limiter.acquire()
+        assert exc_info.value.reason == "queue_full"
+        assert exc_info.value.retry_after == 1
+
+        with pytest.raises(Overloaded, match="timeout"):
+            await queued
+        assert limiter.queue_depth() == 0
+        assert limiter.in_flight == 2
+
+    async def test_limit_adapts_to_latency(self):
+        """Test that requests slower than their usual latency lower the limit, and it recovers."""
+        limiter = _limiter(max_limit=10)
+        for _ in range(LONG_LATENCY_WINDOW):
+            await limiter.acquire()
+            limiter.release(0.01, "/employees")
+        assert limiter.limit == 10
+
+        async def keep_busy(latency: float) -> None:
+            for _ in range(SHORT_LATENCY_WINDOW * 2):
+                while limiter.in_flight < limiter.limit:
+                    await limiter.acquire()
+                limiter.release(latency, "/employees")
+
+        await keep_busy(0.05)
+        assert limiter.limit < 5
+
+        limit = limiter.limit
+        await keep_busy(0.01)
+        assert limiter.limit > limit
+
+    async def test_mixed_latencies_are_not_overload(self):
+        """Test that fast and slow routes, and requests of varying cost, keep the limit."""
+        limiter = _limiter(max_limit=10)
+        rng = random.Random(0)
+        for _ in range(3):
+            await limiter.acquire()
+        for _ in range(2000):
+            if rng.random() < 0.3:
+                limiter.release(0.001, "/employees/suggest")
+            else:
+                limiter.release(rng.choice((0.005,) * 7 + (0.03,) * 3), "/employees")
+            await limiter.acquire()
+            assert limiter.limit == 10
+
+    async def test_disabled_limiter_admits_everything(self):
+        """Test that a limit of 0 disables admission control."""
+        limiter = _limiter(max_limit=0, queue_size=0)
+        for _ in range(10):
+            await limiter.acquire()
+        assert limiter.in_flight == 0
@@ -0,0 +1,97 @@
+"""
+Unit tests for the filter bitmap index.
+"""
+
+from app.utils.bitmap_index import BitmapIndex
+
+
+def _employee(employee_id: int, department_id: int | None, status: str) -> dict:
+    return {
+        "id": employee_id,
+        "company_id": 1,
+        "department_id": department_id,
+        "location_id": 1,
+        "position_id": 1,
+        "status": status,
+    }
+
+
+def _index() -> BitmapIndex:
+    index = BitmapIndex(version=0)
+    index.build(
+        [
+            _employee(2, 1, "Active"),
+            _employee(4, 2, "Active"),
+            _employee(6, 1, "Terminated"),
+            _employee(8, None, "Active"),
+            _employee(10, 1, "Active"),
+        ]
+    )
+    return index
+
+
+def _ids(index: BitmapIndex, filters: dict) -> list[int]:
+    return index.page(index.match(filters), limit=100)
+
+
+class TestBitmapIndex:
+    """Test cases for BitmapIndex."""
+
+    def test_match_ors_values_and_ands_fields(self):
+        """Test that values of a field are ORed and fields ANDed, empty filters matching all."""
+        index = _index()
+
+        assert _ids(index, {}) == [2, 4, 6, 8, 10]
+        assert _ids(index, {"department_id": [1, 2], "status": []}) == [2, 4, 6, 10]
+        assert _ids(index, {"department_id": [1], "status": ["Active"]}) == [2, 10]
+        assert _ids(index, {"department_id": [99]}) == []
+        assert index.match({"status": ["Active"]}).bit_count() == 4
+
+    def test_page_selects_offset(self):
+        """Test that pages start at the match of rank `offset`."""
+        index = _index()
+        matches = index.match({"status": ["Active"]})
+
+        assert index.page(matches, limit=2) == [2, 4]
+        assert index.page(matches, limit=2, offset=2) == [8, 10]
+        assert index.page(matches, limit=2, offset=3) == [10]
+        assert index.page(matches, limit=2, offset=4) == []
+
+    def test_upsert_moves_employee_between_bitmaps(self):
+        """Test that an updated employee only matches its new values."""
+        index = _index()
+
+        index.upsert(_employee(6, 2, "Active"))
+
+        assert _ids(index, {"department_id": [1]}) == [2, 10]
+        assert _ids(index, {"department_id": [2], "status": ["Active"]}) == [4, 6]
+        assert _ids(index, {"status": ["Terminated"]}) == []
+        assert len(index) == 5
+
+    def test_upsert_keeps_id_order(self):
+        """Test that employees inserted before or after indexed ids are paged in id order."""
+        index = _index()
+
+        index.upsert(_employee(12, 1, "Active"))
+        index.upsert(_employee(5, 1, "Active"))
+        index.upsert(_employee(1, 2, "Terminated"))
+
+        assert _ids(index, {"department_id": [1]}) == [2, 5, 6, 10, 12]
+        assert _ids(index, {"status": ["Terminated"]}) == [1, 6]
+        assert index.page(index.match({}), limit=3, offset=2) == [4, 5, 6]
+        assert len(index) == 8
+
+    def test_remove_and_reinsert(self):
+        """Test that removed employees leave no match until they are inserted again."""
+        index = _index()
+
+        index.remove(4)
+        index.remove(99)  # Not indexed
+
+        assert _ids(index, {}) == [2, 6, 8, 10]
+        assert _ids(index, {"department_id": [2]}) == []
+        assert index.page(index.match({}), limit=2, offset=1) == [6, 8]
+        assert len(index) == 4
+
+        index.upsert(_employee(4, 1, "Active"))
+        assert _ids(index, {"department_id": [1], "status": ["Active"]}) == [2, 4, 10]
@@ -0,0 +1,125 @@
+"""
+Unit tests for the Server-Sent Events change hub.
+"""
+
+import asyncio
+
+import pytest
+
+from app.utils.change_hub import HEARTBEAT, INVALIDATE, ChangeHub, encode_event
+from app.utils.employee_changes import EmployeeChange
+
+COLUMNS = ("first_name", "department")
+RELATED_NAMES = {"department": {1: "Engineering"}}
+
+
+def _change(employee_id: int, organization_ids: set[int], **values) -> EmployeeChange:
+    row = {
+        "organization_id": 1,
+        "first_name": "John",
+        "department_id": 1,
+        "location_id": None,
+        "position_id": None,
+        **values,
+    }
+    return EmployeeChange(
+        employee_id=employee_id,
+        organization_ids=frozenset(organization_ids),
+        values=None if values.get("deleted") else row,
+    )
+
+
+@pytest.fixture
+def hub():
+    return ChangeHub(queue_size=2, heartbeat_seconds=60)
+
+
+async def _subscribe(
+    hub: ChangeHub, organization_id: int = 1, columns=COLUMNS, related_names=RELATED_NAMES
+):
+    events = hub.events(organization_id, columns, related_names)
+    assert await anext(events) == b"retry: 3000\n\n"
+    return events
+
+
+async def _next(events) -> bytes:
+    return await asyncio.wait_for(anext(events), timeout=1)
+
+
+class TestChangeHub:
+    """Test cases for ChangeHub."""
+
+    async def test_change_is_encoded_once_per_column_set(self, hub):
+        """Test that subscribers with the same columns share the same encoded event."""
+        first, second = await _subscribe(hub), await _subscribe(hub)
+        other_columns = await _subscribe(hub, columns=("first_name",))
+
+        hub.publish([_change(1, {1})])
+
+        frame = await _next(first)
+        assert frame == encode_event(
+            "upsert", {"id": 1, "first_name": "John", "department": "Engineering"}
+        )
+        assert await _next(second) is frame
+        assert await _next(other_columns) == encode_event("upsert", {"id": 1, "first_name": "John"})
+
+        for events in (first, second, other_columns):
+            await events.aclose()
+        assert hub.size() == 0
+
+    async def test_deletions_moves_and_unknown_names(self, hub):
+        """Test delete events for deleted and moved employees, change events for unknown names."""
+        events = await _subscribe(hub)
+        other_organization = await _subscribe(hub, organization_id=2)
+
+        hub.publish(
+            [
+                _change(1, {1}, deleted=True),
+                _change(2, {1, 2}, organization_id=2),
+                _change(3, {1}, department_id=9),
+            ]
+        )
+
+        assert await _next(events) == (
+            encode_event("delete", {"id": 1})
+            + encode_event("delete", {"id": 2})
+            + encode_event("change", {"id": 3})
+        )
+        assert await _next(other_organization) == encode_event(
+            "upsert", {"id": 2, "first_name": "John", "department": "Engineering"}
+        )
+        await events.aclose()
+        await other_organization.aclose()
+
+    async def test_slow_subscriber_is_invalidated(self, hub):
+        """Test that a full queue is replaced by a single invalidate event."""
+        events = await _subscribe(hub)
+        for employee_id in range(3):
+            hub.publish([_change(employee_id, {1})])
+
+        assert await _next(events) == INVALIDATE
+        hub.publish([_change(4, {1})])
+        assert b'"id":4' in await _next(events)
+        await events.aclose()
+
+    async def test_invalidate_organizations_changed_elsewhere(self, hub):
+        """Test that changes seen in the change log invalidate only their organizations."""
+        events = await _subscribe(hub)
+        other_organization = await _subscribe(hub, organization_id=2)
+
+        hub.invalidate({2})
+        hub.invalidate(None)
+
+        assert await _next(events) == INVALIDATE
+        assert await _next(other_organization) == INVALIDATE
+        assert await _next(other_organization) == INVALIDATE
+        await events.aclose()
+        await other_organization.aclose()
+
+    async def test_idle_subscribers_get_heartbeats(self):
+        """Test that one heartbeat task pings every subscriber."""
+        hub = ChangeHub(queue_size=2, heartbeat_seconds=0.01)
+        events = await _subscribe(hub)
+
+        assert await _next(events) == HEARTBEAT
+        await events.aclose()
@@ -0,0 +1,117 @@
+"""
+Unit tests for the employee change log and its follower.
+"""
+
+import pytest_asyncio
+from sqlalchemy import delete, insert, select, update
+
+from app.models import Employee, EmployeeChangeLog
+from app.utils.change_log import change_log_follower
+from app.utils.data_versions import data_versions
+
+
+@pytest_asyncio.fixture
+async def follower(db_session):
+    """Follow the change log from its current end."""
+    await change_log_follower.start(db_session)
+    await db_session.commit()
+    yield change_log_follower
+    change_log_follower.stop()
+
+
+async def _log_rows(db_session, since: int) -> list[tuple[int, int]]:
+    result = await db_session.execute(
+        select(EmployeeChangeLog.organization_id, EmployeeChangeLog.employee_id)
+        .filter(EmployeeChangeLog.seq > since)
+        .order_by(EmployeeChangeLog.seq)
+    )
+    return [tuple(row) for row in result.all()]
+
+
+class TestChangeLog:
+    """Test cases for the trigger-maintained employee_changes log."""
+
+    async def test_triggers_log_every_change(self, db_session, sample_employees, follower):
+        """Test that inserts, updates and deletes are logged, moves under both organizations."""
+        since = follower.last_seq
+
+        await db_session.execute(
+            insert(Employee).values(
+                id=5, organization_id=1, first_name="Joan", last_name="Baez", email="j@test.com"
+            )
+        )
+        await db_session.execute(update(Employee).filter(Employee.id == 1).values(phone="1"))
+        await db_session.execute(
+            update(Employee).filter(Employee.id == 2).values(organization_id=2)
+        )
+        await db_session.execute(delete(Employee).filter(Employee.id == 3))
+        await db_session.commit()
+
+        assert await _log_rows(db_session, since) == [(1, 5), (1, 1), (1, 2), (2, 2), (1, 3)]
+
+
+class TestChangeLogFollower:
+    """Test cases for ChangeLogFollower."""
+
+    async def test_poll_invalidates_organizations_changed_elsewhere(
+        self, db_session, sample_employees, follower
+    ):
+        """Test that changes only seen in the log bump the versions of their organizations."""
+        versions = (data_versions.get(1), data_versions.get(2))
+
+        # A Core statement bypasses the ORM, like a write from another process
+        await db_session.execute(
+            update(Employee).filter(Employee.id == 4).values(last_name="Walker")
+        )
+        await db_session.commit()
+        assert (data_versions.get(1), data_versions.get(2)) == versions
+
+        assert await follower.poll(db_session) == 1
+        assert (data_versions.get(1), data_versions.get(2)) == (versions[0], versions[1] + 1)
+        assert await follower.poll(db_session) == 0
+
+    async def test_own_changes_are_not_invalidated_twice(
+        self, db_session, sample_employees, follower
+    ):
+        """Test that log rows of this process' ORM commits are skipped by the next poll."""
+        version = data_versions.get(1)
+
+        sample_employees[0].last_name = "Dough"
+        await db_session.commit()
+        assert data_versions.get(1) == version + 1
+
+        assert await follower.poll(db_session) == 0
+        assert data_versions.get(1) == version + 1
+
+    async def test_own_commit_invalidates_changes_made_elsewhere_before_it(
+        self, db_session, sample_employees, follower
+    ):
+        """Test that log rows of other writers read by an ORM commit still bump versions."""
+        versions = (data_versions.get(1), data_versions.get(2))
+        await db_session.execute(
+            update(Employee).filter(Employee.id == 4).values(last_name="Walker")
+        )
+        await db_session.commit()
+
+        sample_employees[0].last_name = "Dough"
+        await db_session.commit()
+
+        assert (data_versions.get(1), data_versions.get(2)) == (versions[0] + 1, versions[1] + 1)
+        assert await follower.poll(db_session) == 0
+
+    async def test_pruned_changes_invalidate_every_organization(
+        self, db_session, sample_employees, follower
+    ):
+        """Test that a gap in the log, left by pruning, invalidates all organizations."""
+        versions = (data_versions.get(1), data_versions.get(2))
+        for last_name in ("Walker", "Wallace"):
+            await db_session.execute(
+                update(Employee).filter(Employee.id == 4).values(last_name=last_name)
+            )
+        await db_session.execute(
+            delete(EmployeeChangeLog).filter(EmployeeChangeLog.seq == follower.last_seq + 1)
+        )
+        await db_session.commit()
+
+        assert await follower.poll(db_session) == 1
+        assert (data_versions.get(1), data_versions.get(2)) == (versions[0] + 1, versions[1] + 1)
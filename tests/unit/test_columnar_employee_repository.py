@@ -0,0 +1,130 @@
+"""
+Unit tests for ColumnarEmployeeRepository.
+"""
+
+import pytest
+
+from app.models.employee import Employee
+from app.repositories.employee_repository import SORT_COLUMNS, EmployeeRepository
+from app.schemas.employee import EmployeeListQueryParams
+from app.services.employee_service import EmployeeService
+
+pytest.importorskip("numpy")
+
+from app.repositories.columnar_employee_repository import (  # noqa: E402
+    ColumnarEmployeeRepository,
+    employee_columns_cache,
+)
+
+QUERY_PARAMS = [
+    {},
+    {"department_id": [1]},
+    {"department_id": [1, 2], "location_id": [1]},
+    {"company_id": [1]},
+    {"status": ["Active", "Terminated"]},
+    {"status": ["Terminated"]},
+    {"search": "jo"},
+    {"search": "ZOË"},
+    {"search": "0003"},
+    {"search": "sm", "search_mode": "prefix"},
+    {"search": "555-0002", "search_mode": "prefix"},
+    {"limit": 1, "page": 2},
+    {"limit": 2, "page": 3},
+]
+
+
+@pytest.fixture(autouse=True)
+def clear_employee_columns():
+    """Drop snapshots of the previous test's employees, deleted without an ORM session."""
+    employee_columns_cache.clear()
+    yield
+    employee_columns_cache.clear()
+
+
+class TestColumnarEmployeeRepository:
+    """Test cases for ColumnarEmployeeRepository."""
+
+    @pytest.mark.parametrize("params", QUERY_PARAMS)
+    async def test_list_employee_matches_sql_repository(self, db_session, sample_employees, params):
+        """Test that the columnar engine returns the same page and total as SQL."""
+        sample_employees[1].first_name = "Zoë"
+        await db_session.commit()
+        query_params = EmployeeListQueryParams(**params)
+
+        sql_rows, sql_total = await EmployeeRepository(db_session).list_employee(
+            organization_id=1, query_params=query_params
+        )
+        rows, total = await ColumnarEmployeeRepository(db_session).list_employee(
+            organization_id=1, query_params=query_params
+        )
+
+        assert total == sql_total
+        assert [(row[0].id, row[0].first_name, row[0].status, *row[1:]) for row in rows] == [
+            (row[0].id, row[0].first_name, row[0].status, *row[1:]) for row in sql_rows
+        ]
+
+    async def test_keyset_pagination_and_reload(self, db_session, sample_employees):
+        """Test keyset pages, and that committed changes reload the snapshot."""
+        repo = ColumnarEmployeeRepository(db_session)
+        query_params = EmployeeListQueryParams(limit=1)
+
+        rows, total = await repo.list_employee(
+            organization_id=1, query_params=query_params, cursor=1
+        )
+        assert [row[0].id for row in rows] == [2]
+        assert total == 3
+
+        sample_employees[1].organization_id = 2
+        await db_session.commit()
+
+        rows, total = await repo.list_employee(
+            organization_id=1, query_params=query_params, cursor=1
+        )
+        assert [row[0].id for row in rows] == [3]
+        assert rows[0][0].department_id == 2
+        assert total == 2
+
+    @pytest.mark.parametrize("sort_dir", ["asc", "desc"])
+    @pytest.mark.parametrize("sort_by", list(SORT_COLUMNS))
+    async def test_cursors_match_sql_repository(
+        self, db_session, sample_employees, sort_by, sort_dir
+    ):
+        """Test that forward and backward cursors of every sort give the SQL pages."""
+        db_session.add(
+            Employee(
+                id=5,
+                organization_id=1,
+                first_name="Åsa",
+                last_name="Doe",
+                email="asa@test.com",
+                status="Terminated",
+            )
+        )
+        await db_session.commit()
+        query_params = EmployeeListQueryParams(sort_by=sort_by, sort_dir=sort_dir, limit=1)
+        sql_repo = EmployeeRepository(db_session)
+        repo = ColumnarEmployeeRepository(db_session)
+
+        sql_rows, _ = await sql_repo.list_employee(organization_id=1, query_params=query_params)
+        listed = []
+        while sql_rows:
+            listed.append(sql_rows[0][0].id)
+            cursor = EmployeeService._cursor(sql_rows[0][0], query_params)
+            sql_rows, _ = await sql_repo.list_employee(
+                organization_id=1, query_params=query_params, cursor=cursor
+            )
+            rows, _ = await repo.list_employee(
+                organization_id=1, query_params=query_params, cursor=cursor
+            )
+            assert [row[0].id for row in rows] == [row[0].id for row in sql_rows]
+
+            rows, _ = await repo.list_employee(
+                organization_id=1, query_params=query_params, before=cursor
+            )
+            assert [row[0].id for row in rows] == listed[-2:-1]
+        assert sorted(listed) == [1, 2, 3, 5]
+
+        for page in range(1, 6):
+            page_params = query_params.model_copy(update={"page": page})
+            rows, _ = await repo.list_employee(organization_id=1, query_params=page_params)
+            assert [row[0].id for row in rows] == listed[page - 1 : page]
@@ -0,0 +1,51 @@
+"""
+Unit tests for engine creation and the SQLite engine profile.
+"""
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from app.config import settings
+from app.database import create_db_engine
+
+
+async def _pragma(engine, name: str):
+    async with engine.connect() as conn:
+        return (await conn.exec_driver_sql(f"PRAGMA {name}")).scalar()
+
+
+class TestCreateDbEngine:
+    """Test cases for create_db_engine."""
+
+    async def test_sqlite_profile_applied_on_connect(self, tmp_path, monkeypatch):
+        """Test that every new connection gets the configured profile."""
+        monkeypatch.setattr(settings, "sqlite_cache_size", -1234)
+        engine = create_db_engine(f"sqlite+aiosqlite:///{tmp_path / 'profile.db'}")
+        try:
+            assert await _pragma(engine, "journal_mode") == "wal"
+            assert await _pragma(engine, "synchronous") == 1  # NORMAL
+            assert await _pragma(engine, "cache_size") == -1234
+            assert await _pragma(engine, "temp_store") == 2  # MEMORY
+            assert await _pragma(engine, "query_only") == 0
+            assert engine.pool.size() == settings.db_writer_pool_size
+        finally:
+            await engine.dispose()
+
+    async def test_read_only_engine(self, tmp_path):
+        """Test that read-only engines can read but never write."""
+        url = f"sqlite+aiosqlite:///{tmp_path / 'read_only.db'}"
+        writer = create_db_engine(url)
+        reader = create_db_engine(url, read_only=True)
+        try:
+            async with writer.begin() as conn:
+                await conn.exec_driver_sql("CREATE TABLE items (id INTEGER PRIMARY KEY)")
+                await conn.exec_driver_sql("INSERT INTO items (id) VALUES (1)")
+
+            async with reader.connect() as conn:
+                assert (await conn.exec_driver_sql("SELECT count(*) FROM items")).scalar() == 1
+                with pytest.raises(OperationalError, match="readonly"):
+                    await conn.exec_driver_sql("INSERT INTO items (id) VALUES (2)")
+            assert reader.pool.size() == settings.db_pool_size
+        finally:
+            await reader.dispose()
+            await writer.dispose()
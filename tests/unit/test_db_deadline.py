@@ -0,0 +1,125 @@
+"""
+Unit tests for per-request database deadlines.
+"""
+
+import asyncio
+import sqlite3
+from time import perf_counter
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from app.database import create_db_engine
+from app.middleware.db_deadline import DbDeadlineMiddleware
+from app.utils.db_deadline import (
+    DbDeadline,
+    SharedDbDeadline,
+    get_db_deadline,
+    is_interrupted,
+    start_db_deadline,
+    stop_db_deadline,
+)
+
+# Counts to 100 million, for seconds
+SLOW_STATEMENT = (
+    "WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n WHERE x < 100000000) "
+    "SELECT count(*) FROM n"
+)
+
+
+@pytest.fixture
+async def engine(tmp_path):
+    engine = create_db_engine(f"sqlite+aiosqlite:///{tmp_path / 'deadline.db'}", read_only=True)
+    yield engine
+    await engine.dispose()
+
+
+async def _run_asgi(app, messages: list[dict]) -> list[dict]:
+    received = iter(messages)
+    sent = []
+
+    async def receive():
+        return next(received, {"type": "http.disconnect"})
+
+    async def send(message):
+        sent.append(message)
+
+    await app({"type": "http", "method": "GET", "path": "/"}, receive, send)
+    return sent
+
+
+def _interrupted() -> OperationalError:
+    return OperationalError("SELECT 1", {}, sqlite3.OperationalError("interrupted"))
+
+
+class TestDbDeadline:
+    """Test cases for statement deadlines."""
+
+    async def test_statement_interrupted_past_deadline(self, engine):
+        """Test that a statement running past the deadline fails, and frees its connection."""
+        _, token = start_db_deadline(0.05)
+        try:
+            started = perf_counter()
+            with pytest.raises(OperationalError) as exc_info:
+                async with engine.connect() as conn:
+                    await conn.exec_driver_sql(SLOW_STATEMENT)
+        finally:
+            stop_db_deadline(token)
+
+        assert is_interrupted(exc_info.value)
+        assert perf_counter() - started < 1
+        async with engine.connect() as conn:
+            assert (await conn.exec_driver_sql("SELECT 1")).scalar() == 1
+
+    async def test_cancel_interrupts_running_statement(self, engine):
+        """Test that cancelling a deadline interrupts its statement right away."""
+
+        async def run_slow_statement():
+            async with engine.connect() as conn:
+                await conn.exec_driver_sql(SLOW_STATEMENT)
+
+        deadline, token = start_db_deadline(0)
+        try:
+            statement = asyncio.create_task(run_slow_statement())
+            await asyncio.sleep(0.05)
+            deadline.cancel()
+            with pytest.raises(OperationalError, match="interrupted"):
+                await asyncio.wait_for(statement, timeout=1)
+        finally:
+            stop_db_deadline(token)
+
+    def test_shared_deadline_cancelled_with_every_request(self):
+        """Test that a shared computation is interrupted once all its requests are cancelled."""
+        shared = SharedDbDeadline()
+        first, second = DbDeadline(), DbDeadline()
+        shared.join(first)
+        without_deadline = shared.join(None)
+        shared.join(second)
+
+        first.cancel()
+        assert not shared.interrupted()
+        shared.leave(without_deadline)
+        assert not shared.interrupted()
+        second.cancel()
+        assert shared.interrupted()
+
+    async def test_middleware_responds_504_past_deadline(self):
+        """Test that an interrupted statement fails the request with 504."""
+
+        async def app(scope, receive, send):
+            raise _interrupted()
+
+        sent = await _run_asgi(DbDeadlineMiddleware(app), [{"type": "http.request"}])
+        assert sent[0]["status"] == 504
+
+    async def test_middleware_cancels_deadline_on_disconnect(self):
+        """Test that a disconnect cancels the request's deadline, and the request gets 503."""
+
+        async def app(scope, receive, send):
+            deadline = get_db_deadline()
+            while not deadline.cancelled:
+                await asyncio.sleep(0)
+            raise _interrupted()
+
+        sent = await _run_asgi(DbDeadlineMiddleware(app), [])
+        assert sent[0]["status"] == 503
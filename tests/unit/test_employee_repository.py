@@ -2,10 +2,37 @@
 Unit tests for EmployeeRepository.
 """
 
-from app.repositories.employee_repository import EmployeeRepository
+from sqlalchemy import event, insert, select, text
+
+from app.config import settings
+from app.models import Employee, EmployeeChangeLog
+from app.repositories.employee_repository import SORT_COLUMNS, EmployeeRepository, EstimatedCount
 from app.schemas.employee import EmployeeListQueryParams
 
 
+async def _add_sort_employees(db_session) -> None:
+    """Add employees whose names, departments (some NULL) and statuses tie and differ."""
+    db_session.add_all(
+        [
+            Employee(
+                id=id_,
+                organization_id=1,
+                first_name=first_name,
+                last_name=last_name,
+                email=f"{first_name.lower()}@test.com",
+                department_id=department_id,
+                status=status,
+            )
+            for id_, first_name, last_name, department_id, status in (
+                (5, "Zoë", "doe", None, "Terminated"),
+                (6, "Ann", "Élan", 2, "Not Started"),
+                (7, "Eve", "Doe", None, "Active"),
+            )
+        ]
+    )
+    await db_session.commit()
+
+
 class TestEmployeeRepository:
     """Test cases for EmployeeRepository."""
 
@@ -68,4 +95,347 @@ class TestEmployeeRepository:
         assert any("john" in (e.first_name + e.last_name).lower() for e in employees)
         assert total_count == 2
 
+    async def test_list_employee_concurrent_count(self, db_session, sample_employees, monkeypatch):
+        """Test that the concurrent count mode returns the same results as sequential mode."""
+        repo = EmployeeRepository(db_session)
+        query_params = EmployeeListQueryParams(search="j", limit=2)
+
+        sequential_rows, sequential_count = await repo.list_employee(
+            organization_id=1, query_params=query_params
+        )
+        monkeypatch.setattr(settings, "concurrent_count_query", True)
+        concurrent_rows, concurrent_count = await repo.list_employee(
+            organization_id=1, query_params=query_params
+        )
+
+        assert concurrent_count == sequential_count == 3
+        assert [row[0].id for row in concurrent_rows] == [row[0].id for row in sequential_rows]
+
+    async def test_capped_counts_report_cap_or_estimate(
+        self, db_session, sample_employees, monkeypatch
+    ):
+        """Test that scanning counts stop past the cap, reporting the cap or an estimate."""
+        await _add_sort_employees(db_session)
+        repo = EmployeeRepository(db_session)
+        query_params = EmployeeListQueryParams(limit=2, page=3)
+        monkeypatch.setattr(settings, "count_from_summary", False)
+
+        monkeypatch.setattr(settings, "list_count_cap", 6)
+        _, total_count = await repo.list_employee(1, query_params)
+        assert total_count == 6
+        assert not isinstance(total_count, EstimatedCount)
+
+        monkeypatch.setattr(settings, "list_count_cap", 2)
+        rows, total_count = await repo.list_employee(1, query_params)
+        # The capped total doesn't locate the last page, it is read forward
+        assert [row[0].id for row in rows] == [6, 7]
+        assert total_count == 2
+        assert isinstance(total_count, EstimatedCount)
+
+        # All 6 employees are sampled, 3 of them match
+        monkeypatch.setattr(settings, "list_count_estimate", True)
+        _, total_count = await repo.list_employee(1, EmployeeListQueryParams(search="doe"))
+        assert total_count == 3
+        assert isinstance(total_count, EstimatedCount)
+
+    async def test_list_employee_padded_in_list(self, db_session, sample_employees):
+        """Test that padding filter lists shares statements without changing results."""
+        repo = EmployeeRepository(db_session)
+
+        statements = set()
+
+        def record_statement(conn, cursor, statement, *args):
+            statements.add(statement)
+
+        event.listen(db_session.bind.sync_engine, "before_cursor_execute", record_statement)
+        try:
+            for department_ids in ([1, 2, 3], [1, 2, 3, 4]):
+                rows, total_count = await repo.list_employee(
+                    organization_id=1,
+                    query_params=EmployeeListQueryParams(department_id=department_ids),
+                )
+                assert total_count == 3
+                assert len(rows) == 3
+        finally:
+            event.remove(db_session.bind.sync_engine, "before_cursor_execute", record_statement)
+
+        # Lists of 3 and 4 ids are both padded to 4: one count and one page statement
+        assert len(statements) == 2
+
+    async def test_facet_counts_leave_out_own_filter(self, db_session, sample_employees):
+        """Test that each facet is counted with every filter except its own."""
+        repo = EmployeeRepository(db_session)
+
+        rows = await repo.facet_counts(
+            organization_id=1,
+            query_params=EmployeeListQueryParams(department_id=[1], location_id=[1]),
+        )
+        counts = {(facet, value): (label, count) for facet, value, label, count in rows}
+
+        # Departments are filtered by location 1 only: John (Engineering) and Bob (Sales)
+        assert counts[("department", 1)] == ("Engineering", 1)
+        assert counts[("department", 2)] == ("Sales", 1)
+        # Locations are filtered by department 1 only: John (New York), Jane (San Francisco)
+        assert counts[("location", 1)] == ("New York", 1)
+        assert counts[("location", 2)] == ("San Francisco", 1)
+        # Positions and statuses are filtered by both: John only
+        assert counts[("position", 1)] == ("Software Engineer", 1)
+        assert counts[("status", "Active")] == ("Active", 1)
+        assert len(rows) == 6
+
+    async def test_counts_from_summary_match_employee_rows(
+        self, db_session, sample_employees, monkeypatch
+    ):
+        """Test that counts and facets from employee_counts equal counting employee rows."""
+        repo = EmployeeRepository(db_session)
+
+        # Keep the summary up to date through updates and deletes, and count NULL ids
+        sample_employees[0].status = "Terminated"
+        sample_employees[1].location_id = None
+        await db_session.delete(sample_employees[2])
+        await db_session.commit()
+
+        statements = []
+
+        def record_statement(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        for params in (
+            {},
+            {"status": ["Active"]},
+            {"department_id": [1], "location_id": [1, 2]},
+            {"department_id": [1, 2], "status": ["Active", "Terminated"]},
+        ):
+            query_params = EmployeeListQueryParams(**params)
+            monkeypatch.setattr(settings, "count_from_summary", True)
+            event.listen(db_session.bind.sync_engine, "before_cursor_execute", record_statement)
+            try:
+                _, summary_count = await repo.list_employee(1, query_params)
+                summary_facets = await repo.facet_counts(1, query_params)
+            finally:
+                event.remove(db_session.bind.sync_engine, "before_cursor_execute", record_statement)
+            monkeypatch.setattr(settings, "count_from_summary", False)
+            _, scan_count = await repo.list_employee(1, query_params)
+            scan_facets = await repo.facet_counts(1, query_params)
+
+            assert summary_count == scan_count
+            assert sorted(summary_facets, key=str) == sorted(scan_facets, key=str)
+
+        assert sum("FROM employee_counts" in statement for statement in statements) == 8
+
+    async def test_list_employee_prefix_search(self, db_session, sample_employees):
+        """Test that prefix search matches the start of names, email and phone digits."""
+        repo = EmployeeRepository(db_session)
+
+        async def prefix_search(term: str) -> list[str]:
+            rows, _ = await repo.list_employee(
+                organization_id=1,
+                query_params=EmployeeListQueryParams(search=term, search_mode="prefix"),
+            )
+            return [row[0].first_name for row in rows]
+
+        assert await prefix_search("JA") == ["Jane"]
+        assert await prefix_search("do") == ["John"]  # Last name
+        assert await prefix_search("bob@") == ["Bob"]  # Email
+        assert await prefix_search("ohn") == []  # Not a prefix
+
+    async def test_search_ignores_accents(self, db_session, sample_employees):
+        """Test that search matches names with accents in both modes."""
+        sample_employees[1].first_name = "Zoë"
+        sample_employees[1].phone = "+1 (555) 010-2030"
+        await db_session.commit()
+        repo = EmployeeRepository(db_session)
+
+        for search, search_mode in (("ZOE", "prefix"), ("zoë", "prefix"), ("ZOË", "contains")):
+            rows, total_count = await repo.list_employee(
+                organization_id=1,
+                query_params=EmployeeListQueryParams(search=search, search_mode=search_mode),
+            )
+            assert [row[0].first_name for row in rows] == ["Zoë"]
+
+        rows, _ = await repo.list_employee(
+            organization_id=1,
+            query_params=EmployeeListQueryParams(search="1-555-0102", search_mode="prefix"),
+        )
+        assert [row[0].first_name for row in rows] == ["Zoë"]
+
+    async def test_search_columns_synced_for_writes_outside_the_orm(
+        self, db_session, sample_employees
+    ):
+        """
+        Test that Core inserts and raw SQL updates, on connections without any function
+        registered by the application, get searchable without extra change logs.
+        """
+        await db_session.execute(
+            insert(Employee).values(
+                id=5, organization_id=1, first_name="Zoë", last_name="ΣΩΚΡΆΤΗΣ", email="Z@test.com"
+            )
+        )
+        await db_session.execute(
+            text("UPDATE employees SET first_name = 'Åsa', phone = '+46 70-123' WHERE id = 1")
+        )
+        await db_session.commit()
+
+        result = await db_session.execute(
+            select(
+                Employee.first_name_search,
+                Employee.last_name_search,
+                Employee.email_search,
+                Employee.phone_digits,
+            )
+            .filter(Employee.id.in_([1, 5]))
+            .order_by(Employee.id)
+        )
+        assert [tuple(row) for row in result] == [
+            ("asa", "doe", "john@test.com", "4670123"),
+            ("zoe", "σωκρατησ", "z@test.com", None),
+        ]
+        repo = EmployeeRepository(db_session)
+
+        for search, expected_id in (("zoe", 5), ("z@test", 5), ("asa", 1), ("4670", 1)):
+            rows, _ = await repo.list_employee(
+                organization_id=1,
+                query_params=EmployeeListQueryParams(search=search, search_mode="prefix"),
+            )
+            assert [row[0].id for row in rows] == [expected_id]
+
+        logged = await db_session.execute(
+            select(EmployeeChangeLog.employee_id).order_by(EmployeeChangeLog.seq.desc()).limit(2)
+        )
+        assert logged.scalars().all() == [1, 5]
+
+    async def test_related_names_of_the_organization_only(self, db_session, sample_employees):
+        """Test that only the names referenced by the organization's employees are loaded."""
+        names = await EmployeeRepository(db_session).list_related_names(organization_id=1)
+
+        assert names == {
+            "department": {1: "Engineering", 2: "Sales"},
+            "location": {1: "New York", 2: "San Francisco"},
+            "position": {1: "Software Engineer", 2: "Senior Engineer", 3: "Sales Manager"},
+        }
+
+    async def test_sorted_pages_follow_composite_cursors(self, db_session, sample_employees):
+        """Test that keyset pages of every sort cover the list in order, NULL keys included."""
+        await _add_sort_employees(db_session)
+        repo = EmployeeRepository(db_session)
+
+        for sort_by in SORT_COLUMNS:
+            for sort_dir in ("asc", "desc"):
+                query_params = EmployeeListQueryParams(sort_by=sort_by, sort_dir=sort_dir, limit=2)
+                rows, total_count = await repo.list_employee(1, query_params)
+                listed = [row[0] for row in rows]
+                while len(rows) == query_params.limit:
+                    last = rows[-1][0]
+                    cursor = last.id
+                    if sort_by != "id":
+                        cursor = (getattr(last, SORT_COLUMNS[sort_by].key), last.id)
+                    rows, _ = await repo.list_employee(1, query_params, cursor=cursor)
+                    listed.extend(row[0] for row in rows)
+
+                # SQLite sorts NULLs first
+                def key(employee, attribute=SORT_COLUMNS[sort_by].key):
+                    value = getattr(employee, attribute)
+                    return (value is not None, value or 0, employee.id)
+
+                expected = sorted(listed, key=key, reverse=sort_dir == "desc")
+                assert total_count == len(listed) == 6
+                assert [e.id for e in listed] == [e.id for e in expected], (sort_by, sort_dir)
+
+    async def test_deep_sorted_pages_are_index_seeks(self, db_session, sample_employees):
+        """Test that pages after a cursor seek the sort key's index instead of sorting."""
+        statements = []
+
+        def record_statement(conn, cursor, statement, parameters, *args):
+            if statement.lstrip().startswith("SELECT employees."):
+                statements.append((statement, parameters))
+
+        repo = EmployeeRepository(db_session)
+        event.listen(db_session.bind.sync_engine, "before_cursor_execute", record_statement)
+        try:
+            for sort_by, sort_dir, cursor in (
+                ("last_name", "asc", ("doe", 1)),
+                ("first_name", "desc", ("john", 1)),
+                ("status", "asc", ("Active", 2)),
+                ("department", "desc", (2, 3)),
+            ):
+                query_params = EmployeeListQueryParams(sort_by=sort_by, sort_dir=sort_dir, page=50)
+                await repo.list_employee(1, query_params, cursor=cursor)
+        finally:
+            event.remove(db_session.bind.sync_engine, "before_cursor_execute", record_statement)
+
+        # Short descending pages of nullable keys continue with the NULL keys
+        assert len(statements) == 6
+        connection = await db_session.connection()
+        for statement, parameters in statements:
+            result = await connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            plan = " ".join(row[3] for row in result.all())
+            assert "SEARCH employees USING INDEX ix_employees_org_" in plan, plan
+            assert "(organization_id=? AND " in plan, plan
+            assert "TEMP B-TREE" not in plan, plan
+            assert parameters[-1] == 0  # OFFSET
+
+    async def test_backward_and_last_pages_match_forward_pages(self, db_session, sample_employees):
+        """Test that pages sought backward or from the end equal the pages read forward."""
+        await _add_sort_employees(db_session)
+        repo = EmployeeRepository(db_session)
+
+        for sort_by, sort_dir in (("id", "asc"), ("last_name", "desc"), ("department", "asc")):
+
+            def params(page: int, sort_by=sort_by, sort_dir=sort_dir) -> EmployeeListQueryParams:
+                return EmployeeListQueryParams(
+                    sort_by=sort_by, sort_dir=sort_dir, limit=4, page=page
+                )
+
+            def cursor(employee, sort_by=sort_by):
+                if sort_by == "id":
+                    return employee.id
+                return (getattr(employee, SORT_COLUMNS[sort_by].key), employee.id)
+
+            rows, _ = await repo.list_employee(
+                1, EmployeeListQueryParams(sort_by=sort_by, sort_dir=sort_dir, limit=6)
+            )
+            ids = [row[0].id for row in rows]
+
+            # The last page of 2 employees, from the end
+            rows, total_count = await repo.list_employee(1, params(2))
+            assert [row[0].id for row in rows] == ids[4:], (sort_by, sort_dir)
+            assert total_count == 6
+
+            # The page before it, sought backward from its first employee
+            rows, _ = await repo.list_employee(1, params(1), before=cursor(rows[0][0]))
+            assert [row[0].id for row in rows] == ids[:4], (sort_by, sort_dir)
+
+            rows, _ = await repo.list_employee(1, params(3))
+            assert rows == []
+
+    async def test_last_and_previous_pages_are_index_seeks(self, db_session, sample_employees):
+        """Test that the last page and pages sought backward read the index in reverse."""
+        statements = []
+
+        def record_statement(conn, cursor, statement, parameters, *args):
+            if statement.lstrip().startswith("SELECT employees."):
+                statements.append((statement, parameters))
+
+        repo = EmployeeRepository(db_session)
+        event.listen(db_session.bind.sync_engine, "before_cursor_execute", record_statement)
+        try:
+            # Last page of 3 employees: 1 row past the 2 of page 1
+            await repo.list_employee(
+                1, EmployeeListQueryParams(sort_by="last_name", limit=2, page=2)
+            )
+            await repo.list_employee(1, EmployeeListQueryParams(limit=2, page=1), before=3)
+        finally:
+            event.remove(db_session.bind.sync_engine, "before_cursor_execute", record_statement)
+
+        assert len(statements) == 2
+        assert "ORDER BY employees.last_name_search DESC, employees.id DESC" in statements[0][0]
+        assert statements[0][1][-2:] == (1, 0)  # LIMIT, OFFSET
+        assert "ORDER BY employees.id DESC" in statements[1][0]
+        connection = await db_session.connection()
+        for statement, parameters in statements:
+            result = await connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            plan = " ".join(row[3] for row in result.all())
+            assert "SEARCH employees USING " in plan, plan
+            assert "TEMP B-TREE" not in plan, plan
+
     # TODO: Add more tests for other filters like status, position, pagination, etc.
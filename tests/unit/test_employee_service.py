@@ -2,6 +2,7 @@
 Unit tests for EmployeeService.
 """
 
+from app.config import settings
 from app.services.employee_service import EmployeeService
 
 
@@ -132,4 +133,418 @@ class TestEmployeeService:
                 assert "@test.com" in emp["email"]
                 assert "@another.com" not in emp["email"]
 
+    async def test_identical_concurrent_calls_are_coalesced(
+        self, db_session, sample_employees, sample_organizations
+    ):
+        """Test that identical concurrent list calls share one computation."""
+        import asyncio
+
+        from app.schemas.employee import EmployeeListQueryParams
+        from app.utils.metrics import single_flight_calls_total
+
+        leaders_before = single_flight_calls_total.value(flight="list_employee", role="leader")
+        service = EmployeeService(db_session)
+
+        responses = await asyncio.gather(
+            *(
+                service.list_employee(
+                    organization_id=1, query_params=EmployeeListQueryParams(search="j")
+                )
+                for _ in range(5)
+            )
+        )
+
+        leaders = single_flight_calls_total.value(flight="list_employee", role="leader")
+        assert leaders - leaders_before == 1
+        assert all(response == responses[0] for response in responses)
+        assert responses[0].total_records == 3
+
+    async def test_facet_counts_cached_until_employees_change(
+        self, db_session, sample_employees, sample_organizations
+    ):
+        """Test that facet counts are served from cache until the organization's data changes."""
+        from app.schemas.employee import EmployeeListQueryParams
+        from app.utils.query_stats import start_query_stats, stop_query_stats
+
+        service = EmployeeService(db_session)
+        query_params = EmployeeListQueryParams(status=["Active"])
+
+        response = await service.facet_counts(organization_id=1, query_params=query_params)
+        assert {f.value: f.count for f in response.facets["department"]} == {1: 2, 2: 1}
+
+        stats, token = start_query_stats()
+        try:
+            cached = await service.facet_counts(
+                organization_id=1, query_params=EmployeeListQueryParams(status=["Active"], page=2)
+            )
+        finally:
+            stop_query_stats(token)
+        assert cached == response
+        assert stats.count == 0
+
+        # Moving Bob to Engineering bumps organization 1's data version
+        sample_employees[2].department_id = 1
+        await db_session.commit()
+
+        response = await service.facet_counts(organization_id=1, query_params=query_params)
+        assert {f.value: f.count for f in response.facets["department"]} == {1: 3}
+
+    async def test_longer_search_term_refined_in_memory(
+        self, db_session, sample_employees, sample_organizations
+    ):
+        """Test that a term extending a recent one only reads the page from the database."""
+        from app.schemas.employee import EmployeeListQueryParams
+        from app.utils.query_stats import start_query_stats, stop_query_stats
+
+        service = EmployeeService(db_session)
+
+        response = await service.list_employee(
+            organization_id=1, query_params=EmployeeListQueryParams(search="jo")
+        )
+        assert [e["id"] for e in response.employees] == [1, 3]
+
+        stats, token = start_query_stats()
+        try:
+            response = await service.list_employee(
+                organization_id=1, query_params=EmployeeListQueryParams(search="Johns")
+            )
+        finally:
+            stop_query_stats(token)
+        assert stats.count == 2  # organization + page
+        assert [e["id"] for e in response.employees] == [3]
+        assert response.total_records == 1
+
+        # Renaming John bumps organization 1's data version, recent matches are dropped
+        sample_employees[0].last_name = "Johnson"
+        await db_session.commit()
+
+        response = await service.list_employee(
+            organization_id=1, query_params=EmployeeListQueryParams(search="johns", limit=1)
+        )
+        assert [e["id"] for e in response.employees] == [1]
+        assert response.total_records == 2
+        assert response.total_pages == 2
+
+    async def test_heavy_query_pages_sliced_from_cached_ids(
+        self, db_session, sample_employees, sample_organizations, monkeypatch
+    ):
+        """Test that pages of a position filtered list are read by id without counting."""
+        from app.schemas.employee import EmployeeListQueryParams
+        from app.utils.query_stats import start_query_stats, stop_query_stats
+
+        monkeypatch.setattr(settings, "bitmap_index_max_organizations", 0)
+        service = EmployeeService(db_session)
+
+        response = await service.list_employee(
+            organization_id=1, query_params=EmployeeListQueryParams(position_id=[1, 3], limit=1)
+        )
+        assert [e["id"] for e in response.employees] == [1]
+        assert response.total_records == 2
+
+        stats, token = start_query_stats()
+        try:
+            response = await service.list_employee(
+                organization_id=1,
+                query_params=EmployeeListQueryParams(position_id=[1, 3], limit=1, page=2),
+            )
+        finally:
+            stop_query_stats(token)
+        assert stats.count == 2  # organization + page
+        assert [e["id"] for e in response.employees] == [3]
+        assert response.total_pages == 2
+
+        # Moving Jane to position 1 bumps organization 1's data version, the ids are re-read
+        sample_employees[1].position_id = 1
+        await db_session.commit()
+
+        response = await service.list_employee(
+            organization_id=1,
+            query_params=EmployeeListQueryParams(position_id=[1, 3], limit=1, page=2),
+        )
+        assert [e["id"] for e in response.employees] == [2]
+        assert response.total_records == 3
+
+    async def test_capped_totals_flagged_as_estimates(
+        self, db_session, sample_employees, sample_organizations, monkeypatch
+    ):
+        """Test that totals of scanning counts stopped at the cap are flagged as estimates."""
+        from app.schemas.employee import EmployeeListQueryParams
+
+        monkeypatch.setattr(settings, "bitmap_index_max_organizations", 0)
+        monkeypatch.setattr(settings, "result_set_cache_bytes", 0)
+        monkeypatch.setattr(settings, "list_count_cap", 1)
+        service = EmployeeService(db_session)
+
+        response = await service.list_employee(
+            organization_id=1, query_params=EmployeeListQueryParams(position_id=[1, 3], limit=1)
+        )
+        assert [e["id"] for e in response.employees] == [1]
+        assert response.total_records == 1
+        assert response.total_is_estimate
+
+        # Counted from employee_counts, however many match
+        response = await service.list_employee(
+            organization_id=1, query_params=EmployeeListQueryParams(limit=1)
+        )
+        assert response.total_records == 3
+        assert not response.total_is_estimate
+
+    async def test_result_sets_past_cap_counted_in_database(
+        self, db_session, sample_employees, sample_organizations, monkeypatch
+    ):
+        """Test that requests matching more ids than the count cap get the capped total."""
+        from app.schemas.employee import EmployeeListQueryParams
+        from app.services.employee_service import result_set_cache
+
+        monkeypatch.setattr(settings, "bitmap_index_max_organizations", 0)
+        monkeypatch.setattr(settings, "list_count_cap", 1)
+        result_set_cache.clear()
+        service = EmployeeService(db_session)
+        query_params = EmployeeListQueryParams(position_id=[1, 3], limit=1)
+
+        # The second request finds the cached ids exceeding the cap
+        for _ in range(2):
+            response = await service.list_employee(organization_id=1, query_params=query_params)
+            assert [e["id"] for e in response.employees] == [1]
+            assert response.total_records == 1
+            assert response.total_is_estimate
+
+        monkeypatch.setattr(settings, "list_count_cap", 10)
+        response = await service.list_employee(organization_id=1, query_params=query_params)
+        assert response.total_records == 2
+        assert not response.total_is_estimate
+
+    async def test_suggest_index_updated_by_committed_changes(
+        self, db_session, sample_employees, sample_organizations
+    ):
+        """Test that suggestions follow employee changes without rebuilding the index."""
+        from app.models import Employee
+        from app.utils.query_stats import start_query_stats, stop_query_stats
+
+        service = EmployeeService(db_session)
+
+        response = await service.suggest(organization_id=1, prefix="jo", limit=10)
+        assert [s["id"] for s in response.suggestions] == [1, 3]  # john, johnson
+        assert response.suggestions[0] == {
+            "id": 1,
+            "first_name": "John",
+            "last_name": "Doe",
+            "email": "john@test.com",
+        }
+
+        sample_employees[1].first_name = "Zoë"
+        await db_session.delete(sample_employees[2])
+        db_session.add(
+            Employee(
+                id=5, organization_id=1, first_name="Joan", last_name="Baez", email="joan@test.com"
+            )
+        )
+        await db_session.commit()
+
+        stats, token = start_query_stats()
+        try:
+            response = await service.suggest(organization_id=1, prefix="JO", limit=10)
+            accented = await service.suggest(organization_id=1, prefix="zoe", limit=10)
+        finally:
+            stop_query_stats(token)
+        assert stats.count == 0
+        assert [s["id"] for s in response.suggestions] == [5, 1]
+        assert [s["id"] for s in accented.suggestions] == [2]
+
+    async def test_bitmap_index_updated_by_committed_changes(
+        self, db_session, sample_employees, sample_organizations
+    ):
+        """Test that unsearched lists follow employee changes without rebuilding bitmaps."""
+        from app.models import Employee
+        from app.schemas.employee import EmployeeListQueryParams
+        from app.utils.query_stats import start_query_stats, stop_query_stats
+
+        service = EmployeeService(db_session)
+        query_params = EmployeeListQueryParams(department_id=[1], limit=1, page=2)
+
+        response = await service.list_employee(organization_id=1, query_params=query_params)
+        assert [e["id"] for e in response.employees] == [2]
+        assert response.total_records == 2
+
+        sample_employees[2].department_id = 1
+        await db_session.delete(sample_employees[1])
+        db_session.add(
+            Employee(
+                id=5,
+                organization_id=1,
+                first_name="Joan",
+                last_name="Baez",
+                email="joan@test.com",
+                department_id=1,
+            )
+        )
+        await db_session.commit()
+
+        stats, token = start_query_stats()
+        try:
+            response = await service.list_employee(organization_id=1, query_params=query_params)
+        finally:
+            stop_query_stats(token)
+        assert stats.count == 2  # organization + page
+        assert [e["id"] for e in response.employees] == [3]
+        assert response.total_records == 3
+
+    async def test_changes_report_moves_as_deletions(
+        self, db_session, sample_employees, sample_organizations, monkeypatch
+    ):
+        """Test that an employee moved to another organization is deleted from the old one."""
+        from datetime import UTC, datetime
+
+        from app.schemas.employee import EmployeeChangesQueryParams
+
+        monkeypatch.setattr(settings, "changes_settle_seconds", 0)
+        service = EmployeeService(db_session)
+        query_params = EmployeeChangesQueryParams(changed_since=datetime.now(UTC))
+
+        sample_employees[0].organization_id = 2
+        await db_session.commit()
+
+        moved_out = await service.list_changes(organization_id=1, query_params=query_params)
+        moved_in = await service.list_changes(organization_id=2, query_params=query_params)
+
+        assert moved_out.employees == []
+        assert moved_out.deleted_ids == [1]
+        assert [e["id"] for e in moved_in.employees] == [1]
+        assert moved_in.deleted_ids == []
+
+        # Changes younger than the settle delay are held back
+        monkeypatch.setattr(settings, "changes_settle_seconds", 60)
+        held_back = await service.list_changes(organization_id=2, query_params=query_params)
+        assert held_back.employees == []
+        assert held_back.next_changed_since == query_params.changed_since
+
     # TODO: Add more tests for pagination, some search edge cases, etc.
+
+    async def test_stream_changes_pushes_committed_changes(
+        self, db_session, sample_employees, sample_organizations
+    ):
+        """Test that a committed change is streamed with the organization's display columns."""
+        import asyncio
+
+        service = EmployeeService(db_session)
+        events = await service.stream_changes(organization_id=1)
+        try:
+            assert await anext(events) == b"retry: 3000\n\n"
+
+            sample_employees[0].last_name = "Dough"
+            await db_session.commit()
+
+            frame = await asyncio.wait_for(anext(events), timeout=1)
+            assert frame.startswith(b"event: upsert\n")
+            assert b'"last_name":"Dough"' in frame
+            assert b'"department":"Engineering"' in frame
+            assert b'"phone"' not in frame
+        finally:
+            await events.aclose()
+
+        assert await service.stream_changes(organization_id=999) is None
+
+    async def test_stream_related_names_cached_until_employees_change(
+        self, db_session, sample_employees, sample_organizations, monkeypatch
+    ):
+        """Test that subscribers share the organization's names until its employees change."""
+        import asyncio
+
+        from app.models import Department
+        from app.repositories.employee_repository import EmployeeRepository
+
+        loads = []
+        list_related_names = EmployeeRepository.list_related_names
+
+        async def counting_list_related_names(repo, organization_id):
+            loads.append(organization_id)
+            return await list_related_names(repo, organization_id)
+
+        monkeypatch.setattr(EmployeeRepository, "list_related_names", counting_list_related_names)
+        service = EmployeeService(db_session)
+
+        for _ in range(2):
+            events = await service.stream_changes(organization_id=1)
+            await events.aclose()
+        assert loads == [1]
+
+        db_session.add(Department(id=4, name="Research"))
+        sample_employees[0].department_id = 4
+        await db_session.commit()
+
+        events = await service.stream_changes(organization_id=1)
+        try:
+            assert await anext(events) == b"retry: 3000\n\n"
+            assert loads == [1, 1]
+
+            sample_employees[0].last_name = "Dough"
+            await db_session.commit()
+            frame = await asyncio.wait_for(anext(events), timeout=1)
+            assert b'"department":"Research"' in frame
+        finally:
+            await events.aclose()
+
+    async def test_sorted_pages_continue_from_cached_cursors(
+        self, db_session, sample_employees, sample_organizations
+    ):
+        """Test that the pages of a sorted list follow each other through cached cursors."""
+        from sqlalchemy import event
+
+        from app.schemas.employee import EmployeeListQueryParams
+
+        offsets = []
+
+        def record_offset(conn, cursor, statement, parameters, *args):
+            if statement.lstrip().startswith("SELECT employees."):
+                offsets.append(parameters[-1])
+
+        service = EmployeeService(db_session)
+        last_names = []
+        event.listen(db_session.bind.sync_engine, "before_cursor_execute", record_offset)
+        try:
+            for page in (1, 2, 3):
+                response = await service.list_employee(
+                    organization_id=1,
+                    query_params=EmployeeListQueryParams(
+                        sort_by="last_name", sort_dir="desc", limit=1, page=page
+                    ),
+                )
+                last_names.extend(e["last_name"] for e in response.employees)
+                assert response.total_records == 3
+        finally:
+            event.remove(db_session.bind.sync_engine, "before_cursor_execute", record_offset)
+
+        assert last_names == ["Smith", "Johnson", "Doe"]
+        assert offsets == [0, 0, 0]
+
+    async def test_last_page_then_previous_pages_without_offset(
+        self, db_session, sample_employees, sample_organizations
+    ):
+        """Test that going back from the last page seeks from cached backward cursors."""
+        from sqlalchemy import event
+
+        from app.schemas.employee import EmployeeListQueryParams
+
+        offsets = []
+
+        def record_offset(conn, cursor, statement, parameters, *args):
+            if statement.lstrip().startswith("SELECT employees."):
+                offsets.append(parameters[-1])
+
+        service = EmployeeService(db_session)
+        last_names = []
+        event.listen(db_session.bind.sync_engine, "before_cursor_execute", record_offset)
+        try:
+            for page in (3, 2, 1):
+                response = await service.list_employee(
+                    organization_id=1,
+                    query_params=EmployeeListQueryParams(
+                        search="@test", sort_by="last_name", limit=1, page=page
+                    ),
+                )
+                last_names.extend(e["last_name"] for e in response.employees)
+        finally:
+            event.remove(db_session.bind.sync_engine, "before_cursor_execute", record_offset)
+
+        assert last_names == ["Smith", "Johnson", "Doe"]
+        assert offsets == [0, 0, 0]
@@ -0,0 +1,94 @@
+"""
+Unit tests for the in-process metrics.
+"""
+
+import asyncio
+
+import pytest
+
+from app.utils.metrics import MetricsRegistry
+
+
+class TestMetrics:
+    """Test cases for counters, gauges, histograms and their rendering."""
+
+    def test_counter_render(self):
+        """Test that counters are rendered per label set."""
+        registry = MetricsRegistry()
+        counter = registry.counter("requests_total", "Requests", ("decision",))
+
+        counter.inc(decision="allowed")
+        counter.inc(decision="allowed")
+        counter.inc(decision="denied")
+
+        output = registry.render()
+        assert "# TYPE requests_total counter" in output
+        assert 'requests_total{decision="allowed"} 2' in output
+        assert 'requests_total{decision="denied"} 1' in output
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test that histogram buckets, sum and count are rendered."""
+        registry = MetricsRegistry()
+        histogram = registry.histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1))
+
+        histogram.observe(0.05, route="/a")
+        histogram.observe(0.1, route="/a")
+        histogram.observe(5, route="/a")
+
+        output = registry.render()
+        assert 'latency_seconds_bucket{route="/a",le="0.1"} 2' in output
+        assert 'latency_seconds_bucket{route="/a",le="1"} 2' in output
+        assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in output
+        assert 'latency_seconds_sum{route="/a"} 5.15' in output
+        assert 'latency_seconds_count{route="/a"} 3' in output
+
+    def test_histogram_timer(self):
+        """Test that the timer context manager observes one value."""
+        registry = MetricsRegistry()
+        histogram = registry.histogram("query_seconds", "Query", ("query",))
+
+        with histogram.time(query="count"):
+            pass
+
+        assert histogram.count(query="count") == 1
+
+    def test_callback_gauge(self):
+        """Test that callback gauges are computed at render time."""
+        registry = MetricsRegistry()
+        size = {"value": 1}
+        registry.gauge("cache_size", "Cache size", callback=lambda: size["value"])
+
+        size["value"] = 7
+
+        assert "cache_size 7" in registry.render()
+
+    def test_label_values_are_escaped(self):
+        """Test that label values are escaped."""
+        registry = MetricsRegistry()
+        counter = registry.counter("paths_total", "Paths", ("path",))
+
+        counter.inc(path='a"b\\c')
+
+        assert 'paths_total{path="a\\"b\\\\c"} 1' in registry.render()
+
+    def test_duplicate_metric_name(self):
+        """Test that a metric name can only be registered once."""
+        registry = MetricsRegistry()
+        registry.counter("dup_total", "Dup")
+
+        with pytest.raises(ValueError):
+            registry.counter("dup_total", "Dup")
+
+    async def test_concurrent_updates(self):
+        """Test that updates from concurrent handlers are not lost."""
+        registry = MetricsRegistry()
+        counter = registry.counter("hits_total", "Hits")
+
+        async def handler():
+            for _ in range(100):
+                counter.inc()
+                await asyncio.sleep(0)
+
+        await asyncio.gather(*(handler() for _ in range(50)))
+
+        assert counter.value() == 5000
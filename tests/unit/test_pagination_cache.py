@@ -0,0 +1,25 @@
+"""
+Unit tests for the pagination cursor cache.
+"""
+
+from app.utils.data_versions import data_versions
+from app.utils.pagination_cache import PaginationCache
+
+
+class TestPaginationCache:
+    """Test cases for PaginationCache."""
+
+    def test_cursors_dropped_when_organization_changes(self):
+        """Test that cursors are only returned at the data version they were stored at."""
+        cache = PaginationCache()
+        cache.set_cursor("list", "org:200", page=2, cursor=50, organization_id=200)
+        cache.set_cursor("list", "org:201", page=2, cursor=70, organization_id=201)
+
+        data_versions.bump(200)
+
+        assert cache.get_cursor("list", "org:200", page=2, organization_id=200) is None
+        assert cache.get_cursor("list", "org:201", page=2, organization_id=201) == 70
+
+        cache.set_cursor("list", "org:200", page=3, cursor=100, organization_id=200)
+        assert cache.get_cursor("list", "org:200", page=3, organization_id=200) == 100
+        assert cache.size() == 2
@@ -0,0 +1,69 @@
+"""
+Unit tests for the typeahead prefix index.
+"""
+
+from app.utils.prefix_index import PrefixIndex
+
+FIELDS = ("first_name", "last_name", "email")
+
+
+def _employee(employee_id: int, first_name: str, last_name: str, email: str) -> dict:
+    return {"id": employee_id, "first_name": first_name, "last_name": last_name, "email": email}
+
+
+def _index() -> PrefixIndex:
+    index = PrefixIndex(version=0, fields=FIELDS)
+    index.build(
+        [
+            _employee(1, "John", "Doe", "john@test.com"),
+            _employee(2, "Jane", "Smith", "jane@test.com"),
+            _employee(3, "Bob", "Johnson", "bob@test.com"),
+        ]
+    )
+    return index
+
+
+class TestPrefixIndex:
+    """Test cases for PrefixIndex."""
+
+    def test_search_matches_any_field_once(self):
+        """Test that each employee is returned once, in the order of its first matching key."""
+        index = _index()
+
+        assert [e["id"] for e in index.search("jo", limit=10)] == [1, 3]
+        assert [e["id"] for e in index.search("john d", limit=10)] == [1]
+        assert [e["id"] for e in index.search("j", limit=10)] == [2, 1, 3]
+        assert index.search("x", limit=10) == []
+
+    def test_search_limit(self):
+        """Test that the scan stops after `limit` employees."""
+        assert [e["id"] for e in _index().search("j", limit=2)] == [2, 1]
+
+    def test_upsert_replaces_previous_keys(self):
+        """Test that updating an employee removes the keys of its previous values."""
+        index = _index()
+
+        index.upsert(_employee(1, "Renée", "Doe", "renee@test.com"))
+        index.upsert(_employee(4, "Jo", "March", "jo@test.com"))
+
+        assert [e["id"] for e in index.search("jo", limit=10)] == [4, 3]
+        assert index.search("renee", limit=10) == [_employee(1, "Renée", "Doe", "renee@test.com")]
+        assert len(index) == 4
+
+    def test_remove(self):
+        """Test that removed employees are no longer suggested."""
+        index = _index()
+
+        index.remove(3)
+        index.remove(99)  # Not indexed
+
+        assert [e["id"] for e in index.search("jo", limit=10)] == [1]
+        assert len(index) == 2
+
+    def test_only_configured_fields_are_indexed(self):
+        """Test that fields outside `fields` are neither searched nor returned."""
+        index = PrefixIndex(version=0, fields=("last_name",))
+        index.build([_employee(1, "John", "Doe", "john@test.com")])
+
+        assert index.search("john", limit=10) == []
+        assert index.search("doe", limit=10) == [{"id": 1, "last_name": "Doe"}]
@@ -0,0 +1,173 @@
+"""
+Unit tests for SQL statement instrumentation and query budgets.
+"""
+
+import logging
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.config import settings
+from app.decorators.query_budget import QueryBudgetExceeded, query_budget
+from app.utils.query_stats import (
+    allow_extra_queries,
+    get_query_stats,
+    instrument_engine,
+    start_query_stats,
+    stop_query_stats,
+)
+
+
+@pytest.fixture
+async def engine():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    instrument_engine(engine)
+    yield engine
+    await engine.dispose()
+
+
+class TestQueryStats:
+    """Test cases for statement counting and slow query logging."""
+
+    async def test_counts_statements_and_time(self, engine):
+        """Test that statements executed while collecting are counted and timed."""
+        stats, token = start_query_stats()
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+                await conn.execute(text("SELECT 2"))
+        finally:
+            stop_query_stats(token)
+
+        assert stats.count == 2
+        assert stats.duration > 0
+        assert get_query_stats() is None
+
+    async def test_failed_statements_leave_no_state(self, engine):
+        """Test that statements raising an error are counted and leave nothing on the connection."""
+        stats, token = start_query_stats()
+        try:
+            async with engine.connect() as conn:
+                with pytest.raises(OperationalError):
+                    await conn.execute(text("SELECT * FROM missing_table"))
+                await conn.execute(text("SELECT 1"))
+                info = dict(conn.info)
+        finally:
+            stop_query_stats(token)
+
+        assert stats.count == 2
+        assert info == {}
+
+    async def test_instrument_engine_is_idempotent(self, engine):
+        """Test that instrumenting twice does not double count statements."""
+        instrument_engine(engine)
+
+        stats, token = start_query_stats()
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+        finally:
+            stop_query_stats(token)
+
+        assert stats.count == 1
+
+    async def test_slow_query_is_logged_with_plan(self, engine, monkeypatch, caplog):
+        """Test that slow statements are logged with parameters and query plan."""
+        monkeypatch.setattr(settings, "slow_query_threshold_ms", 1e-6)
+
+        with caplog.at_level(logging.WARNING, logger="app.utils.query_stats"):
+            async with engine.connect() as conn:
+                await conn.execute(text("CREATE TABLE t (id INTEGER PRIMARY KEY, name TEXT)"))
+                await conn.execute(text("SELECT name FROM t WHERE id = :id"), {"id": 42})
+
+        select_logs = [r for r in caplog.records if "SELECT name FROM t" in r.getMessage()]
+        assert len(select_logs) == 1
+        assert "42" in select_logs[0].getMessage()
+        assert "SEARCH t USING INTEGER PRIMARY KEY" in select_logs[0].getMessage()
+
+    async def test_fast_query_is_not_logged(self, engine, monkeypatch, caplog):
+        """Test that statements under the threshold are not logged."""
+        monkeypatch.setattr(settings, "slow_query_threshold_ms", 10_000)
+
+        with caplog.at_level(logging.WARNING, logger="app.utils.query_stats"):
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+
+        assert caplog.records == []
+
+
+class TestQueryBudget:
+    """Test cases for the query budget decorator."""
+
+    async def test_within_budget(self, engine):
+        """Test that requests within their budget pass."""
+
+        @query_budget(max_queries=1)
+        async def endpoint():
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+            return "ok"
+
+        stats, token = start_query_stats()
+        try:
+            assert await endpoint() == "ok"
+        finally:
+            stop_query_stats(token)
+
+    async def test_over_budget_fails(self, engine):
+        """Test that requests over their budget fail when enforced."""
+
+        @query_budget(max_queries=1)
+        async def endpoint():
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+                await conn.execute(text("SELECT 2"))
+
+        stats, token = start_query_stats()
+        try:
+            with pytest.raises(QueryBudgetExceeded, match="executed 2 queries"):
+                await endpoint()
+        finally:
+            stop_query_stats(token)
+
+    async def test_extra_queries_of_a_rare_path(self, engine):
+        """Test that the extra queries a path declares are allowed for its request only."""
+
+        @query_budget(max_queries=1)
+        async def endpoint(extra_queries: int):
+            allow_extra_queries(extra_queries)
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+                await conn.execute(text("SELECT 2"))
+            return "ok"
+
+        stats, token = start_query_stats()
+        try:
+            assert await endpoint(extra_queries=1) == "ok"
+        finally:
+            stop_query_stats(token)
+
+        stats, token = start_query_stats()
+        try:
+            with pytest.raises(QueryBudgetExceeded, match="budget is 1 \\+ 0 extra"):
+                await endpoint(extra_queries=0)
+        finally:
+            stop_query_stats(token)
+
+    async def test_over_budget_passes_when_not_enforced(self, engine, monkeypatch):
+        """Test that budgets are not enforced unless enabled."""
+        monkeypatch.setattr(settings, "enforce_query_budget", False)
+
+        @query_budget(max_queries=0)
+        async def endpoint():
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+            return "ok"
+
+        stats, token = start_query_stats()
+        try:
+            assert await endpoint() == "ok"
+        finally:
+            stop_query_stats(token)
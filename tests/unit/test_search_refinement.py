@@ -0,0 +1,50 @@
+"""
+Unit tests for in-memory search refinement.
+"""
+
+from app.utils.search_refinement import SearchMatches, can_refine, find_matches, remember
+
+ROWS = [
+    (1, "john", "doe", "john@test.com", "+1-555-0001"),
+    (2, "jane", "smith", "jane@test.com", "+1-555-0002"),
+    (3, "bob", "johnson", "bob@test.com", "+1-555-0003"),
+    (4, "zoe", "angstrom", None, None),
+]
+
+
+class TestSearchRefinement:
+    """Test cases for SearchMatches and recent term lookup."""
+
+    def test_refine_matches_names_email_and_phone(self):
+        """Test that refinement matches like the contains search filter."""
+        matches = SearchMatches.from_rows("o", ROWS)
+
+        assert matches.refine("oh").ids.tolist() == [1, 3]
+        assert matches.refine("Zoë").ids.tolist() == [4]
+        assert SearchMatches.from_rows("5", ROWS).refine("555-0002").ids.tolist() == [2]
+        # Fields are matched separately, never across their boundary
+        assert matches.refine("ndoe").ids.tolist() == []
+
+    def test_find_matches_refines_most_selective_term(self):
+        """Test that a term is answered from the smallest recent term it extends."""
+        broad = SearchMatches.from_rows("o", ROWS)
+        narrow = SearchMatches.from_rows("jo", ROWS[:1] + ROWS[2:3])
+        recent = (broad, narrow)
+
+        assert find_matches(recent, "o") is broad
+        assert find_matches(recent, "john").ids.tolist() == [1, 3]
+        assert find_matches(recent, "JOHNS").ids.tolist() == [3]
+        assert find_matches(recent, "smith") is None
+
+    def test_remember_keeps_most_recent_terms(self):
+        """Test that remembered terms are most recent first, without duplicates."""
+        a, b, c = (SearchMatches.from_rows(term, ROWS) for term in ("a", "b", "c"))
+
+        assert [m.term for m in remember((a, b), c, max_terms=2)] == ["c", "a"]
+        assert [m.term for m in remember((a, b), b, max_terms=2)] == ["b", "a"]
+
+    def test_like_wildcards_are_not_refined(self):
+        """Test that terms with LIKE wildcards are left to the database."""
+        assert can_refine("john")
+        assert not can_refine("jo_n")
+        assert not can_refine("100%")
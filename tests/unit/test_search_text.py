@@ -0,0 +1,42 @@
+"""
+Unit tests for search text normalization.
+"""
+
+from app.utils.search_text import (
+    digits_only,
+    normalize_search_text,
+    prefix_upper_bound,
+    search_text_foldings,
+)
+
+
+class TestSearchText:
+    """Test cases for search text normalization helpers."""
+
+    def test_normalize_search_text_folds_case_and_accents(self):
+        """Test that case and accents are folded beyond ASCII."""
+        assert normalize_search_text("Zoë Ångström") == "zoe angstrom"
+        assert normalize_search_text("ÉLODIE") == "elodie"
+        assert normalize_search_text("Straße") == "strasse"
+        assert normalize_search_text(None) is None
+
+    def test_digits_only(self):
+        """Test that phone separators are dropped."""
+        assert digits_only("+1 (555) 000-1234") == "15550001234"
+        assert digits_only(None) is None
+
+    def test_search_text_foldings_are_final(self):
+        """Test that replacements yield normalized text, whatever order they are applied in."""
+        foldings = search_text_foldings()
+        assert ("Å", "a") in foldings
+        assert ("\u0308", "") in foldings  # Combining diaeresis
+        for _, normalized in foldings:
+            assert normalize_search_text(normalized) == normalized
+
+    def test_prefix_upper_bound(self):
+        """Test that the bound includes every continuation of the prefix and nothing after."""
+        upper = prefix_upper_bound("jo")
+        assert "jo" < upper
+        assert "john" < upper
+        assert "jo￿" < upper
+        assert "jp" >= upper
@@ -0,0 +1,72 @@
+"""
+Unit tests for the Server-Timing phase timers.
+"""
+
+from app.utils.server_timing import (
+    get_server_timing,
+    start_server_timing,
+    stop_server_timing,
+    timed_phase,
+)
+
+
+class TestServerTiming:
+    """Test cases for phase timers."""
+
+    def test_timed_phase_is_noop_without_collector(self):
+        """Test that phases are not recorded when Server-Timing is not active."""
+        assert get_server_timing() is None
+
+        with timed_phase("count"):
+            pass
+
+        assert get_server_timing() is None
+
+    def test_timed_phase_records_duration(self):
+        """Test that phases are recorded on the active collector."""
+        timing, token = start_server_timing()
+        try:
+            with timed_phase("count"):
+                pass
+            with timed_phase("page"):
+                pass
+        finally:
+            stop_server_timing(token)
+
+        assert list(timing.phases) == ["count", "page"]
+        assert all(duration >= 0 for duration in timing.phases.values())
+        assert get_server_timing() is None
+
+    def test_same_phase_is_accumulated(self):
+        """Test that repeated phases are summed up."""
+        timing, token = start_server_timing()
+        try:
+            timing.record("page", 0.001)
+            timing.record("page", 0.002)
+        finally:
+            stop_server_timing(token)
+
+        assert timing.phases["page"] == 0.003
+
+    def test_timed_phase_records_on_exception(self):
+        """Test that a phase failing with an exception is still recorded."""
+        timing, token = start_server_timing()
+        try:
+            with timed_phase("count"):
+                raise ValueError("boom")
+        except ValueError:
+            pass
+        finally:
+            stop_server_timing(token)
+
+        assert "count" in timing.phases
+
+    def test_header_value_format(self):
+        """Test the Server-Timing header format."""
+        timing, token = start_server_timing()
+        stop_server_timing(token)
+        timing.record("auth", 0.0012)
+        timing.record("count", 0.5)
+
+        assert timing.header_value() == "auth;dur=1.200, count;dur=500.000"
+        assert timing.log_fields() == {"auth": 1.2, "count": 500.0}
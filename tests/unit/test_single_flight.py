@@ -0,0 +1,150 @@
+"""
+Unit tests for single-flight request coalescing.
+"""
+
+import asyncio
+
+import pytest
+
+from app.utils.single_flight import SingleFlight
+
+
+class TestSingleFlight:
+    """Test cases for SingleFlight."""
+
+    async def test_concurrent_calls_share_one_computation(self):
+        """Test that concurrent calls with the same key run the computation once."""
+        flights = SingleFlight("test")
+        calls = 0
+        release = asyncio.Event()
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return "result"
+
+        callers = [asyncio.create_task(flights.do("key", compute)) for _ in range(10)]
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await asyncio.gather(*callers) == ["result"] * 10
+        assert calls == 1
+        assert flights.in_flight() == 0
+
+    async def test_different_keys_are_not_coalesced(self):
+        """Test that calls with different keys run separately."""
+        flights = SingleFlight("test")
+        calls = []
+
+        async def compute(key):
+            calls.append(key)
+            await asyncio.sleep(0)
+            return key
+
+        results = await asyncio.gather(
+            flights.do("a", lambda: compute("a")), flights.do("b", lambda: compute("b"))
+        )
+
+        assert results == ["a", "b"]
+        assert sorted(calls) == ["a", "b"]
+
+    async def test_sequential_calls_are_not_cached(self):
+        """Test that a finished computation is not reused by later calls."""
+        flights = SingleFlight("test")
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            return calls
+
+        assert await flights.do("key", compute) == 1
+        assert await flights.do("key", compute) == 2
+
+    async def test_error_is_propagated_to_every_caller(self):
+        """Test that every coalesced caller gets the computation's exception."""
+        flights = SingleFlight("test")
+        release = asyncio.Event()
+
+        async def compute():
+            await release.wait()
+            raise ValueError("boom")
+
+        callers = [asyncio.create_task(flights.do("key", compute)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+
+        results = await asyncio.gather(*callers, return_exceptions=True)
+        assert all(isinstance(result, ValueError) for result in results)
+        assert flights.in_flight() == 0
+
+    async def test_cancelled_leader_does_not_cancel_followers(self):
+        """Test that the computation keeps running for followers when the leader leaves."""
+        flights = SingleFlight("test")
+        release = asyncio.Event()
+
+        async def compute():
+            await release.wait()
+            return "result"
+
+        leader = asyncio.create_task(flights.do("key", compute))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flights.do("key", compute))
+        await asyncio.sleep(0)
+
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await follower == "result"
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+
+    async def test_computation_cancelled_when_every_caller_leaves(self):
+        """Test that the computation is cancelled once nobody waits for it."""
+        flights = SingleFlight("test")
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def compute():
+            started.set()
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        callers = [asyncio.create_task(flights.do("key", compute)) for _ in range(2)]
+        await started.wait()
+        for caller in callers:
+            caller.cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+
+        await asyncio.wait_for(cancelled.wait(), timeout=1)
+        await asyncio.sleep(0)
+        assert flights.in_flight() == 0
+
+    async def test_late_caller_does_not_join_cancelled_computation(self):
+        """Test that a call after every caller left starts a new computation."""
+        flights = SingleFlight("test")
+        started = asyncio.Event()
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                started.set()
+                await asyncio.Event().wait()
+            return calls
+
+        caller = asyncio.create_task(flights.do("key", compute))
+        await started.wait()
+        caller.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+
+        # The cancelled computation's task has not finished yet when the late call arrives
+        assert await flights.do("key", compute) == 2
+        assert calls == 2
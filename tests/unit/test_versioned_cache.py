@@ -0,0 +1,90 @@
+"""
+Unit tests for organization data versions and the versioned result cache.
+"""
+
+from sqlalchemy import select
+
+from app.models import Employee
+from app.utils.data_versions import data_versions
+from app.utils.versioned_cache import VersionedCache
+
+
+class TestDataVersions:
+    """Test cases for data version tracking on ORM sessions."""
+
+    async def test_committed_employee_change_bumps_version(self, db_session, sample_employees):
+        """Test that committing an employee change bumps only its organization."""
+        org1_version, org2_version = data_versions.get(1), data_versions.get(2)
+
+        sample_employees[0].status = "Terminated"
+        await db_session.commit()
+
+        assert data_versions.get(1) == org1_version + 1
+        assert data_versions.get(2) == org2_version
+
+    async def test_rolled_back_change_keeps_version(self, db_session, sample_employees):
+        """Test that flushed but rolled back changes don't bump the version."""
+        version = data_versions.get(1)
+
+        sample_employees[0].status = "Terminated"
+        await db_session.flush()
+        await db_session.rollback()
+        await db_session.execute(select(Employee))
+        await db_session.commit()
+
+        assert data_versions.get(1) == version
+
+
+class TestVersionedCache:
+    """Test cases for VersionedCache."""
+
+    def test_entry_invalidated_by_version_bump(self):
+        """Test that entries are only returned at the version they were computed at."""
+        cache = VersionedCache("test_invalidation", max_entries=10)
+        cache.set(100, "key", "value", version=data_versions.get(100))
+
+        assert cache.get(100, "key") == "value"
+
+        data_versions.bump(100)
+
+        assert cache.get(100, "key") is None
+        assert cache.size() == 0
+
+    def test_value_computed_before_bump_is_stale(self):
+        """Test that a value computed across a bump is never served."""
+        cache = VersionedCache("test_stale", max_entries=10)
+        version = data_versions.get(101)
+        data_versions.bump(101)  # Write committed while the value was computed
+
+        cache.set(101, "key", "value", version=version)
+
+        assert cache.get(101, "key") is None
+
+    def test_least_recently_used_entry_evicted(self):
+        """Test that the cache keeps at most max_entries entries."""
+        cache = VersionedCache("test_lru", max_entries=2)
+        version = data_versions.get(102)
+        cache.set(102, "a", 1, version=version)
+        cache.set(102, "b", 2, version=version)
+        cache.get(102, "a")
+        cache.set(102, "c", 3, version=version)
+
+        assert cache.get(102, "a") == 1
+        assert cache.get(102, "b") is None
+        assert cache.get(102, "c") == 3
+
+    def test_byte_budget_evicts_least_recently_used(self):
+        """Test that values are evicted to stay within max_bytes."""
+        cache = VersionedCache("test_bytes", max_entries=10, max_bytes=100, sizeof=len)
+        version = data_versions.get(103)
+        cache.set(103, "a", "x" * 40, version=version)
+        cache.set(103, "b", "x" * 40, version=version)
+        cache.get(103, "a")
+        cache.set(103, "c", "x" * 40, version=version)
+        cache.set(103, "too-large", "x" * 101, version=version)
+
+        assert cache.get(103, "a") is not None
+        assert cache.get(103, "b") is None
+        assert cache.get(103, "c") is not None
+        assert cache.get(103, "too-large") is None
+        assert cache.size() == 2